@@ -0,0 +1,3 @@
+"""
+Benchmarks for the runtime cost of concordat. Run them with `make bench`
+"""
@@ -0,0 +1,119 @@
+"""
+Runs the benchmark suites and writes the results as json.
+
+    python -m benchmarks --output benchmarks/results.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# importing the suites registers them
+from benchmarks import (  # noqa: F401 # pylint: disable=unused-import
+    attributes,
+    cache,
+    calls,
+    containers,
+    construction,
+    imports,
+    loop,
+    memory,
+    scoped,
+)
+from benchmarks.common import SUITES, Results
+
+DEFAULT_THRESHOLD = 1.25
+
+
+def run(only: Optional[List[str]], quick: bool) -> Dict[str, Any]:
+    """Runs the registered suites
+
+    Args:
+        only (Optional[List[str]]): Suite names to run, everything when empty
+        quick (bool): Fewer iterations, for smoke testing
+
+    Returns:
+        Dict[str, Any]: The report
+    """
+    results: Results = {}
+    for name, fnc in SUITES:
+        if only and name not in only:
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        for case, value in fnc(quick).items():
+            results[f"{name}.{case}"] = value
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Lists every measurement that got slower or bigger than the baseline
+        by more than `threshold`
+
+    Args:
+        report (Dict[str, Any]): The current run
+        baseline (Dict[str, Any]): The stored run
+        threshold (float): Allowed ratio of current over baseline
+
+    Returns:
+        List[str]: One line per regression
+    """
+    regressions = []
+    for key, current in sorted(report["results"].items()):
+        previous = baseline["results"].get(key)
+        if previous is None or previous["unit"] != current["unit"]:
+            continue
+        if previous["value"] <= 0:
+            continue
+        ratio = current["value"] / previous["value"]
+        line = f"{key}: {previous['value']} -> {current['value']} {current['unit']} ({ratio:.2f}x)"
+        print(line)
+        if ratio > threshold:
+            regressions.append(line)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point
+
+    Returns:
+        int: exit code, 1 when a regression was found
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", help="json report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--only", action="append", help="suite to run, repeatable")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations")
+    args = parser.parse_args(argv)
+
+    report = run(args.only, args.quick)
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+    print(f"wrote {len(report['results'])} results to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as stored:
+            baseline = json.load(stored)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions over {args.threshold}x:")
+            print("\n".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
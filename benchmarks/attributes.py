@@ -0,0 +1,83 @@
+"""
+Memory per instance and attribute access latency of slot backed, typed
+attributes against plain dict backed classes and hand written __slots__
+"""
+import gc
+import tracemalloc
+from typing import Any, Dict
+
+from benchmarks.common import BYTES, NS, Results, per_call, result, suite
+from concordat.interface import InterfaceMeta
+
+
+class Plain:  # pylint: disable=too-few-public-methods
+    """A dict backed record"""
+
+    def __init__(self, key: int, name: str, score: float) -> None:
+        self.key = key
+        self.name = name
+        self.score = score
+
+
+class Slotted:  # pylint: disable=too-few-public-methods
+    """A record with hand written __slots__, no checks"""
+
+    __slots__ = ("key", "name", "score")
+
+    def __init__(self, key: int, name: str, score: float) -> None:
+        self.key = key
+        self.name = name
+        self.score = score
+
+
+def build(enforcement: str) -> Any:
+    """Builds a record whose slots are generated from its interface"""
+
+    class IRecord(metaclass=InterfaceMeta, slots=True):
+        key: int
+        name: str
+        score: float
+
+    class Record(IRecord, enforcement=enforcement):  # type: ignore
+        def __init__(self, key: int, name: str, score: float) -> None:
+            self.key = key
+            self.name = name
+            self.score = score
+
+    return Record
+
+
+def per_instance(cls: Any, count: int) -> float:
+    """Traced bytes per instance, the list holding them included"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls(i, "name", 1.0) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del instances
+    return size / count
+
+
+@suite("attributes")
+def run(quick: bool) -> Results:
+    """Bytes per instance, reads and writes for each kind of record"""
+    count, number = (10_000, 20_000) if quick else (200_000, 200_000)
+    kinds: Dict[str, Any] = {
+        "dict": Plain,
+        "slots": Slotted,
+        "typed": build("full"),
+        "typed.off": build("off"),
+    }
+    results: Results = {}
+    for kind, cls in kinds.items():
+        record = cls(1, "name", 1.0)
+        # pylint: disable=cell-var-from-loop
+        read = per_call(lambda: record.score, number)
+        write = per_call(lambda: setattr(record, "score", 2.0), number)
+        create = per_call(lambda: cls(1, "name", 1.0), number)
+        results[f"bytes.{kind}"] = result(per_instance(cls, count), BYTES)
+        results[f"read.{kind}"] = result(read, NS)
+        results[f"write.{kind}"] = result(write, NS)
+        results[f"create.{kind}"] = result(create, NS)
+    return results
@@ -0,0 +1,107 @@
+"""
+What the conformance cache buys: importing a module of implementations in a
+fresh interpreter without the cache, with an empty one that gets filled,
+and with a warm one, for eager and lazy classes
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+from benchmarks.common import NS, RATIO, Results, result, suite
+
+HEADER = "from typing import Dict, List\n{imports}\nRows = List[Dict[str, int]]\n\n"
+SIGNATURE = "def method_{method}(self, path: str, rows: Rows) -> int:"
+INTERFACE = "class I{index}(metaclass=InterfaceMeta, lazy={lazy}):\n"
+ABSTRACT = f"    @abstract_method\n    {SIGNATURE}\n        pass\n"
+IMPLEMENTATION = "class Bench{index}(interfaces.I{index}):\n"
+METHOD = f"    {SIGNATURE}\n        return 1\n"
+
+TIMER = (
+    "import importlib, sys, time\n"
+    "importlib.import_module(sys.argv[1] + '.interfaces')\n"
+    "start = time.perf_counter_ns()\n"
+    "importlib.import_module(sys.argv[1] + '.implementations')\n"
+    "print(time.perf_counter_ns() - start)\n"
+)
+
+
+def _classes(head: str, method: str, classes: int, methods: int, lazy: bool) -> str:
+    return "".join(
+        head.format(index=index, lazy=lazy)
+        + "".join(method.format(method=number) for number in range(methods))
+        for index in range(classes)
+    )
+
+
+def write_package(root: str, name: str, classes: int, methods: int, lazy: bool) -> None:
+    """Writes a package with `classes` interfaces of `methods` methods each
+    and one implementation per interface"""
+    package = os.path.join(root, name)
+    os.makedirs(package)
+    modules = {
+        "__init__": "",
+        "interfaces": HEADER.format(
+            imports="from concordat.interface import InterfaceMeta, abstract_method\n"
+        )
+        + _classes(INTERFACE, ABSTRACT, classes, methods, lazy),
+        "implementations": HEADER.format(imports=f"from {name} import interfaces\n")
+        + _classes(IMPLEMENTATION, METHOD, classes, methods, lazy),
+    }
+    for module, source in modules.items():
+        path = os.path.join(package, f"{module}.py")
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(source)
+
+
+def time_import(root: str, name: str, cache_dir: str, repeat: int) -> float:
+    """Imports the implementations in fresh interpreters, an empty
+        `cache_dir` turns the cache off
+
+    Returns:
+        float: best nanoseconds
+    """
+    environment = dict(os.environ)
+    environment.pop("CONCORDAT_CACHE_DIR", None)
+    if cache_dir:
+        environment["CONCORDAT_CACHE_DIR"] = cache_dir
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [root, os.getcwd(), environment.get("PYTHONPATH", "")]
+    )
+    best = float("inf")
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", TIMER, name],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=environment,
+        ).stdout
+        best = min(best, float(output))
+    return best
+
+
+@suite("cache")
+def run(quick: bool) -> Results:
+    """Import time of the implementations per mode, and warm over uncached"""
+    repeat = 3 if quick else 7
+    classes, methods = (20, 5) if quick else (100, 10)
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as root:
+        for lazy in (False, True):
+            mode = "lazy" if lazy else "eager"
+            name = f"cached_bench_{mode}"
+            write_package(root, name, classes, methods, lazy)
+            uncached = time_import(root, name, "", repeat)
+            colds: List[float] = []
+            for attempt in range(repeat):
+                # a new directory every time, so each run starts empty
+                cache_dir = os.path.join(root, f"{mode}_cold_{attempt}")
+                colds.append(time_import(root, name, cache_dir, 1))
+            warm = time_import(root, name, cache_dir, repeat)
+            results[f"{mode}.uncached"] = result(uncached, NS)
+            results[f"{mode}.cold"] = result(min(colds), NS)
+            results[f"{mode}.warm"] = result(warm, NS)
+            results[f"{mode}.warm_over_uncached"] = result(warm / uncached, RATIO)
+    return results
@@ -0,0 +1,89 @@
+"""
+Raw vs wrapped call latency for instance methods and staticmethods
+"""
+from typing import Any, Dict, List
+
+from benchmarks.common import NS, RATIO, Results, per_call, result, suite
+from concordat.interface import BACKENDS, InterfaceMeta, abstract_method, get_backend
+
+
+class Payload:  # pylint: disable=too-few-public-methods
+    """A custom class annotation"""
+
+
+def build(backend: Any, enforcement: str = "full") -> Any:
+    """Builds an interface and implementation with simple, container and
+    custom class annotations on both instance and static methods
+    """
+
+    class IShapes(metaclass=InterfaceMeta):
+        @abstract_method
+        def simple(self, path: str, count: int) -> int:
+            ...
+
+        @abstract_method
+        def container(self, values: List[int], index: Dict[str, int]) -> List[int]:
+            ...
+
+        @abstract_method
+        def custom(self, payload: Payload) -> Payload:
+            ...
+
+        @abstract_method
+        def static_simple(path: str, count: int) -> int:
+            ...
+
+    class Shapes(IShapes, backend=backend, enforcement=enforcement):  # type: ignore
+        def simple(self, path: str, count: int) -> int:
+            return count
+
+        def container(self, values: List[int], index: Dict[str, int]) -> List[int]:
+            return values
+
+        def custom(self, payload: Payload) -> Payload:
+            return payload
+
+        @staticmethod
+        def static_simple(path: str, count: int) -> int:
+            return count
+
+    return Shapes
+
+
+def measure(shapes: Any, number: int) -> Dict[str, float]:
+    """Times every shape on one implementation"""
+    instance = shapes()
+    values = list(range(10))
+    index = {str(i): i for i in range(10)}
+    payload = Payload()
+    return {
+        "instance.simple": per_call(lambda: instance.simple("a", 1), number),
+        "instance.container": per_call(
+            lambda: instance.container(values, index), number
+        ),
+        "instance.keywords": per_call(
+            lambda: instance.container(values, index=index), number
+        ),
+        "instance.custom": per_call(lambda: instance.custom(payload), number),
+        "static.simple": per_call(lambda: shapes.static_simple("a", 1), number),
+    }
+
+
+@suite("calls")
+def run(quick: bool) -> Results:
+    """Raw vs wrapped call latency per backend"""
+    number = 2_000 if quick else 50_000
+    raw = measure(build("stdlib", enforcement="off"), number)
+    results: Results = {f"{case}.raw": result(value, NS) for case, value in raw.items()}
+    for backend in BACKENDS:
+        wrapped = measure(build(backend), number)
+        for case, value in wrapped.items():
+            results[f"{case}.{backend}"] = result(value, NS)
+            results[f"{case}.{backend}.overhead"] = result(value / raw[case], RATIO)
+    # the stdlib numbers above come from generated wrappers on the flat
+    # shapes, these are the same calls through the general engine
+    general = measure(build(get_backend("stdlib").configure(specialize=False)), number)
+    for case, value in general.items():
+        results[f"{case}.stdlib.general"] = result(value, NS)
+        results[f"{case}.stdlib.general.overhead"] = result(value / raw[case], RATIO)
+    return results
@@ -0,0 +1,88 @@
+"""
+Shared helpers for the benchmark suites. Every measurement ends up as a flat
+`suite.case` key so runs can be compared with a stored baseline.
+"""
+import gc
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+NS = "ns"
+BYTES = "bytes"
+RATIO = "ratio"
+
+Results = Dict[str, Dict[str, Any]]
+Suite = Callable[[bool], Results]
+
+SUITES: List[Tuple[str, Suite]] = []
+
+
+def suite(name: str) -> Callable[[Suite], Suite]:
+    """Registers a benchmark suite. A suite takes a `quick` flag
+        and hands back its results
+
+    Args:
+        name (str): The name the results are filed under
+
+    Returns:
+        Callable[[Suite], Suite]: The decorator
+    """
+
+    def register(fnc: Suite) -> Suite:
+        SUITES.append((name, fnc))
+        return fnc
+
+    return register
+
+
+def result(value: float, unit: str = NS) -> Dict[str, Any]:
+    """A single measurement
+
+    Args:
+        value (float): The measured value, lower is better
+        unit (str, optional): What the value is counted in. Defaults to NS.
+
+    Returns:
+        Dict[str, Any]: The measurement as it's written to json
+    """
+    return {"value": round(value, 3), "unit": unit}
+
+
+def per_call(fnc: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    """Times a zero argument callable and reports the best
+        nanoseconds per call over a few repeats
+
+    Args:
+        fnc (Callable[[], Any]): The thing to time
+        number (int): Calls per repeat
+        repeat (int, optional): How many repeats to take the best of. Defaults to 5.
+
+    Returns:
+        float: Nanoseconds per call
+    """
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                fnc()
+            best = min(best, (time.perf_counter_ns() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def once(fnc: Callable[[], Any], repeat: int = 5) -> float:
+    """Times something that only makes sense to run once per repeat,
+        like creating a class
+
+    Args:
+        fnc (Callable[[], Any]): The thing to time
+        repeat (int, optional): How many repeats to take the best of. Defaults to 5.
+
+    Returns:
+        float: Nanoseconds for the best run
+    """
+    return per_call(fnc, 1, repeat)
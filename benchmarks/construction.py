@@ -0,0 +1,74 @@
+"""
+Cost of InterfaceMeta.__new__/__init__ as the number of methods
+and the depth of the inheritance chain grow
+"""
+from functools import partial
+from typing import Any, Dict
+
+from benchmarks.common import Results, once, result, suite
+from concordat.interface import BACKENDS, InterfaceMeta, abstract_method
+
+
+def interface_namespace(methods: int) -> Dict[str, Any]:
+    """An interface body with `methods` abstract methods"""
+    namespace: Dict[str, Any] = {}
+    for index in range(methods):
+
+        def method(self, path: str, count: int) -> int:  # type: ignore
+            ...
+
+        method.__name__ = method.__qualname__ = f"method_{index}"
+        namespace[method.__name__] = abstract_method(method)
+    return namespace
+
+
+def implementation_namespace(methods: int) -> Dict[str, Any]:
+    """An implementation body for `interface_namespace(methods)`"""
+    namespace: Dict[str, Any] = {}
+    for index in range(methods):
+
+        def method(self, path: str, count: int) -> int:  # type: ignore
+            return count
+
+        method.__name__ = method.__qualname__ = f"method_{index}"
+        namespace[method.__name__] = method
+    return namespace
+
+
+def build(methods: int, depth: int, backend: str, lazy: bool = False) -> Any:
+    """Creates an interface, an implementation and `depth - 1` subclasses
+    that each override every method
+    """
+    interface = InterfaceMeta("IBench", (), interface_namespace(methods), lazy=lazy)
+    cls = InterfaceMeta(
+        "Bench",
+        (interface,),
+        implementation_namespace(methods),
+        backend=backend,
+        lazy=lazy,
+    )
+    for level in range(1, depth):
+        cls = InterfaceMeta(f"Bench{level}", (cls,), implementation_namespace(methods))
+    return cls
+
+
+@suite("construction")
+def run(quick: bool) -> Results:
+    """Class creation time for growing method counts and depths,
+    eager and lazy
+    """
+    repeat = 3 if quick else 7
+    results: Results = {}
+    for backend in BACKENDS:
+        for methods in (1, 10, 40):
+            results[f"methods.{methods}.{backend}"] = result(
+                once(partial(build, methods, 1, backend), repeat)
+            )
+            results[f"methods.{methods}.{backend}.lazy"] = result(
+                once(partial(build, methods, 1, backend, True), repeat)
+            )
+        for depth in (1, 3, 6):
+            results[f"depth.{depth}.{backend}"] = result(
+                once(partial(build, 10, depth, backend), repeat)
+            )
+    return results
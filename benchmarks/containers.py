@@ -0,0 +1,38 @@
+"""
+Call latency of a method taking a large container under each container strategy
+"""
+from typing import Any, Dict, List
+
+from benchmarks.common import NS, Results, per_call, result, suite
+from concordat.interface import BACKENDS, InterfaceMeta, abstract_method
+
+
+def build(backend: str, containers: str) -> Any:
+    """Builds an implementation taking a list of rows and a mapping"""
+
+    class IBulk(metaclass=InterfaceMeta):
+        @abstract_method
+        def load(self, rows: List[Dict[str, int]]) -> int:
+            ...
+
+    class Bulk(IBulk, backend=backend, containers=containers):  # type: ignore
+        def load(self, rows: List[Dict[str, int]]) -> int:
+            return len(rows)
+
+    return Bulk()
+
+
+@suite("containers")
+def run(quick: bool) -> Results:
+    """Large container latency per backend and strategy"""
+    size, number = (1_000, 50) if quick else (100_000, 20)
+    rows = [{"id": i} for i in range(size)]
+    results: Results = {}
+    for backend in BACKENDS:
+        for containers in ("full", "sample(10)", "shallow"):
+            bulk = build(backend, containers)
+            value = per_call(
+                lambda: bulk.load(rows), number
+            )  # pylint: disable=cell-var-from-loop
+            results[f"load.{size}.{backend}.{containers}"] = result(value, NS)
+    return results
@@ -0,0 +1,71 @@
+"""
+Import time of concordat in a fresh interpreter, and what it drags in
+"""
+import subprocess
+import sys
+from typing import List
+
+from benchmarks.common import NS, RATIO, Results, result, suite
+
+SNIPPETS = {
+    "interpreter": "pass",
+    "concordat": "import concordat.interface",
+    "concordat.stdlib_class": (
+        "from concordat.interface import InterfaceMeta\n"
+        "class A(metaclass=InterfaceMeta, backend='stdlib'):\n"
+        "    def run(self, path: str) -> int:\n"
+        "        return 1\n"
+    ),
+    "concordat.beartype_class": (
+        "from concordat.interface import InterfaceMeta\n"
+        "class A(metaclass=InterfaceMeta, backend='beartype'):\n"
+        "    def run(self, path: str) -> int:\n"
+        "        return 1\n"
+    ),
+    "pydantic": "import pydantic",
+    "beartype": "import beartype",
+}
+
+TIMER = (
+    "import time, sys\n"
+    "start = time.perf_counter_ns()\n"
+    "exec(compile(sys.argv[1], '<snippet>', 'exec'))\n"
+    "print(time.perf_counter_ns() - start)\n"
+    "print(int('pydantic' in sys.modules), int('beartype' in sys.modules))\n"
+)
+
+
+def time_import(snippet: str, repeat: int) -> List[float]:
+    """Runs a snippet in fresh interpreters
+
+    Returns:
+        List[float]: best nanoseconds, then whether pydantic and beartype got imported
+    """
+    best = float("inf")
+    loaded = [0.0, 0.0]
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER, snippet],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        best = min(best, float(output[0]))
+        loaded = [float(output[1]), float(output[2])]
+    return [best] + loaded
+
+
+@suite("imports")
+def run(quick: bool) -> Results:
+    """Import time per snippet. `loads_pydantic`/`loads_beartype` are
+    1 when the snippet pulled that library in, 0 otherwise
+    """
+    repeat = 3 if quick else 10
+    results: Results = {}
+    for name, snippet in SNIPPETS.items():
+        elapsed, pydantic, beartype = time_import(snippet, repeat)
+        results[f"{name}"] = result(elapsed, NS)
+        if name.startswith("concordat"):
+            results[f"{name}.loads_pydantic"] = result(pydantic, RATIO)
+            results[f"{name}.loads_beartype"] = result(beartype, RATIO)
+    return results
@@ -0,0 +1,78 @@
+"""
+Event loop throughput with and without enforcement. Many small coroutine
+calls are run concurrently, which is what an asyncio service looks like.
+"""
+import asyncio
+import time
+from typing import Any, AsyncIterator, List
+
+from benchmarks.common import NS, RATIO, Results, result, suite
+from concordat.interface import BACKENDS, InterfaceMeta, abstract_method
+
+
+def build(backend: str, enforcement: str = "full") -> Any:
+    """Builds an async interface and implementation"""
+
+    class IService(metaclass=InterfaceMeta):
+        @abstract_method
+        async def fetch(self, key: str, count: int) -> List[int]:
+            ...
+
+        @abstract_method
+        async def stream(self, count: int) -> AsyncIterator[int]:
+            yield 0
+
+    class Service(IService, backend=backend, enforcement=enforcement):  # type: ignore
+        async def fetch(self, key: str, count: int) -> List[int]:
+            await asyncio.sleep(0)
+            return [count]
+
+        async def stream(self, count: int) -> AsyncIterator[int]:
+            for item in range(count):
+                yield item
+
+    return Service()
+
+
+async def _calls(service: Any, tasks: int, calls: int) -> None:
+    async def worker() -> None:
+        for index in range(calls):
+            await service.fetch("a", index)
+
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+
+
+async def _items(service: Any, count: int) -> None:
+    async for _ in service.stream(count):
+        pass
+
+
+def measure(service: Any, tasks: int, calls: int, repeat: int = 3) -> List[float]:
+    """Best nanoseconds per awaited call and per streamed item"""
+    best_call = best_item = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        asyncio.run(_calls(service, tasks, calls))
+        best_call = min(best_call, (time.perf_counter_ns() - start) / (tasks * calls))
+        start = time.perf_counter_ns()
+        asyncio.run(_items(service, tasks * calls))
+        best_item = min(best_item, (time.perf_counter_ns() - start) / (tasks * calls))
+    return [best_call, best_item]
+
+
+@suite("async")
+def run(quick: bool) -> Results:
+    """Awaited call and async stream throughput per backend"""
+    tasks, calls = (10, 100) if quick else (100, 500)
+    raw_call, raw_item = measure(build("stdlib", enforcement="off"), tasks, calls)
+    results: Results = {
+        "fetch.raw": result(raw_call, NS),
+        "stream.raw": result(raw_item, NS),
+    }
+    for backend in BACKENDS:
+        call, item = measure(build(backend), tasks, calls)
+        results[f"fetch.{backend}"] = result(call, NS)
+        results[f"fetch.{backend}.overhead"] = result(call / raw_call, RATIO)
+        results[f"stream.{backend}"] = result(item, NS)
+        results[f"stream.{backend}.overhead"] = result(item / raw_item, RATIO)
+    return results
@@ -0,0 +1,39 @@
+"""
+Memory growth and per call latency drift across a long run of calls.
+Both should stay flat: no validators or models may be built per call.
+"""
+import gc
+import time
+import tracemalloc
+
+from benchmarks.calls import build
+from benchmarks.common import BYTES, NS, RATIO, Results, result, suite
+from concordat.interface import BACKENDS
+
+
+@suite("memory")
+def run(quick: bool) -> Results:
+    """Traced memory growth and latency drift per backend"""
+    chunks = 5
+    chunk = 20_000 if quick else 200_000
+    results: Results = {}
+    for backend in BACKENDS:
+        instance = build(backend)()
+        instance.simple("warm", 1)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        timings = []
+        for _ in range(chunks):
+            start = time.perf_counter_ns()
+            for _ in range(chunk):
+                instance.simple("a", 1)
+            timings.append((time.perf_counter_ns() - start) / chunk)
+        gc.collect()
+        growth = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        results[f"growth.{backend}"] = result(growth, BYTES)
+        results[f"first_chunk.{backend}"] = result(timings[0], NS)
+        results[f"last_chunk.{backend}"] = result(timings[-1], NS)
+        results[f"drift.{backend}"] = result(timings[-1] / timings[0], RATIO)
+    return results
@@ -0,0 +1,48 @@
+"""
+What scoped enforcement costs: the context variable lookup every checked
+wrapper does per call, and the calls inside `off` and `full` blocks against
+the same calls outside any block
+"""
+from typing import Any, Dict
+
+from benchmarks.calls import build
+from benchmarks.common import NS, RATIO, Results, per_call, result, suite
+from concordat.interface import get_backend
+from concordat.scoped import enforcement, override
+
+
+def noop() -> None:
+    """The cost of calling anything at all, to set the lookup against"""
+
+
+@suite("scoped")
+def run(quick: bool) -> Results:
+    """Lookup latency and simple calls in and out of scoped blocks"""
+    number = 5_000 if quick else 200_000
+    lookup = per_call(override, number)
+    results: Results = {
+        "lookup": result(lookup, NS),
+        "noop": result(per_call(noop, number), NS),
+    }
+    raw = build("stdlib", enforcement="off")()
+    raw_call = per_call(lambda: raw.simple("a", 1), number)
+    results["simple.raw"] = result(raw_call, NS)
+    engines: Dict[str, Any] = {
+        # a generated wrapper and the general one
+        "generated": build("stdlib"),
+        "general": build(get_backend("stdlib").configure(specialize=False)),
+    }
+    for engine, shapes in engines.items():
+        instance = shapes()
+        # pylint: disable=cell-var-from-loop
+        checked = per_call(lambda: instance.simple("a", 1), number)
+        with enforcement("full"):
+            full = per_call(lambda: instance.simple("a", 1), number)
+        with enforcement("off"):
+            off = per_call(lambda: instance.simple("a", 1), number)
+        results[f"simple.{engine}"] = result(checked, NS)
+        results[f"simple.{engine}.full"] = result(full, NS)
+        results[f"simple.{engine}.off"] = result(off, NS)
+        results[f"simple.{engine}.off.overhead"] = result(off / raw_call, RATIO)
+        results[f"simple.{engine}.lookup.share"] = result(lookup / checked, RATIO)
+    return results
@@ -0,0 +1,9 @@
+"""
+Interfaces with signatures enforced when classes are created and type hints
+enforced at runtime. See concordat.interface.
+"""
+from concordat.interface import implements
+from concordat.prefork import warmup
+from concordat.scoped import enforcement
+
+__all__ = ["enforcement", "implements", "warmup"]
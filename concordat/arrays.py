@@ -0,0 +1,324 @@
+"""
+Annotations for arrays and buffers. Checking them looks at the metadata
+only, `.dtype`, `.shape`, the buffer format and contiguity, never at the
+elements, so it costs the same for ten elements as for ten million, and
+nothing is ever converted or copied.
+
+    from concordat.arrays import Array, Buffer
+
+    class IModel(metaclass=InterfaceMeta):
+        @abstract_method
+        def predict(self, rows: Array["float32", (None, 128), "C"]) -> Array["float32", (None,)]:
+            pass
+
+        @abstract_method
+        def load(self, raw: Buffer["B"]) -> int:
+            pass
+
+Specializations are plain classes with an `__instancecheck__`, so every
+backend and the generated wrappers check them with a single isinstance.
+numpy is never imported: dtypes are compared with whatever the value
+carries, so strings, numpy dtypes and scalar types all work.
+"""
+import array
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from concordat.checkers import NONE_TYPE, _is_union
+
+ANY = None
+ORDERS = ("C", "F", "A")
+DTYPE_CACHE = 64
+
+Shape = Optional[Tuple[Optional[int], ...]]
+
+_specializations: Dict[Tuple[type, Tuple], type] = {}
+_lock = threading.Lock()
+
+
+def _is_any(param: Any) -> bool:
+    return param is ANY or param is Ellipsis or param is Any
+
+
+def _parameters(params: Any, names: Tuple[str, ...]) -> Tuple:
+    if not isinstance(params, tuple):
+        params = (params,)
+    if len(params) > len(names):
+        raise TypeError(
+            f"Expected at most {len(names)} parameters {names}, got {params}"
+        )
+    padded: Tuple = params + (ANY,) * (len(names) - len(params))
+    return padded
+
+
+def _order(order: Any) -> Optional[str]:
+    if _is_any(order):
+        return None
+    if order not in ORDERS:
+        raise TypeError(f"Contiguity has to be one of {ORDERS} or None, got {order!r}")
+    return str(order)
+
+
+def _shape(shape: Any) -> Shape:
+    if _is_any(shape):
+        return None
+    if not isinstance(shape, tuple) or not all(
+        dim is None or (isinstance(dim, int) and dim >= 0) for dim in shape
+    ):
+        raise TypeError(
+            f"A shape is a tuple of sizes, None for any size, got {shape!r}"
+        )
+    return shape
+
+
+def _name(param: Any) -> str:
+    if param is ANY:
+        return "Any"
+    if isinstance(param, type):
+        return param.__name__
+    return str(param) if not isinstance(param, tuple) else repr(param)
+
+
+class _MetadataMeta(type):
+    """Metaclass of Array and Buffer: subscripting builds (and caches) a
+    specialization, isinstance checks a value against it
+    """
+
+    parameters: Tuple = ()
+    normalize: Callable[[Any], Tuple]
+    compile: Callable[[Tuple], Callable[[Any], bool]]
+    accepts: Callable[[Any], bool]
+
+    def __getitem__(cls, params: Any) -> type:
+        if cls.parameters:
+            raise TypeError(f"{cls!r} is already specialized")
+        key = (cls, cls.normalize(params))
+        try:
+            return _specializations[key]
+        except KeyError:
+            pass
+        with _lock:
+            specialization = _specializations.get(key)
+            if specialization is None:
+                specialization = _specializations[key] = _specialize(cls, key[1])
+        return specialization
+
+    def __instancecheck__(cls, value: Any) -> bool:
+        return cls.accepts(value)
+
+    def __repr__(cls) -> str:
+        return cls.__qualname__
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"{cls!r} is an annotation, it can't be instantiated")
+
+
+def _specialize(cls: "_MetadataMeta", parameters: Tuple) -> type:
+    accepts = cls.compile(parameters)
+    name = f"{cls.__name__}[{', '.join(_name(param) for param in parameters)}]"
+    return type(cls)(
+        name,
+        (cls,),
+        {
+            "parameters": parameters,
+            "accepts": staticmethod(accepts),
+            "__module__": cls.__module__,
+            "__qualname__": name,
+        },
+    )
+
+
+def _dtype_check(dtype: Any) -> Any:
+    if dtype is ANY:
+        return None
+    # comparing a numpy dtype against a string parses the string every
+    # time, so remember the answer for the handful of dtypes we get to see
+    answers: Dict[Any, bool] = {}
+
+    def check(found: Any) -> bool:
+        try:
+            return answers[found]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable, ask every time
+            return bool(found == dtype)
+        try:
+            answer = bool(found == dtype)
+        except Exception:  # pylint: disable=broad-except
+            answer = False
+        if len(answers) < DTYPE_CACHE:
+            answers[found] = answer
+        return answer
+
+    return check
+
+
+def _shape_check(shape: Shape) -> Any:
+    if shape is None:
+        return None
+    ndim = len(shape)
+    fixed = tuple((index, size) for index, size in enumerate(shape) if size is not None)
+
+    def check(found: Any) -> bool:
+        if len(found) != ndim:
+            return False
+        for index, size in fixed:
+            if found[index] != size:
+                return False
+        return True
+
+    return check
+
+
+def _contiguous(c_contiguous: bool, f_contiguous: bool, order: str) -> bool:
+    if order == "C":
+        return c_contiguous
+    if order == "F":
+        return f_contiguous
+    return c_contiguous or f_contiguous
+
+
+class Array(metaclass=_MetadataMeta):
+    """An array with a `.dtype` and a `.shape`, a numpy ndarray or anything
+    that looks like one. `Array[dtype, shape, order]`, every parameter
+    is optional and None means anything goes:
+
+        Array["float64"]                # any shape
+        Array[np.int8, (None, 3)]       # any number of rows of 3
+        Array["float32", (28, 28), "C"] # C contiguous 28x28
+
+    `order` is "C", "F" or "A" for either, read off `.flags`
+    """
+
+    @staticmethod
+    def normalize(params: Any) -> Tuple:
+        """Validates the parameters of Array[...]"""
+        dtype, shape, order = _parameters(params, ("dtype", "shape", "order"))
+        return (None if _is_any(dtype) else dtype, _shape(shape), _order(order))
+
+    @staticmethod
+    def compile(parameters: Tuple) -> Any:
+        """Builds the check of a specialization"""
+        dtype, shape, order = parameters
+        dtype_check = _dtype_check(dtype)
+        shape_check = _shape_check(shape)
+
+        def accepts(value: Any) -> bool:
+            try:
+                if dtype_check is not None and not dtype_check(value.dtype):
+                    return False
+                if shape_check is not None and not shape_check(value.shape):
+                    return False
+                if order is not None:
+                    flags = value.flags
+                    return _contiguous(
+                        flags.c_contiguous, flags.f_contiguous, order  # type: ignore
+                    )
+                return True
+            except (AttributeError, TypeError):
+                return False
+
+        return accepts
+
+    @staticmethod
+    def accepts(value: Any) -> bool:
+        """Anything with a dtype and a shape"""
+        return hasattr(value, "dtype") and hasattr(value, "shape")
+
+
+def _normalize_format(fmt: str) -> str:
+    # "@" is the native order, the one struct and memoryview assume by default
+    return fmt[1:] if fmt.startswith("@") else fmt
+
+
+class Buffer(metaclass=_MetadataMeta):
+    """Anything exporting the buffer protocol, bytes, bytearray,
+    array.array, memoryview, numpy arrays... `Buffer[format, order]`,
+    both optional and None means anything goes:
+
+        Buffer["B"]       # unsigned bytes
+        Buffer["d", "C"]  # C contiguous doubles
+
+    `format` is a struct format as memoryview reports it. The value is
+    looked at through a memoryview, which never copies and is released
+    right away, so a bytearray can still be resized afterwards
+    """
+
+    @staticmethod
+    def normalize(params: Any) -> Tuple:
+        """Validates the parameters of Buffer[...]"""
+        fmt, order = _parameters(params, ("format", "order"))
+        if _is_any(fmt):
+            fmt = None
+        elif not isinstance(fmt, str):
+            raise TypeError(f"A buffer format is a struct format string, got {fmt!r}")
+        else:
+            fmt = _normalize_format(fmt)
+        return (fmt, _order(order))
+
+    @staticmethod
+    def compile(parameters: Tuple) -> Any:
+        """Builds the check of a specialization"""
+        fmt, order = parameters
+
+        def matches(view: memoryview) -> bool:
+            if fmt is not None and _normalize_format(view.format) != fmt:
+                return False
+            if order is not None:
+                return _contiguous(view.c_contiguous, view.f_contiguous, order)
+            return True
+
+        def accepts(value: Any) -> bool:
+            if type(value) is memoryview:  # pylint: disable=unidiomatic-typecheck
+                return matches(value)
+            if type(value) is array.array:  # pylint: disable=unidiomatic-typecheck
+                # 1d so always contiguous either way, its typecode is the format
+                return fmt is None or value.typecode == fmt
+            try:
+                view = memoryview(value)
+            except TypeError:
+                return False
+            with view:
+                return matches(view)
+
+        return accepts
+
+    @staticmethod
+    def accepts(value: Any) -> bool:
+        """Anything exporting the buffer protocol"""
+        try:
+            memoryview(value).release()
+        except TypeError:
+            return False
+        return True
+
+
+def _is_ndarray(hint: Any) -> bool:
+    # without importing numpy, which might not even be installed
+    return (
+        isinstance(hint, type)
+        and hint.__name__ == "ndarray"
+        and hint.__module__.partition(".")[0] == "numpy"
+    )
+
+
+def is_array_hint(hint: Any) -> bool:
+    """Whether a hint is about arrays or buffers, which are checked by
+        their metadata and must never be parsed, converted or copied
+
+    Args:
+        hint (Any): A resolved type hint
+
+    Returns:
+        bool: True for Array, Buffer, numpy's ndarray, memoryview and
+              array.array, or an Optional/Union of them
+    """
+    if isinstance(hint, _MetadataMeta) or _is_ndarray(hint):
+        return True
+    if hint in (memoryview, array.array):
+        return True
+    if _is_union(hint, getattr(hint, "__origin__", None)):
+        args = [arg for arg in hint.__args__ if arg is not NONE_TYPE]
+        return bool(args) and all(is_array_hint(arg) for arg in args)
+    return False
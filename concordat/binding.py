@@ -0,0 +1,159 @@
+"""
+Binding plans per call shape. Working out which parameter each argument of
+a call lands on only depends on how many positional arguments there are and
+which keywords were passed, and callers tend to stick to a handful of those
+shapes. So the mapping is worked out once per shape and kept in a small LRU,
+odd shapes push out the oldest ones instead of growing without limit.
+"""
+from collections import OrderedDict
+from inspect import Parameter, Signature
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+SHAPES = 32
+
+Plan = TypeVar("Plan")
+
+
+def call_shape(args: Tuple, kwargs: Dict) -> Hashable:
+    """The shape of a call: the positional count, plus the keyword names if any
+
+    Args:
+        args (Tuple): The positional arguments
+        kwargs (Dict): The keyword arguments
+
+    Returns:
+        Hashable: The shape
+    """
+    if kwargs:
+        return (len(args), tuple(kwargs))
+    return len(args)
+
+
+class ShapeCache(Generic[Plan]):
+    """A bounded LRU of plans keyed by call shape
+
+    Args:
+        build (Callable[[Tuple, Dict], Plan]): Makes the plan for the shape of a
+            call, it may raise for shapes that can't be bound, those aren't kept
+        size (int, optional): How many shapes to keep. Defaults to SHAPES.
+    """
+
+    __slots__ = ("build", "size", "plans")
+
+    def __init__(
+        self, build: Callable[[Tuple, Dict], Plan], size: int = SHAPES
+    ) -> None:
+        self.build = build
+        self.size = size
+        self.plans: "OrderedDict[Hashable, Plan]" = OrderedDict()
+
+    def get(self, args: Tuple, kwargs: Dict) -> Plan:
+        """The plan for a call, built when the shape hasn't been seen lately
+
+        Args:
+            args (Tuple): The positional arguments
+            kwargs (Dict): The keyword arguments
+
+        Returns:
+            Plan: The plan
+        """
+        shape = call_shape(args, kwargs)
+        plans = self.plans
+        try:
+            plan = plans[shape]
+            plans.move_to_end(shape)
+            return plan
+        except KeyError:
+            # not there, or pushed out by another thread in between
+            pass
+        plan = self.build(args, kwargs)
+        plans[shape] = plan
+        while len(plans) > self.size:
+            try:
+                plans.popitem(last=False)
+            except KeyError:
+                break
+        return plan
+
+    def __len__(self) -> int:
+        return len(self.plans)
+
+
+class BindingPlan:  # pylint: disable=too-few-public-methods
+    """Where every argument of one call shape goes, worked out with
+        Signature.bind on the first call of that shape
+
+    Args:
+        sig (Signature): The signature of the function
+        args (Tuple): Positional arguments of a call with this shape
+        kwargs (Dict): Keyword arguments of a call with this shape
+
+    Raises:
+        TypeError: Calls of this shape can't be bound, eg an argument is missing
+    """
+
+    __slots__ = ("positional", "var_positional", "keywords", "var_keyword")
+
+    def __init__(self, sig: Signature, args: Tuple, kwargs: Dict) -> None:
+        # bind placeholders: the position of each positional argument and the
+        # name of each keyword, so we can see where they end up
+        bound = sig.bind(*range(len(args)), **{name: name for name in kwargs})
+        self.positional: Tuple[Tuple[str, int], ...] = ()
+        self.var_positional: Optional[Tuple[str, int]] = None
+        self.keywords: Tuple[Tuple[str, str], ...] = ()
+        self.var_keyword: Optional[Tuple[str, Tuple[str, ...]]] = None
+        for name, value in bound.arguments.items():
+            kind = sig.parameters[name].kind
+            if kind is Parameter.VAR_POSITIONAL:
+                self.var_positional = (name, value[0] if value else len(args))
+            elif kind is Parameter.VAR_KEYWORD:
+                self.var_keyword = (name, tuple(value))
+            elif isinstance(value, int):
+                self.positional += ((name, value),)
+            else:
+                self.keywords += ((name, value),)
+
+    def bind(self, args: Tuple, kwargs: Dict) -> Dict[str, Any]:
+        """Maps the arguments of a call of this shape onto parameter names,
+            like Signature.bind(...).arguments without defaults applied
+
+        Args:
+            args (Tuple): The positional arguments
+            kwargs (Dict): The keyword arguments
+
+        Returns:
+            Dict[str, Any]: The arguments by parameter name
+        """
+        arguments = {name: args[index] for name, index in self.positional}
+        for name, key in self.keywords:
+            arguments[name] = kwargs[key]
+        if self.var_positional is not None:
+            name, start = self.var_positional
+            arguments[name] = args[start:]
+        if self.var_keyword is not None:
+            name, keys = self.var_keyword
+            arguments[name] = {key: kwargs[key] for key in keys}
+        return arguments
+
+
+def binder(sig: Signature, size: int = SHAPES) -> Callable[[Tuple, Dict], Dict]:
+    """A drop in for `sig.bind(*args, **kwargs).arguments` that only binds
+        once per call shape
+
+    Args:
+        sig (Signature): The signature to bind to
+        size (int, optional): How many call shapes to remember. Defaults to SHAPES.
+
+    Returns:
+        Callable[[Tuple, Dict], Dict]: Takes args and kwargs, returns the arguments
+                                       by parameter name
+    """
+    plans: ShapeCache[BindingPlan] = ShapeCache(
+        lambda args, kwargs: BindingPlan(sig, args, kwargs), size
+    )
+
+    def bind(args: Tuple, kwargs: Dict) -> Dict[str, Any]:
+        return plans.get(args, kwargs).bind(args, kwargs)
+
+    setattr(bind, "plans", plans)
+    return bind
@@ -0,0 +1,276 @@
+"""
+Optional on disk cache of conformance checks. Whether a class conforms to
+its interface only changes when the source changes, so once a class passed
+we write that down, keyed by its module path and the hashes of the source
+files of every module in its MRO. The next process to import it skips the
+type hint comparison. Entries that don't match exactly, whether stale,
+corrupt or from another python, are ignored and rewritten.
+
+Annotations name types from other modules too, eg `from .models import Order`,
+so an entry also depends on the source of the modules those modules import
+and of the modules defining the types in the resolved hints. Only direct
+imports are followed: an alias re-exported through a chain of modules, eg
+`models` importing `Key = str` from `keys`, only invalidates the entry when
+a module on the chain the class's modules import from directly changes.
+
+Every file is hashed, and parsed for its imports, once per process as long
+as its size and modification time stay the same. A hit saves resolving the
+type hints of the class's methods, which only pays off for lazy classes,
+eager ones resolve them anyway to build their wrappers.
+Off unless CONCORDAT_CACHE_DIR is set or set_cache_dir is called.
+"""
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+CACHE_ENV = "CONCORDAT_CACHE_DIR"
+CACHE_VERSION = 2
+DEPENDENCIES = "dependencies"
+
+_source_hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_imports: Dict[Tuple[str, Optional[str]], Tuple[str, FrozenSet[str]]] = {}
+
+
+def _source_hash(path: str) -> str:
+    # a stat is much cheaper than reading and hashing, so we only hash
+    # again when the file looks different, eg it was edited and reloaded
+    info = os.stat(path)
+    stamp = (info.st_mtime_ns, info.st_size)
+    known = _source_hashes.get(path)
+    if known is not None and known[0] == stamp:
+        return known[1]
+    with open(path, "rb") as source:
+        digest = hashlib.sha256(source.read()).hexdigest()
+    _source_hashes[path] = (stamp, digest)
+    return digest
+
+
+def _module_path(module_name: str) -> Optional[str]:
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    return os.path.abspath(path) if path else None
+
+
+def _imported(path: str, package: Optional[str]) -> FrozenSet[str]:
+    # parsing is by far the slowest part of writing an entry, and a module
+    # is asked for by every class in it and in the modules importing it
+    try:
+        digest = _source_hash(path)
+    except OSError:
+        return frozenset()
+    known = _imports.get((path, package))
+    if known is not None and known[0] == digest:
+        return known[1]
+    found = _parse_imports(path, package)
+    _imports[(path, package)] = (digest, found)
+    return found
+
+
+def _parse_imports(path: str, package: Optional[str]) -> FrozenSet[str]:
+    # the modules a source file imports from, and the submodules it imports
+    try:
+        with open(path, "rb") as source:
+            tree = ast.parse(source.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return frozenset()
+    found: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = "." * node.level + (node.module or "")
+            try:
+                base = importlib.util.resolve_name(base, package)
+            except (ImportError, ValueError):
+                continue
+            found.add(base)
+            found.update(f"{base}.{alias.name}" for alias in node.names)
+    return frozenset(found)
+
+
+def _hint_modules(hint: Any, found: Set[str]) -> None:
+    if isinstance(hint, type):
+        found.add(hint.__module__)
+        return
+    origin = getattr(hint, "__origin__", None)
+    if isinstance(origin, type):
+        found.add(origin.__module__)
+    for argument in getattr(hint, "__args__", None) or ():
+        _hint_modules(argument, found)
+
+
+class ConformanceCache:
+    """Remembers which classes conform to their interface
+
+    Args:
+        directory (str): Where the entries live, created on first write
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def entry(self, cls: type) -> Optional[Dict[str, Any]]:
+        """What the cache entry of a class has to look like to count as a hit
+
+        Args:
+            cls (type): The implementation class
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry, None when the class can't be cached,
+                                      eg it's defined in a function or has no source file
+        """
+        if "<locals>" in cls.__qualname__:
+            # factories can build a different class on every call
+            return None
+        path = _module_path(cls.__module__)
+        if path is None:
+            return None
+        sources: Dict[str, str] = {}
+        try:
+            for klass in cls.__mro__[:-1]:
+                module_path = _module_path(klass.__module__)
+                if module_path is None:
+                    return None
+                if module_path not in sources:
+                    sources[module_path] = _source_hash(module_path)
+        except OSError:
+            return None
+        return {
+            "version": CACHE_VERSION,
+            "python": list(sys.version_info[:2]),
+            "module": path,
+            "class": cls.__qualname__,
+            "sources": sources,
+        }
+
+    def path(self, entry: Dict[str, Any]) -> str:
+        """The file holding an entry
+
+        Args:
+            entry (Dict[str, Any]): The entry
+
+        Returns:
+            str: Its path
+        """
+        name = hashlib.sha256(
+            f"{entry['module']}:{entry['class']}".encode()
+        ).hexdigest()
+        return os.path.join(self.directory, f"{name[:32]}.json")
+
+    def hit(self, cls: type) -> bool:
+        """Whether a class is known to conform with its source as it is now
+
+        Args:
+            cls (type): The implementation class
+
+        Returns:
+            bool: True when the conformance check can be skipped
+        """
+        entry = self.entry(cls)
+        if entry is None:
+            return False
+        try:
+            with open(self.path(entry), encoding="utf-8") as stored:
+                found = json.load(stored)
+            dependencies = found.pop(DEPENDENCIES)
+            return bool(found == entry) and all(
+                _source_hash(path) == digest for path, digest in dependencies.items()
+            )
+        except (OSError, ValueError, AttributeError, KeyError):
+            # missing, unreadable, corrupt, or a dependency is gone,
+            # they all mean checking again
+            return False
+
+    def dependencies(
+        self, cls: type, sources: Dict[str, str], hints: Iterable[Dict[str, Any]]
+    ) -> Dict[str, str]:
+        """The source files besides the MRO's a class's conformance depends on
+
+        Args:
+            cls (type): The implementation class
+            sources (Dict[str, str]): The source hashes of the modules in its MRO
+            hints (Iterable[Dict[str, Any]]): The resolved hints that were compared
+
+        Returns:
+            Dict[str, str]: path -> hash of every module imported by a module of
+                            the MRO, or defining a type in the hints
+        """
+        names: Set[str] = set()
+        for klass in cls.__mro__[:-1]:
+            module = sys.modules.get(klass.__module__)
+            path = _module_path(klass.__module__)
+            if path is not None:
+                names.update(_imported(path, getattr(module, "__package__", None)))
+        for types in hints:
+            for hint in types.values():
+                _hint_modules(hint, names)
+        dependencies: Dict[str, str] = {}
+        for name in names:
+            path = _module_path(name)
+            if path is None or path in sources or not os.path.isfile(path):
+                continue
+            try:
+                dependencies[path] = _source_hash(path)
+            except OSError:
+                continue
+        return dependencies
+
+    def store(self, cls: type, hints: Iterable[Dict[str, Any]] = ()) -> None:
+        """Writes down that a class conforms. Never fails, a cache we
+            can't write to just doesn't speed anything up.
+
+        Args:
+            cls (type): The implementation class that just passed the check
+            hints (Iterable[Dict[str, Any]], optional): The resolved hints
+                that were compared, their types' modules are dependencies too.
+                Defaults to ().
+        """
+        entry = self.entry(cls)
+        if entry is None:
+            return
+        stored = {
+            **entry,
+            DEPENDENCIES: self.dependencies(cls, entry["sources"], hints),
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(handle, "w", encoding="utf-8") as output:
+                json.dump(stored, output)
+            # atomic, so a concurrent reader never sees half an entry
+            os.replace(temporary, self.path(entry))
+        except OSError:
+            pass
+
+    def __repr__(self) -> str:
+        return f"<ConformanceCache {self.directory!r}>"
+
+
+_cache: List[Optional[ConformanceCache]] = []
+
+
+def get_cache() -> Optional[ConformanceCache]:
+    """The conformance cache in use, taken from the CONCORDAT_CACHE_DIR
+        environment variable unless set_cache_dir was called
+
+    Returns:
+        Optional[ConformanceCache]: The cache, None when it's off
+    """
+    if not _cache:
+        directory = os.environ.get(CACHE_ENV)
+        _cache.append(ConformanceCache(directory) if directory else None)
+    return _cache[0]
+
+
+def set_cache_dir(directory: Optional[str]) -> None:
+    """Turns the conformance cache on for classes created after the call
+
+    Args:
+        directory (Optional[str]): Where to keep the entries, None turns the cache off
+    """
+    _cache[:] = [ConformanceCache(directory) if directory else None]
@@ -0,0 +1,416 @@
+"""
+Lightweight stdlib type checking. Type hints are compiled once into plain
+predicates built from isinstance tests so the per call work is as small
+as we can make it without pulling in pydantic or beartype.
+"""
+import collections.abc
+import re
+import reprlib
+from itertools import islice
+from random import randrange
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+Predicate = Callable[[Any], bool]
+
+NONE_TYPE = type(None)  # pylint: disable=invalid-name
+REPR_LIMIT = 100
+
+# looks at the first few items of a container only, so showing a huge one
+# costs no more than showing a small one
+_repr = reprlib.Repr()
+_repr.maxlevel = 3
+_repr.maxstring = REPR_LIMIT
+_repr.maxother = REPR_LIMIT
+_repr.maxlong = REPR_LIMIT
+
+try:  # pragma: no cover - only exists from 3.10 onwards
+    from types import UnionType  # type: ignore  # pylint: disable=no-name-in-module
+except ImportError:  # pragma: no cover
+    UnionType = None  # type: ignore # pylint: disable=invalid-name
+
+try:
+    from typing import Literal  # type: ignore  # pylint: disable=no-name-in-module,ungrouped-imports
+except ImportError:  # pragma: no cover
+    Literal = None  # type: ignore # pylint: disable=invalid-name
+
+ANNOTATED_NAMES = ("Annotated", "_AnnotatedAlias")
+CONTAINERS = "__concordat_containers__"
+CONTAINERS_ENV = "CONCORDAT_CONTAINERS"
+
+_STRATEGY_PATTERN = re.compile(r"^\s*(\w+)\s*(?:[(:]\s*([^)\s]*)\s*\)?)?\s*$")
+
+
+class TypeHintViolation(TypeError):
+    """Raised by the stdlib backend when a parameter or return
+        value doesn't match its type hint
+
+    Args:
+        qualname (str): The qualified name of the offending callable
+        parameter (str): The parameter name, or "return" for the return value
+        value (Any): The value that failed the check
+        hint (Any): The type hint it was checked against
+    """
+
+    def __init__(self, qualname: str, parameter: str, value: Any, hint: Any) -> None:
+        self.qualname = qualname
+        self.parameter = parameter
+        self.value = value
+        self.hint = hint
+        if parameter == "return":
+            where = f"return {short_repr(value)}"
+        else:
+            where = f"parameter {parameter}={short_repr(value)}"
+        super().__init__(f"{qualname}() {where} violates type hint {hint!r}")
+
+
+def short_repr(value: Any, limit: int = REPR_LIMIT) -> str:
+    """A repr that can't blow up our error messages, nor take long to build
+
+    Args:
+        value (Any): Whatever we want to show
+        limit (int, optional): Max characters to keep. Defaults to REPR_LIMIT.
+
+    Returns:
+        str: The (possibly truncated) repr
+    """
+    try:
+        text = _repr.repr(value)
+    except Exception:  # pylint: disable=broad-except
+        text = f"<{type(value).__name__} object>"
+    if len(text) > limit:
+        text = text[: limit - 3] + "..."
+    return text
+
+
+def _is_annotated(hint: Any) -> bool:
+    return type(hint).__name__ in ANNOTATED_NAMES and hasattr(hint, "__metadata__")
+
+
+def _is_union(hint: Any, origin: Any) -> bool:
+    return origin is Union or (UnionType is not None and isinstance(hint, UnionType))
+
+
+def _any(predicates: Tuple[Predicate, ...]) -> Predicate:
+    def check(value: Any) -> bool:
+        for predicate in predicates:
+            if predicate(value):
+                return True
+        return False
+
+    return check
+
+
+def _instance_of(cls: Any) -> Optional[Predicate]:
+    try:
+        isinstance(None, cls)
+    except TypeError:
+        # non runtime checkable protocols and friends, nothing we can do cheaply
+        return None
+
+    def check(value: Any) -> bool:
+        return isinstance(value, cls)
+
+    return check
+
+
+def _collection(
+    origin: Any, item: Optional[Predicate], strategy: "ContainerStrategy"
+) -> Predicate:
+    if item is None or strategy.size == 0:
+        return lambda value: isinstance(value, origin)
+
+    if strategy.size is None:
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, origin):
+                return False
+            for element in value:
+                if not item(element):  # type: ignore
+                    return False
+            return True
+
+        return check
+
+    size = strategy.size
+
+    def sampled(value: Any) -> bool:
+        if not isinstance(value, origin):
+            return False
+        length = len(value)
+        if length > size and isinstance(value, collections.abc.Sequence):
+            for _ in range(size):
+                if not item(value[randrange(length)]):  # type: ignore
+                    return False
+            return True
+        # sets and friends have no random access, so we take a window
+        for element in _window(value, length, size):
+            if not item(element):  # type: ignore
+                return False
+        return True
+
+    return sampled
+
+
+def _window(iterable: Any, length: int, size: int) -> Any:
+    # `size` consecutive elements from a random position, so every element
+    # gets its turn over enough calls. Skipping to it is a C level pass over
+    # the elements before it, a few ms per million, nothing gets checked
+    if length <= size:
+        return iterable
+    start = randrange(length - size + 1)
+    return islice(iterable, start, start + size)
+
+
+def _mapping(
+    origin: Any,
+    key: Optional[Predicate],
+    val: Optional[Predicate],
+    strategy: "ContainerStrategy",
+) -> Predicate:
+    if (key is None and val is None) or strategy.size == 0:
+        return lambda value: isinstance(value, origin)
+    key_check = key or (lambda _: True)
+    val_check = val or (lambda _: True)
+    size = strategy.size
+
+    def check(value: Any) -> bool:
+        if not isinstance(value, origin):
+            return False
+        items = (
+            value.items() if size is None else _window(value.items(), len(value), size)
+        )
+        for k, v in items:
+            if not (key_check(k) and val_check(v)):
+                return False
+        return True
+
+    return check
+
+
+def _tuple(args: Tuple, strategy: "ContainerStrategy") -> Predicate:
+    if len(args) == 2 and args[1] is Ellipsis:
+        return _collection(tuple, compile_hint(args[0], strategy), strategy)
+    if args == ((),):
+        # Tuple[()] is the empty tuple
+        return lambda value: isinstance(value, tuple) and not value
+    # fixed size tuples are small by definition, so the strategy doesn't apply
+    items = tuple(compile_hint(arg, strategy) for arg in args)
+    size = len(items)
+
+    def check(value: Any) -> bool:
+        if not isinstance(value, tuple) or len(value) != size:
+            return False
+        for predicate, element in zip(items, value):
+            if predicate is not None and not predicate(element):
+                return False
+        return True
+
+    return check
+
+
+def _subclass_of(args: Tuple) -> Predicate:
+    target = args[0] if args else Any
+    if target is Any or not isinstance(target, type):
+        return lambda value: isinstance(value, type)
+    return lambda value: isinstance(value, type) and issubclass(value, target)
+
+
+class ContainerStrategy:
+    """How much of a container gets looked at. Whatever the strategy,
+        containers are only ever read, never copied.
+
+    - full: every element
+    - sample(k): k random elements of a sequence, k consecutive ones from a
+                 random position of anything else, so O(k) checks per
+                 nesting level
+    - shallow: only the outer type
+
+    Args:
+        name (str): full, sample or shallow
+        size (Optional[int], optional): Elements checked per container, None for all.
+                                        Defaults to None.
+    """
+
+    __slots__ = ("name", "size")
+
+    def __init__(self, name: str, size: Optional[int] = None) -> None:
+        self.name = name
+        self.size = size
+
+    def __repr__(self) -> str:
+        if self.name == "sample":
+            return f"sample({self.size})"
+        return self.name
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ContainerStrategy) and repr(self) == repr(other)
+
+    def __hash__(self) -> int:
+        return hash(repr(self))
+
+
+FULL = ContainerStrategy("full")
+SHALLOW = ContainerStrategy("shallow", 0)
+
+
+def sample(size: int) -> ContainerStrategy:
+    """Check `size` elements per container
+
+    Args:
+        size (int): How many elements to check
+
+    Raises:
+        ValueError: size isn't positive
+
+    Returns:
+        ContainerStrategy: The strategy
+    """
+    size = int(size)
+    if size < 1:
+        raise ValueError(f"Sample size must be at least 1, got {size}")
+    return ContainerStrategy("sample", size)
+
+
+def get_container_strategy(
+    strategy: Union[str, ContainerStrategy, None]
+) -> Optional[ContainerStrategy]:
+    """Parses a container strategy, eg `full`, `shallow` or `sample(10)`
+
+    Args:
+        strategy (Union[str, ContainerStrategy, None]): A strategy or its name
+
+    Raises:
+        ValueError: We can't make sense of the strategy
+
+    Returns:
+        Optional[ContainerStrategy]: The strategy, None when none was given
+    """
+    if strategy is None or isinstance(strategy, ContainerStrategy):
+        return strategy
+    match = _STRATEGY_PATTERN.match(strategy)
+    name = match.group(1).lower() if match else None
+    try:
+        if name == "full" and not match.group(2):  # type: ignore
+            return FULL
+        if name == "shallow" and not match.group(2):  # type: ignore
+            return SHALLOW
+        if name == "sample":
+            return sample(match.group(2))  # type: ignore
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Bad container strategy `{strategy}`: {error}") from None
+    raise ValueError(
+        f"Unknown container strategy `{strategy}`, pick one of full, shallow or sample(k)"
+    )
+
+
+def is_container_hint(hint: Any) -> bool:
+    """Whether checking a hint means looking inside the value,
+        which is what the container strategies are about
+
+    Args:
+        hint (Any): A resolved type hint
+
+    Returns:
+        bool: True for lists, dicts, sets, variadic tuples and the like
+    """
+    if _is_annotated(hint):
+        return is_container_hint(hint.__origin__)
+    origin = getattr(hint, "__origin__", None)
+    args: Tuple = getattr(hint, "__args__", None) or ()
+    if _is_union(hint, origin):
+        return any(is_container_hint(arg) for arg in args)
+    if origin is tuple:
+        return bool(args)
+    if not isinstance(origin, type) or origin is type or not args:
+        return False
+    return issubclass(origin, (collections.abc.Mapping, collections.abc.Collection))
+
+
+def compile_hint(hint: Any, strategy: ContainerStrategy = FULL) -> Optional[Predicate]:
+    """Compiles a resolved type hint into a predicate. The heavy lifting of
+        picking apart the hint happens here, once, so the predicate only
+        has to do isinstance work when it's called.
+
+    Args:
+        hint (Any): A resolved type hint
+        strategy (ContainerStrategy, optional): How much of a container to look at.
+                                                Defaults to FULL.
+
+    Returns:
+        Optional[Predicate]: A predicate returning True when the value matches,
+                             or None when every value matches
+    """
+    # pylint: disable=too-many-return-statements,too-many-branches
+    if hint is Any or hint is object or isinstance(hint, (str, TypeVar)):
+        # unresolved forward references and type variables are left alone
+        return None
+    if hint is None or hint is NONE_TYPE:
+        return lambda value: value is None
+    if _is_annotated(hint):
+        return compile_hint(hint.__origin__, strategy)
+    if callable(hint) and hasattr(hint, "__supertype__"):
+        # typing.NewType
+        return compile_hint(hint.__supertype__, strategy)
+
+    origin = getattr(hint, "__origin__", None)
+    args: Tuple = getattr(hint, "__args__", None) or ()
+
+    if _is_union(hint, origin):
+        predicates = tuple(compile_hint(arg, strategy) for arg in args)
+        if any(predicate is None for predicate in predicates):
+            return None
+        return _any(predicates)  # type: ignore
+    if Literal is not None and origin is Literal:
+        allowed = args
+        return lambda value: any(
+            value == option and type(value) is type(option) for option in allowed
+        )
+    if origin is None:
+        if isinstance(hint, type):
+            return _instance_of(hint)
+        return None
+    if origin is type:
+        return _subclass_of(args)
+    if origin is tuple:
+        if not args:
+            return _instance_of(tuple)
+        return _tuple(args, strategy)
+    if origin is collections.abc.Callable:
+        return callable
+    if not isinstance(origin, type):
+        return None
+    if issubclass(origin, collections.abc.Mapping):
+        if len(args) == 2:
+            return _mapping(
+                origin,
+                compile_hint(args[0], strategy),
+                compile_hint(args[1], strategy),
+                strategy,
+            )
+        return _instance_of(origin)
+    if issubclass(origin, collections.abc.Collection) and len(args) == 1:
+        return _collection(origin, compile_hint(args[0], strategy), strategy)
+    # iterators, generators and user generics can't be looked into without
+    # consuming or guessing, so we stick to the outer type
+    return _instance_of(origin)
+
+
+def compile_hints(
+    hints: Dict[str, Any], strategy: ContainerStrategy = FULL
+) -> Dict[str, Predicate]:
+    """Compiles every hint of a signature, dropping the ones that can't fail
+
+    Args:
+        hints (Dict[str, Any]): Resolved type hints, eg from get_type_hints
+        strategy (ContainerStrategy, optional): How much of a container to look at.
+                                                Defaults to FULL.
+
+    Returns:
+        Dict[str, Predicate]: Predicates for the hints that actually check something
+    """
+    compiled = {}
+    for name, hint in hints.items():
+        predicate = compile_hint(hint, strategy)
+        if predicate is not None:
+            compiled[name] = predicate
+    return compiled
@@ -0,0 +1,185 @@
+"""
+Generated checkers for flat signatures, in the spirit of attrs and dataclasses.
+When every annotation of a function is a plain class, an Optional or a Union of
+plain classes, we write out a wrapper with the very same signature: straight
+line isinstance tests followed by a direct call, so python binds the arguments
+itself and there's no *args packing or predicate dispatch left on the hot path.
+Anything fancier goes to the general engine.
+"""
+from functools import update_wrapper
+from random import random
+from inspect import Parameter, Signature, signature
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from concordat.checkers import NONE_TYPE, TypeHintViolation, _is_union
+from concordat.scoped import override
+
+PREFIX = "__concordat_"
+RETURN = "return"
+SOURCE = "__concordat_source__"
+
+Simple = Tuple[Tuple[type, ...], bool]
+
+
+def simple_hint(hint: Any) -> Optional[Simple]:
+    """Works out whether a hint boils down to a single isinstance test
+
+    Args:
+        hint (Any): A resolved type hint
+
+    Returns:
+        Optional[Simple]: The classes to test against and whether None is
+                          allowed, or None when the hint is too complex
+    """
+    if hint is None or hint is NONE_TYPE:
+        return (), True
+    if isinstance(hint, type) and getattr(hint, "__origin__", None) is None:
+        try:
+            isinstance(None, hint)
+        except TypeError:
+            return None
+        return (hint,), False
+    if _is_union(hint, getattr(hint, "__origin__", None)):
+        classes: List[type] = []
+        optional = False
+        for arg in hint.__args__:
+            simple = simple_hint(arg)
+            if simple is None:
+                return None
+            classes.extend(simple[0])
+            optional = optional or simple[1]
+        return tuple(classes), optional
+    return None
+
+
+def parameter_list(sig: Signature) -> List[str]:
+    """Writes a signature back out as the source of a parameter list. Defaults
+        are written as None, set the real ones on the function afterwards.
+
+    Args:
+        sig (Signature): The signature
+
+    Returns:
+        List[str]: The parameters, "/" and "*" markers included
+    """
+    params: List[str] = []
+    star = False
+    previous = None
+    for parameter in sig.parameters.values():
+        kind = parameter.kind
+        if previous is Parameter.POSITIONAL_ONLY and kind is not previous:
+            params.append("/")
+        if kind is Parameter.KEYWORD_ONLY and not star:
+            params.append("*")
+            star = True
+        if kind is Parameter.VAR_POSITIONAL:
+            params.append(f"*{parameter.name}")
+            star = True
+        elif kind is Parameter.VAR_KEYWORD:
+            params.append(f"**{parameter.name}")
+        elif parameter.default is not Parameter.empty:
+            params.append(f"{parameter.name}=None")
+        else:
+            params.append(parameter.name)
+        previous = kind
+    if previous is Parameter.POSITIONAL_ONLY:
+        params.append("/")
+    return params
+
+
+def _test(name: str, simple: Simple, namespace: Dict[str, Any]) -> str:
+    classes, optional = simple
+    if not classes:
+        return f"{name} is not None"
+    if len(classes) == 1:
+        target = f"{PREFIX}type_{len(namespace)}"
+        namespace[target] = classes[0]
+        # the identity test is the common case and cheaper than isinstance
+        test = (
+            f"{PREFIX}type({name}) is not {target}"
+            f" and not {PREFIX}isinstance({name}, {target})"
+        )
+    else:
+        target = f"{PREFIX}types_{len(namespace)}"
+        namespace[target] = classes
+        test = f"not {PREFIX}isinstance({name}, {target})"
+    if optional:
+        test = f"{name} is not None and {test}"
+    return test
+
+
+def _raise(name: str, parameter: str, hint: Any, namespace: Dict[str, Any]) -> str:
+    target = f"{PREFIX}hint_{len(namespace)}"
+    namespace[target] = hint
+    return f"raise {PREFIX}violation({PREFIX}qualname, {parameter!r}, {name}, {target})"
+
+
+def generate(fnc: Callable, hints: Dict[str, Any]) -> Optional[Callable]:
+    """Generates the checked wrapper of a function with a flat signature
+
+    Args:
+        fnc (Callable): The function as written by the author
+        hints (Dict[str, Any]): Its resolved type hints
+
+    Returns:
+        Optional[Callable]: The wrapper, None when the signature or one of the
+                            hints needs the general engine
+    """
+    # pylint: disable=too-many-locals
+    namespace: Dict[str, Any] = {
+        f"{PREFIX}fnc": fnc,
+        f"{PREFIX}violation": TypeHintViolation,
+        f"{PREFIX}qualname": fnc.__qualname__,
+        # parameters share the scope of the builtins, eg one named `type`
+        f"{PREFIX}type": type,
+        f"{PREFIX}isinstance": isinstance,
+        f"{PREFIX}override": override,
+        f"{PREFIX}random": random,
+    }
+    sig = signature(fnc)
+    arguments: List[str] = []
+    lines: List[str] = []
+    for parameter in sig.parameters.values():
+        name, kind = parameter.name, parameter.kind
+        if kind in (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD):
+            return None
+        if name.startswith(PREFIX):
+            return None
+        arguments.append(f"{name}={name}" if kind is Parameter.KEYWORD_ONLY else name)
+        if hints.get(name, Any) not in (Any, object):
+            simple = simple_hint(hints[name])
+            if simple is None:
+                return None
+            lines.append(f"    if {_test(name, simple, namespace)}:")
+            lines.append(f"        {_raise(name, name, hints[name], namespace)}")
+    call = f"{PREFIX}fnc({', '.join(arguments)})"
+    # turned down by concordat.scoped, one lookup when it isn't
+    rate = f"{PREFIX}rate"
+    lines[:0] = [
+        f"    {rate} = {PREFIX}override()",
+        f"    if {rate} is not None and {PREFIX}random() >= {rate}:",
+        f"        return {call}",
+    ]
+    if hints.get(RETURN, Any) not in (Any, object):
+        simple = simple_hint(hints[RETURN])
+        if simple is None:
+            return None
+        result = f"{PREFIX}result"
+        lines.append(f"    {result} = {call}")
+        lines.append(f"    if {_test(result, simple, namespace)}:")
+        lines.append(f"        {_raise(result, RETURN, hints[RETURN], namespace)}")
+        lines.append(f"    return {result}")
+    else:
+        lines.append(f"    return {call}")
+    params = ", ".join(parameter_list(sig))
+    source = f"def {PREFIX}checked({params}):\n" + "\n".join(lines) + "\n"
+    # named like attrs does it, so tracebacks say where the frame came from
+    filename = f"<concordat generated {fnc.__qualname__}>"
+    exec(compile(source, filename, "exec"), namespace)  # pylint: disable=exec-used
+    checked: Callable = namespace[f"{PREFIX}checked"]
+    # the placeholders in the source are swapped for the real defaults
+    checked.__defaults__ = fnc.__defaults__
+    checked.__kwdefaults__ = fnc.__kwdefaults__
+    update_wrapper(checked, fnc)
+    setattr(checked, SOURCE, source)
+    return checked
@@ -0,0 +1,205 @@
+"""
+Generic interfaces. An interface can take type parameters the usual way,
+and implementations bind them by subclassing a specialization:
+
+    T = TypeVar("T")
+
+    class IRepository(Generic[T], metaclass=InterfaceMeta):
+        @abstract_method
+        def get(self, key: int) -> T:
+            pass
+
+    class UserRepo(IRepository[User]):
+        def get(self, key: int) -> User:
+            ...
+
+The conformance check substitutes the type arguments into the hints of the
+interface, once per specialization. Methods an implementation inherits from
+a generic base, eg `class UserMemoryRepo(MemoryRepo[User])`, are checked
+against the bound types rather than the type variables.
+"""
+from types import FunctionType
+from typing import Any, Callable, Dict, Generic, Iterable, Tuple, TypeVar
+from weakref import WeakKeyDictionary
+
+GENERIC_HINTS = "__concordat_generic_hints__"
+SPECIALIZED = "__concordat_specialized__"
+
+_specialized_hints: "WeakKeyDictionary[Callable, Dict[Tuple, Dict[str, Any]]]" = (
+    WeakKeyDictionary()
+)
+
+
+def lineage(cls: type) -> Tuple[type, ...]:
+    """The MRO of a class without typing.Generic, which generic interfaces
+        have as a base but isn't part of the hierarchy as far as we're
+        concerned: the interface is still the last class before object
+
+    Args:
+        cls (type): The class
+
+    Returns:
+        Tuple[type, ...]: Its MRO, minus Generic
+    """
+    mro = cls.__mro__
+    if Generic not in mro:
+        return mro
+    return tuple(klass for klass in mro if klass is not Generic)
+
+
+def parameters(cls: Any) -> Tuple:
+    """The type parameters a class still has unbound
+
+    Args:
+        cls (Any): The class
+
+    Returns:
+        Tuple: Its TypeVars, empty for anything that isn't generic
+    """
+    if not isinstance(cls, type) or Generic not in cls.__mro__:
+        return ()
+    return tuple(getattr(cls, "__parameters__", ()))
+
+
+def has_type_vars(hint: Any) -> bool:
+    """Whether a hint mentions a type variable
+
+    Args:
+        hint (Any): A resolved type hint
+
+    Returns:
+        bool: True when substituting could change it
+    """
+    if isinstance(hint, TypeVar):
+        return True
+    return not isinstance(hint, type) and bool(getattr(hint, "__parameters__", ()))
+
+
+def substitute(hint: Any, mapping: Dict[Any, Any]) -> Any:
+    """Replaces the type variables of a hint
+
+    Args:
+        hint (Any): A resolved type hint, eg List[T]
+        mapping (Dict[Any, Any]): TypeVar -> what it's bound to
+
+    Returns:
+        Any: The substituted hint, eg List[User]
+    """
+    if isinstance(hint, TypeVar):
+        return mapping.get(hint, hint)
+    if not has_type_vars(hint):
+        return hint
+    # typing does the work, List[T][User] is List[User]
+    return hint[tuple(mapping.get(param, param) for param in hint.__parameters__)]
+
+
+def _arguments(bases: Iterable, ancestor: type) -> Dict[Any, Any]:
+    for base in bases:
+        origin = getattr(base, "__origin__", base)
+        if not isinstance(origin, type) or not issubclass(origin, ancestor):
+            continue
+        if origin is ancestor:
+            bound = {param: param for param in parameters(ancestor)}
+        else:
+            bound = _arguments(
+                origin.__dict__.get("__orig_bases__", origin.__bases__), ancestor
+            )
+        args = getattr(base, "__args__", None) if base is not origin else None
+        if args:
+            mapping = dict(zip(parameters(origin), args))
+            bound = {param: substitute(hint, mapping) for param, hint in bound.items()}
+        return bound
+    return {}
+
+
+def type_arguments(bases: Iterable, ancestor: type) -> Dict[Any, Any]:
+    """What the type parameters of an ancestor are bound to by a class
+
+    Args:
+        bases (Iterable): The bases of the class as written, its
+                          `__orig_bases__` when it subclasses a specialization
+        ancestor (type): A generic class in its hierarchy
+
+    Returns:
+        Dict[Any, Any]: TypeVar of the ancestor -> what it's bound to, which is
+                        a TypeVar of the class while it's still generic itself
+    """
+    return _arguments(bases, ancestor)
+
+
+def bound_arguments(bases: Iterable, ancestor: type) -> Tuple:
+    """The type arguments of an ancestor as bound by a class, in order
+
+    Args:
+        bases (Iterable): See type_arguments
+        ancestor (type): A generic class in its hierarchy
+
+    Returns:
+        Tuple: The arguments, empty when nothing is bound
+    """
+    bound = type_arguments(bases, ancestor)
+    arguments = tuple(bound.get(param, param) for param in parameters(ancestor))
+    if arguments == parameters(ancestor):
+        return ()
+    return arguments
+
+
+def specialize_hints(
+    fnc: Callable, hints: Dict[str, Any], mapping: Dict[Any, Any]
+) -> Dict[str, Any]:
+    """The hints of a function with the type variables substituted, worked
+        out once per function and type arguments
+
+    Args:
+        fnc (Callable): The function the hints belong to
+        hints (Dict[str, Any]): Its resolved hints
+        mapping (Dict[Any, Any]): TypeVar -> what it's bound to
+
+    Returns:
+        Dict[str, Any]: The substituted hints, treat them as read only
+    """
+    key = tuple(mapping.items())
+    try:
+        cache = _specialized_hints.setdefault(fnc, {})
+        return cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # not weak referenceable or unhashable arguments, nothing to cache on
+        return {name: substitute(hint, mapping) for name, hint in hints.items()}
+    specialized = cache[key] = {
+        name: substitute(hint, mapping) for name, hint in hints.items()
+    }
+    return specialized
+
+
+def specialize_function(
+    fnc: Callable, hints: Dict[str, Any], qualname: str
+) -> Callable:
+    """A twin of a function annotated with specialized hints, the backends
+        then compile checks for the bound types. It shares the code, globals,
+        closure and defaults of the original, so it behaves the same.
+
+    Args:
+        fnc (Callable): The function written against type variables
+        hints (Dict[str, Any]): Its specialized hints
+        qualname (str): The qualified name of the twin, on the class it's installed on
+
+    Returns:
+        Callable: The twin
+    """
+    twin = FunctionType(
+        fnc.__code__,  # type: ignore
+        fnc.__globals__,  # type: ignore
+        fnc.__name__,
+        fnc.__defaults__,  # type: ignore
+        fnc.__closure__,  # type: ignore
+    )
+    twin.__kwdefaults__ = fnc.__kwdefaults__  # type: ignore
+    twin.__dict__.update(fnc.__dict__)
+    twin.__annotations__ = dict(hints)
+    twin.__qualname__ = qualname
+    twin.__module__ = fnc.__module__
+    twin.__doc__ = fnc.__doc__
+    setattr(twin, SPECIALIZED, fnc)
+    return twin
@@ -1,101 +1,1205 @@
+# pylint: disable=too-many-lines
 """
 Custom ABC Implementation so we can enforce types at
 runtime and on signatures
 """
+import os
+import sys
+from copy import copy
 from functools import wraps
-from typing import Any, Callable, Dict, List, Set, Tuple, Type, get_type_hints
-from inspect import signature
+from random import random
+from weakref import WeakKeyDictionary, ref
+from inspect import (
+    Parameter,
+    Signature,
+    getattr_static,
+    iscoroutinefunction,
+    isfunction,
+    signature,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    get_type_hints,
+    overload,
+)
+
 
-from pydantic import (  # type: ignore  # pylint: disable=no-name-in-module
-    BaseModel,
-    create_model,
+from concordat.arrays import is_array_hint
+from concordat.binding import ShapeCache, binder
+from concordat.cache import get_cache
+from concordat.checkers import (
+    CONTAINERS,
+    CONTAINERS_ENV,
+    FULL,
+    ContainerStrategy,
+    Predicate,
+    TypeHintViolation,
+    compile_hints,
+    get_container_strategy,
+    is_container_hint,
+)
+from concordat.codegen import generate, parameter_list
+from concordat.generics import (
+    GENERIC_HINTS,
+    bound_arguments,
+    has_type_vars,
+    lineage,
+    parameters,
+    specialize_function,
+    specialize_hints,
+    substitute,
+    type_arguments,
+)
+from concordat.memo import (
+    DEFAULT_MAXSIZE,
+    PURE,
+    Memoized,
+    Purity,
+    can_memoize,
+    get_purity,
+)
+from concordat.metrics import (
+    INSTRUMENT,
+    instrument_by_default,
+    instrumented,
+    register,
+    timed,
 )
-from pydantic.typing import get_all_type_hints  # type: ignore  # pylint: disable=no-name-in-module
-from beartype import beartype
+from concordat.observe import ARGUMENTS, ITEM, observing
+from concordat.policy import (
+    ENFORCEMENT,
+    LAZY,
+    RAW_FUNCTION,
+    EnforcementPolicy,
+    LazyMethod,
+    get_policy,
+    lazy_by_default,
+    raw_function,
+)
+from concordat.provenance import (
+    PROVENANCE,
+    provenance_by_default,
+    remembering,
+    remembering_return,
+)
+from concordat.registry import registry
+from concordat.scoped import override
+from concordat.slots import SLOTS, add_slots, install_setattr
+from concordat.streams import STREAM, Stream, stream_item, streaming
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydantic import BaseModel  # pylint: disable=no-name-in-module
 
 MRO_JUMP = 2
 ALL_METHODS = "all_methods"
 ABSTRACT_METHODS = "abstract_methods"
 IS_ABSTRACT = "__isabstract__"
 RETURN = "return"
+RETURN_FIELD = "return_value"
+RETURN_VALIDATOR = "__return_validator__"
+BACKEND = "__concordat_backend__"
+BACKEND_ENV = "CONCORDAT_BACKEND"
+DEFAULT_BACKEND = "beartype"
+METHOD_TABLE = "__concordat_methods__"
+ABSTRACT_HINTS = "__concordat_abstract_hints__"
+PREPARE = "__concordat_prepare__"
+PURE_METHODS = "__concordat_pure_methods__"
 NONE_TYPE = type(None)  # pylint: disable=invalid-name
 
 
-class ReturnValue(BaseModel):  # type: ignore # pylint: disable=too-few-public-methods
-    """Base class for validating the return
-        type annoation in real time
+_resolved_hints: "WeakKeyDictionary[Callable, Dict[str, Any]]" = WeakKeyDictionary()
+_implementors: Dict[Tuple[int, int], Tuple[bool, "ref[type]", "ref[type]"]] = {}
+_collectors: List[Callable[[type, Exception], None]] = []
+
+
+def set_violation_collector(
+    collector: Optional[Callable[[type, Exception], None]]
+) -> None:
+    """Hands conformance violations to a callback instead of raising them, so
+        a module with several broken classes can be imported in full and every
+        violation reported, see concordat.verify. Classes that don't conform
+        are still created then, but never recorded as implementations.
 
     Args:
-        BaseModel ([type]): [description]
+        collector (Optional[Callable[[type, Exception], None]]): Called with the class
+            and every violation it has, None goes back to raising the first one
+    """
+    _collectors[:] = [collector] if collector is not None else []
+
+
+def _violated(cls: type, violations: List[Exception]) -> None:
+    if not _collectors:
+        raise violations[0]
+    for violation in violations:
+        _collectors[0](cls, violation)
+
+
+def resolve_hints(fnc: Callable) -> Dict[str, Any]:
+    """get_type_hints, but only ever resolved once per function. Our own
+        wrappers are looked through so the backend and the conformance
+        check share the work. Treat the result as read only.
+
+    Args:
+        fnc (Callable): function to be examined
+
+    Raises:
+        NameError: A forward reference can't be resolved yet
+
+    Returns:
+        Dict[str, Any]: The resolved type hints
+    """
+    raw = getattr(fnc, RAW_FUNCTION, fnc)
+    try:
+        return _resolved_hints[raw]
+    except KeyError:
+        pass
+    except TypeError:
+        # not weak referenceable, nothing to cache on
+        return get_type_hints(raw)
+    hints = get_type_hints(raw)
+    _resolved_hints[raw] = hints
+    return hints
+
+
+_pydantic_bases: Dict[str, Any] = {}
+
+
+def _get_pydantic_bases() -> Dict[str, Any]:
+    """pydantic is only imported the first time a validator needs it, and our
+        model base classes are defined along with it. They're reachable as
+        `concordat.interface.ReturnValue` and `ArgumentValues` all the same,
+        python 3.6 builds them when the module is imported.
+
+    Returns:
+        Dict[str, Any]: The model base classes by name
     """
+    if _pydantic_bases:
+        return _pydantic_bases
+    from pydantic import (  # type: ignore  # pylint: disable=no-name-in-module,import-outside-toplevel
+        BaseModel,
+    )
+
+    class ReturnValue(BaseModel):  # type: ignore # pylint: disable=too-few-public-methods,redefined-outer-name
+        """Base class for validating the return
+            type annoation in real time
+
+        Args:
+            BaseModel ([type]): [description]
+        """
+
+        class Config:  # pylint: disable=too-few-public-methods
+            """Additional config to allow for
+            custom classes when validating
+            """
+
+            arbitrary_types_allowed = True
 
-    class Config:  # pylint: disable=too-few-public-methods
-        """Additional config to allow for
-        custom classes when validating
+    class ArgumentValues(ReturnValue):  # type: ignore # pylint: disable=too-few-public-methods
+        """Base class for validating the parameter
+        type annotations in real time
         """
 
-        arbitrary_types_allowed = True
+    for model in (ReturnValue, ArgumentValues):
+        model.__module__ = __name__
+        model.__qualname__ = model.__name__
+        _pydantic_bases[model.__name__] = model
+    return _pydantic_bases
+
+
+def __getattr__(name: str) -> Any:
+    """Hands out the pydantic model bases without importing pydantic
+    along with this module
+    """
+    if name in ("ReturnValue", "ArgumentValues"):
+        return _get_pydantic_bases()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # module __getattr__ (PEP 562) is ignored before 3.7, so ReturnValue and
+    # ArgumentValues are built along with the module, pydantic included
+    globals().update(_get_pydantic_bases())
+
+
+def _build_return_model(
+    fnc: Callable, hints: Optional[Dict[str, Any]] = None
+) -> Optional[Type["BaseModel"]]:
+    """Resolves the return annotation of a function and builds the pydantic
+        model used to validate it. This is the expensive part of return checking
+        so it should only ever happen once per function.
+
+    Args:
+        fnc (Callable): function to be examined
+        hints (Optional[Dict[str, Any]], optional): Resolved hints to use instead of
+                                                    the function's own. Defaults to None.
+
+    Raises:
+        TypeError: "Didn't provide a return type you little rascal. Now start over"
+
+    Returns:
+        Optional[Type[BaseModel]]: the validating model, or None when there is nothing to check
+    """
+    import pydantic  # type: ignore # pylint: disable=import-outside-toplevel
+
+    type_hints = resolve_hints(fnc) if hints is None else hints
+    if RETURN not in type_hints:
+        raise TypeError(
+            "Didn't provide a return type you little rascal. Now start over"
+        )
+    annotation = type_hints[RETURN]
+    if annotation is Any:
+        return None
+    fields: Dict[str, Any] = {RETURN_FIELD: (annotation, ...)}
+    return pydantic.create_model(  # type: ignore
+        f"{fnc.__name__}ReturnTypeAnnotation",
+        __base__=_get_pydantic_bases()["ReturnValue"],
+        **fields,
+    )
+
+
+class ReturnValidator:  # pylint: disable=too-few-public-methods
+    """Precompiled return type check for a single function. The model is
+        built when the validator is created, unless the annotation holds a
+        forward reference that can't be resolved yet (eg the class the method
+        lives on), in which case we build it on the first call instead. A missing
+        return annotation is reported when the function is called, as it always was.
+
+    Args:
+        fnc (Callable): function whose return annotation we validate
+        hints (Optional[Dict[str, Any]], optional): Resolved hints to use instead of
+                                                    the function's own. Defaults to None.
+    """
+
+    __slots__ = ("fnc", "hints", "model", "resolved")
+
+    def __init__(self, fnc: Callable, hints: Optional[Dict[str, Any]] = None) -> None:
+        self.fnc = fnc
+        self.hints = hints
+        self.model: Optional[Type["BaseModel"]] = None
+        self.resolved = False
+        try:
+            self.resolve()
+        except (NameError, TypeError):
+            pass
+
+    def resolve(self) -> None:
+        """Builds the validating model for our function"""
+        self.model = _build_return_model(self.fnc, self.hints)
+        self.resolved = True
+
+    def __call__(self, result: Any) -> None:
+        """Validates a single return value
+
+        Args:
+            result (Any): whatever the function returned
+
+        Raises:
+            ValidationError: the value doesn't match the return annotation
+        """
+        if not self.resolved:
+            self.resolve()
+        if self.model is not None:
+            self.model.parse_obj({RETURN_FIELD: result})
 
 
 def return_type_wrapper(fnc: Callable) -> Any:
-    """Layer for checking the return type at runtime
+    """Layer for checking the return type at runtime. The return annotation is
+        resolved and its validator built once, right here, so the per call
+        path only has to run the value check.
 
     Args:
         fnc ([Callable]): function to be examined
 
     Raises:
         TypeError: "Didn't provide a return type you little rascal. Now start over"
-        TypeError: f"We got result type:{type(result)} and return_type:{return_type}"
+        ValidationError: the result doesn't match the return annotation
 
     Returns:
-        [type]: whatever the type the function author returns
+        [type]: whatever the type the function author returns, iterators and
+                generators come back as a proxy that checks each item and
+                coroutine functions have their awaited result checked
     """
+    try:
+        hints = resolve_hints(fnc)
+        item = stream_item(fnc, hints)
+    except (NameError, TypeError):
+        item = None
+    if item is not None:
+        validator = ReturnValidator(fnc, {RETURN: item})
+        stream = streaming(fnc, hints[RETURN], validator, getattr(fnc, STREAM, 1))
+        if iscoroutinefunction(fnc):
+
+            @wraps(fnc)
+            async def streamed(*args, **kwargs) -> Any:  # type: ignore
+                return stream(await fnc(*args, **kwargs))
+
+        else:
+
+            @wraps(fnc)
+            def streamed(*args, **kwargs) -> Any:  # type: ignore
+                return stream(fnc(*args, **kwargs))
+
+        setattr(streamed, RETURN_VALIDATOR, validator)
+        return streamed
+
+    validator = ReturnValidator(fnc)
+    if iscoroutinefunction(fnc):
+
+        @wraps(fnc)
+        async def awaiting(*args, **kwargs) -> Any:  # type: ignore
+            result = await fnc(*args, **kwargs)
+            validator(result)
+            return result
+
+        setattr(awaiting, RETURN_VALIDATOR, validator)
+        return awaiting
 
     @wraps(fnc)
     def wrapping(*args, **kwargs) -> Any:  # type: ignore
         """Func wrapper to check return type
 
+        Returns:
+            Callable: wrapped function
+        """
+        result = fnc(*args, **kwargs)
+        validator(result)
+        return result
+
+    setattr(wrapping, RETURN_VALIDATOR, validator)
+    return wrapping
+
+
+ArgsCheck = Callable[[Tuple, Dict], None]
+ReturnCheck = Callable[[Any], None]
+Checks = Tuple[Optional[ArgsCheck], Optional[ReturnCheck]]
+
+
+class ValidationBackend:
+    """The engine that enforces type hints at runtime. A backend compiles
+        a function into an argument check and a return check exactly once,
+        and the wrapper it hands back runs each of them once per call.
+
+    Subclasses implement `compile`, everything else is shared.
+    """
+
+    name = ""
+    containers: Optional[ContainerStrategy] = None
+    instrument = False
+    specialize = True
+    observe = False
+    provenance = False
+    # whether containers are looked at in full when no strategy is set
+    exhaustive = True
+
+    def configure(  # pylint: disable=too-many-arguments
+        self,
+        containers: Union[str, ContainerStrategy, None] = None,
+        instrument: Optional[bool] = None,
+        specialize: Optional[bool] = None,
+        observe: Optional[bool] = None,
+        provenance: Optional[bool] = None,
+    ) -> "ValidationBackend":
+        """A copy of this backend with different settings, the ones
+            left at None are copied over as they are
+
+        Args:
+            containers (Union[str, ContainerStrategy, None], optional): How much of
+                container values to check, see concordat.checkers.ContainerStrategy.
+                Defaults to None.
+            instrument (Optional[bool], optional): Record call counts, validation time
+                and violations, see concordat.metrics. Defaults to None.
+            specialize (Optional[bool], optional): Generate dedicated wrappers for
+                flat signatures where the backend supports it, see concordat.codegen.
+                Defaults to None.
+            observe (Optional[bool], optional): Record violations instead of raising
+                them, see concordat.observe. Defaults to None.
+            provenance (Optional[bool], optional): Skip checking containers that were
+                validated already, see concordat.provenance. Defaults to None.
+
+        Returns:
+            ValidationBackend: The configured copy
+        """
+        backend = copy(self)
+        if containers is not None:
+            backend.containers = get_container_strategy(containers)
+        if instrument is not None:
+            backend.instrument = bool(instrument)
+        if specialize is not None:
+            backend.specialize = bool(specialize)
+        if observe is not None:
+            backend.observe = bool(observe)
+        if provenance is not None:
+            backend.provenance = bool(provenance)
+        return backend
+
+    def container_strategy(self, fnc: Callable) -> Optional[ContainerStrategy]:
+        """The container strategy for a function, the one set on the method
+            with @check_containers wins over the one set on the backend
+
+        Args:
+            fnc (Callable): The function to be examined
+
+        Returns:
+            Optional[ContainerStrategy]: The strategy, None to leave it to the backend
+        """
+        return getattr(fnc, CONTAINERS, None) or self.containers
+
+    def compile(self, fnc: Callable, hints: Optional[Dict[str, Any]] = None) -> Checks:
+        """Builds the checks for a single function
+
+        Args:
+            fnc (Callable): The function to be examined
+            hints (Optional[Dict[str, Any]], optional): Resolved hints to check
+                instead of the function's own, eg with the return hint swapped for
+                the item type of a stream. Defaults to None.
+
         Raises:
-            TypeError: "Didn't provide a return type you little rascal. Now start over"
-            TypeError: f"We got result type:{type(result)} and return_type:{return_type}"
+            NameError: A forward reference in the annotations can't be resolved yet
 
         Returns:
-            Callable: wrapped function
+            Checks: The argument and return checks, None when there's nothing to check
         """
+        raise NotImplementedError
 
-        return_annotation = signature(fnc).return_annotation
+    def specialized(  # pylint: disable=unused-argument
+        self, fnc: Callable
+    ) -> Optional[Callable]:
+        """A wrapper written for this one function, used instead of the
+            general one when the backend can produce it
+
+        Args:
+            fnc (Callable): The function to be examined
+
+        Returns:
+            Optional[Callable]: The wrapper, None to use the general one
+        """
+        return None
+
+    def wrap(self, fnc: Callable) -> Callable:
+        """Wraps a function so every call is validated by this backend.
+            Anything that isn't a plain python function is handed back untouched.
+
+        Args:
+            fnc (Callable): The function to be wrapped
+
+        Returns:
+            Callable: The checked function
+        """
+        if not isfunction(fnc):
+            return fnc
         try:
-            type_hints = get_all_type_hints(fnc)
-        except KeyError:
-            raise TypeError(
-                "Didn't provide a return type you little rascal. Now start over"
-            ) from KeyError
-        result = fnc(*args, **kwargs)
+            checks = self.build(fnc)
+        except NameError:
+            # most likely the class the method lives on, try again on first call
+            return self._deferred(fnc)
+        return self._assemble(fnc, checks)
 
-        if any([result is not None, NONE_TYPE != type(return_annotation)]):
-            if not return_annotation:
-                if NONE_TYPE != type(return_annotation):
-                    annotation = None
-                else:
-                    annotation = Any
-            else:
-                val = type_hints[RETURN]
-                annotation = val() if isinstance(Callable, val) else val()
-            fields: Dict[str, Tuple[Any, Any]] = {}
-            fields[RETURN] = annotation  # type: ignore
+    def _assemble(self, fnc: Callable, checks: Tuple) -> Callable:
+        check_args, check_return, stream = checks
+        if self.instrument:
+            checked = instrumented(fnc, checks, register(fnc))
+            setattr(checked, BACKEND, self)
+            setattr(checked, RAW_FUNCTION, fnc)
+        elif iscoroutinefunction(fnc):
+            # a coroutine that returns an iterator streams what it's awaited for
+            checked = _awaited(fnc, check_args, check_return, self, stream=stream)
+        elif stream is not None:
+            checked = _streamed(fnc, check_args, stream, self)
+        else:
+            # generated wrappers raise on their own, observing needs the checks
+            specialized = None if self.observe else self.specialized(fnc)
+            checked = specialized or _checked(fnc, check_args, check_return, self)
+        if isinstance(check_return, ReturnValidator) and not check_return.resolved:
+            # lets concordat.prefork.warmup resolve it ahead of the first call
+            setattr(checked, RETURN_VALIDATOR, check_return)
+        return checked
+
+    def build(
+        self, fnc: Callable
+    ) -> Tuple[Optional[ArgsCheck], Optional[ReturnCheck], Optional[Stream]]:
+        """Compiles a function, taking care of the ones that stream their
+            result: their return check is swapped for one that hands back
+            a proxy checking each item, see concordat.streams
+
+        Args:
+            fnc (Callable): The function to be examined
+
+        Raises:
+            NameError: A forward reference in the annotations can't be resolved yet
+
+        Returns:
+            Tuple[Optional[ArgsCheck], Optional[ReturnCheck], Optional[Stream]]: The
+                argument check, and either the return check or the stream
+        """
+        hints = resolve_hints(fnc)
+        item = stream_item(fnc, hints)
+        if item is None:
+            check_args, check_return = self.compile(fnc)
+            if self.observe:
+                check_args = _observed(check_args, fnc, ARGUMENTS)
+                check_return = _observed(check_return, fnc, RETURN)
+            elif self.provenance:
+                check_args, check_return = self._remembering(
+                    fnc, hints, check_args, check_return
+                )
+            return check_args, check_return, None
+        check_args, check_item = self.compile(fnc, {**hints, RETURN: item})
+        if self.instrument:
+            check_item = timed(check_item, register(fnc))
+        if self.observe:
+            check_args = _observed(check_args, fnc, ARGUMENTS)
+            check_item = _observed(check_item, fnc, ITEM)
+        stream = streaming(fnc, hints[RETURN], check_item, getattr(fnc, STREAM, 1))
+        return check_args, None, stream
 
-            model = create_model(
-                "ValidateReturnTypeAnnotation", __base__=ReturnValue, **fields  # type: ignore
+    def _remembering(
+        self,
+        fnc: Callable,
+        hints: Dict[str, Any],
+        check_args: Optional[ArgsCheck],
+        check_return: Optional[ReturnCheck],
+    ) -> Tuple[Optional[ArgsCheck], Optional[ReturnCheck]]:
+        """Puts the provenance cache in front of the checks of container
+        hints, see concordat.provenance
+        """
+        # *args and **kwargs hold many values, they're checked on every call
+        variadic = {
+            parameter.name
+            for parameter in signature(fnc).parameters.values()
+            if parameter.kind in (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD)
+        }
+        tracked = {
+            key: val
+            for key, val in hints.items()
+            if is_container_hint(val) and key not in variadic
+        }
+        strategy = self.container_strategy(fnc)
+        vouch = self.exhaustive if strategy is None else strategy.size is None
+        if check_return is not None and RETURN in tracked:
+            check_return = remembering_return(check_return, tracked.pop(RETURN), vouch)
+        if check_args is not None and tracked:
+            rest = {key: val for key, val in hints.items() if key not in tracked}
+            check_rest, _ = self.compile(fnc, rest)
+            check_args = remembering(
+                signature(fnc), tracked, check_args, check_rest, vouch
             )
+        return check_args, check_return
+
+    def _deferred(self, fnc: Callable) -> Callable:
+        assembled: List[Callable] = []
+
+        def assemble() -> Callable:
+            if not assembled:
+                assembled.append(self._assemble(fnc, self.build(fnc)))
+            return assembled[0]
+
+        if iscoroutinefunction(fnc):
+
+            @wraps(fnc)
+            async def awaiting(*args, **kwargs) -> Any:  # type: ignore
+                return await assemble()(*args, **kwargs)
+
+            checked = awaiting
+        else:
+
+            @wraps(fnc)
+            def checked(*args, **kwargs) -> Any:  # type: ignore
+                return assemble()(*args, **kwargs)
+
+        setattr(checked, BACKEND, self)
+        setattr(checked, RAW_FUNCTION, fnc)
+        setattr(checked, PREPARE, assemble)
+        return checked
+
+    def __repr__(self) -> str:
+        settings = ""
+        if self.containers is not None:
+            settings += f" containers={self.containers!r}"
+        if self.instrument:
+            settings += " instrumented"
+        if not self.specialize:
+            settings += " unspecialized"
+        if self.observe:
+            settings += " observing"
+        if self.provenance:
+            settings += " provenance"
+        return f"<{type(self).__name__} {self.name!r}{settings}>"
+
 
-            model.parse_obj({RETURN: result})
+def _observed(check: Any, fnc: Callable, where: str) -> Any:
+    return None if check is None else observing(check, fnc, where)
 
+
+def _checked(
+    fnc: Callable,
+    check_args: Optional[ArgsCheck],
+    check_return: Optional[ReturnCheck],
+    backend: ValidationBackend,
+) -> Callable:
+    """Builds the per call wrapper. We specialise on which checks exist
+    so the hot path never has to ask. The only question is whether the
+    call is inside a block that turned checking down, see concordat.scoped
+    """
+    if check_args is not None and check_return is not None:
+
+        @wraps(fnc)
+        def checked(*args, **kwargs) -> Any:  # type: ignore
+            rate = override()
+            if rate is not None and random() >= rate:
+                return fnc(*args, **kwargs)
+            check_args(args, kwargs)  # type: ignore
+            result = fnc(*args, **kwargs)
+            check_return(result)  # type: ignore
+            return result
+
+    elif check_args is not None:
+
+        @wraps(fnc)
+        def checked(*args, **kwargs) -> Any:  # type: ignore
+            rate = override()
+            if rate is not None and random() >= rate:
+                return fnc(*args, **kwargs)
+            check_args(args, kwargs)  # type: ignore
+            return fnc(*args, **kwargs)
+
+    elif check_return is not None:
+
+        @wraps(fnc)
+        def checked(*args, **kwargs) -> Any:  # type: ignore
+            rate = override()
+            if rate is not None and random() >= rate:
+                return fnc(*args, **kwargs)
+            result = fnc(*args, **kwargs)
+            check_return(result)  # type: ignore
+            return result
+
+    else:
+
+        @wraps(fnc)
+        def checked(*args, **kwargs) -> Any:  # type: ignore
+            return fnc(*args, **kwargs)
+
+    setattr(checked, BACKEND, backend)
+    setattr(checked, RAW_FUNCTION, fnc)
+    return checked
+
+
+def _awaited(
+    fnc: Callable,
+    check_args: Optional[ArgsCheck],
+    check_return: Optional[ReturnCheck],
+    backend: ValidationBackend,
+    *,
+    stream: Optional[Stream] = None,
+) -> Callable:
+    """Builds the per call wrapper of a coroutine function. It's a coroutine
+    function itself so the return check, or the stream, sees the awaited
+    result, not the coroutine. The checks are plain calls, nothing here ever
+    blocks the loop. Awaiting dwarfs a couple of None checks so we don't
+    specialise.
+    """
+
+    @wraps(fnc)
+    async def checked(*args, **kwargs) -> Any:  # type: ignore
+        rate = override()
+        if rate is not None and random() >= rate:
+            return await fnc(*args, **kwargs)
+        if check_args is not None:
+            check_args(args, kwargs)
+        result = await fnc(*args, **kwargs)
+        if check_return is not None:
+            check_return(result)
+        if stream is not None:
+            return stream(result)
         return result
 
-    return wrapping
+    setattr(checked, BACKEND, backend)
+    setattr(checked, RAW_FUNCTION, fnc)
+    return checked
+
+
+def _streamed(
+    fnc: Callable,
+    check_args: Optional[ArgsCheck],
+    stream: Stream,
+    backend: ValidationBackend,
+) -> Callable:
+    """Builds the per call wrapper of a function that streams its result"""
+    if check_args is not None:
+
+        @wraps(fnc)
+        def checked(*args, **kwargs) -> Any:  # type: ignore
+            rate = override()
+            if rate is not None and random() >= rate:
+                return fnc(*args, **kwargs)
+            check_args(args, kwargs)  # type: ignore
+            return stream(fnc(*args, **kwargs))
+
+    else:
+
+        @wraps(fnc)
+        def checked(*args, **kwargs) -> Any:  # type: ignore
+            rate = override()
+            if rate is not None and random() >= rate:
+                return fnc(*args, **kwargs)
+            return stream(fnc(*args, **kwargs))
+
+    setattr(checked, BACKEND, backend)
+    setattr(checked, RAW_FUNCTION, fnc)
+    return checked
+
+
+def _signature_twin(fnc: Callable, sig: Signature) -> Callable:
+    """Generates a do nothing function that accepts exactly the same
+    arguments as `fnc`. Decorating it lets an engine that only knows how
+    to wrap whole functions check the arguments on their own.
+    """
+    namespace: Dict[str, Any] = {}
+    exec(  # pylint: disable=exec-used
+        f"def twin({', '.join(parameter_list(sig))}):\n    pass\n", namespace
+    )
+    return _impersonate(namespace["twin"], fnc)
+
+
+def _impersonate(twin: Callable, fnc: Callable) -> Callable:
+    for attribute in ("__name__", "__qualname__", "__module__"):
+        setattr(twin, attribute, getattr(fnc, attribute))
+    return twin
+
+
+def _split_containers(
+    hints: Dict[str, Any], predicate: Callable[[Any], bool] = is_container_hint
+) -> Tuple[Dict, Dict]:
+    """Splits the hints that need looking inside the value from the rest
+
+    Args:
+        hints (Dict[str, Any]): Resolved type hints
+        predicate (Callable[[Any], bool], optional): Which hints to split off.
+                                                     Defaults to is_container_hint.
+
+    Returns:
+        Tuple[Dict, Dict]: The container hints and everything else
+    """
+    containers = {key: val for key, val in hints.items() if predicate(val)}
+    others = {key: val for key, val in hints.items() if key not in containers}
+    return containers, others
+
+
+def _stdlib_checks(
+    fnc: Callable, hints: Dict[str, Any], strategy: ContainerStrategy = FULL
+) -> Checks:
+    """Compiles hints into plain isinstance checks, see concordat.checkers
+
+    Args:
+        fnc (Callable): The function the hints belong to
+        hints (Dict[str, Any]): The resolved hints to check, can be a subset
+        strategy (ContainerStrategy, optional): How much of a container to look at.
+                                                Defaults to FULL.
+
+    Returns:
+        Checks: The argument and return checks, None when there's nothing to check
+    """
+    predicates = compile_hints(hints, strategy)
+    qualname = fnc.__qualname__
+    check_args: Optional[ArgsCheck] = None
+    check_return: Optional[ReturnCheck] = None
+
+    arg_predicates = {key: val for key, val in predicates.items() if key != RETURN}
+    if arg_predicates:
+        check_args = _StdlibArguments(qualname, signature(fnc), hints, arg_predicates)
+
+    if RETURN in predicates:
+        predicate = predicates[RETURN]
+        hint = hints[RETURN]
+
+        def check_return(value: Any) -> None:
+            if not predicate(value):
+                raise TypeHintViolation(qualname, RETURN, value, hint)
+
+    return check_args, check_return
+
 
+def _combine(first: Optional[Callable], second: Optional[Callable]) -> Any:
+    """Runs two checks one after the other, skipping the missing ones"""
+    if first is None or second is None:
+        return first or second
 
+    def both(*args: Any) -> None:
+        first(*args)  # type: ignore
+        second(*args)  # type: ignore
+
+    return both
+
+
+class BeartypeBackend(ValidationBackend):
+    """Checks parameters and the return value with beartype, the
+    same engine concordat has always used for arguments. beartype looks
+    at one random element of a container, unless a container strategy
+    is set, in which case containers are checked by concordat.checkers
+    """
+
+    name = "beartype"
+    exhaustive = False
+
+    def compile(self, fnc: Callable, hints: Optional[Dict[str, Any]] = None) -> Checks:
+        from beartype import (  # type: ignore # pylint: disable=import-outside-toplevel
+            beartype,
+        )
+
+        hints = resolve_hints(fnc) if hints is None else hints
+        strategy = self.container_strategy(fnc)
+        container_args: Optional[ArgsCheck] = None
+        container_return: Optional[ReturnCheck] = None
+        if strategy is not None:
+            containers, hints = _split_containers(hints)
+            container_args, container_return = _stdlib_checks(fnc, containers, strategy)
+
+        check_args: Optional[ArgsCheck] = None
+        check_return: Optional[ReturnCheck] = None
+        arg_hints = {key: val for key, val in hints.items() if key != RETURN}
+        if arg_hints:
+            twin = _signature_twin(fnc, signature(fnc))
+            twin.__annotations__ = arg_hints
+            checked_twin = beartype(twin)
+
+            def check_args(args: Tuple, kwargs: Dict) -> None:
+                checked_twin(*args, **kwargs)
+
+        if hints.get(RETURN, Any) is not Any:
+
+            def returns(value):  # type: ignore
+                return value
+
+            returns.__annotations__ = {RETURN: hints[RETURN]}
+            check_return = beartype(_impersonate(returns, fnc))
+        return (
+            _combine(check_args, container_args),
+            _combine(check_return, container_return),
+        )
+
+
+class PydanticBackend(ValidationBackend):
+    """Checks parameters and the return value with pydantic models that
+    are built once per function. Values are only validated, never coerced.
+    Once a container strategy is set containers skip pydantic, since parsing
+    them copies the whole structure, and are checked by concordat.checkers.
+    Arrays and buffers always skip pydantic, see concordat.arrays
+    """
+
+    name = "pydantic"
+    # pydantic would accept ["1"] for List[int], so what it passed isn't proven
+    exhaustive = False
+
+    def compile(  # pylint: disable=too-many-locals
+        self, fnc: Callable, hints: Optional[Dict[str, Any]] = None
+    ) -> Checks:
+        import pydantic  # type: ignore # pylint: disable=import-outside-toplevel
+
+        hints = resolve_hints(fnc) if hints is None else hints
+        strategy = self.container_strategy(fnc)
+        containers: Dict[str, Any] = {}
+        container_args: Optional[ArgsCheck] = None
+        container_return: Optional[ReturnCheck] = None
+        if strategy is not None:
+            containers, hints = _split_containers(hints)
+            container_args, container_return = _stdlib_checks(fnc, containers, strategy)
+        # arrays and buffers are only ever checked by their metadata, parsing
+        # them would copy or convert them, see concordat.arrays
+        arrays, hints = _split_containers(hints, is_array_hint)
+        array_args, array_return = _stdlib_checks(fnc, arrays)
+        sig = signature(fnc)
+        fields: Dict[str, Any] = {}
+        for index, parameter in enumerate(sig.parameters.values()):
+            if parameter.name not in hints:
+                continue
+            hint = hints[parameter.name]
+            if parameter.kind is Parameter.VAR_POSITIONAL:
+                hint = Tuple[hint, ...]  # type: ignore
+            elif parameter.kind is Parameter.VAR_KEYWORD:
+                hint = Dict[str, hint]  # type: ignore
+            default = ... if parameter.default is Parameter.empty else parameter.default
+            # fields are aliased so parameter names can't clash with BaseModel attributes
+            fields[f"arg_{index}"] = (
+                hint,
+                pydantic.Field(default, alias=parameter.name),
+            )
+        check_args: Optional[ArgsCheck] = None
+        if fields:
+            model = pydantic.create_model(  # type: ignore
+                f"{fnc.__name__}Arguments",
+                __base__=_get_pydantic_bases()["ArgumentValues"],
+                **fields,
+            )
+
+            bind = binder(sig)
+
+            def check_args(args: Tuple, kwargs: Dict) -> None:
+                model.parse_obj(bind(args, kwargs))
+
+        check_return = container_return or array_return
+        if RETURN not in containers and RETURN not in arrays:
+            check_return = ReturnValidator(fnc, hints)
+        return _combine(_combine(check_args, container_args), array_args), check_return
+
+
+class StdlibBackend(ValidationBackend):
+    """Checks parameters and the return value with plain isinstance
+    predicates compiled from the hints, see concordat.checkers.
+    Doesn't need pydantic or beartype at all.
+    """
+
+    name = "stdlib"
+
+    def compile(self, fnc: Callable, hints: Optional[Dict[str, Any]] = None) -> Checks:
+        return _stdlib_checks(
+            fnc,
+            resolve_hints(fnc) if hints is None else hints,
+            self.container_strategy(fnc) or FULL,
+        )
+
+    def specialized(self, fnc: Callable) -> Optional[Callable]:
+        # flat signatures get straight line isinstance tests, which raise
+        # exactly what the predicates would, see concordat.codegen
+        if not self.specialize:
+            return None
+        checked = generate(fnc, resolve_hints(fnc))
+        if checked is not None:
+            setattr(checked, BACKEND, self)
+            setattr(checked, RAW_FUNCTION, fnc)
+        return checked
+
+
+_ArgumentChecks = Tuple[
+    Tuple[Tuple[int, str, Predicate, Any], ...], Tuple[Tuple[str, Predicate, Any], ...]
+]
+
+
+class _StdlibArguments:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Maps positional and keyword arguments onto their predicates without
+    going through inspect on every call. Which predicate each argument
+    needs is worked out once per call shape, see concordat.binding
+    """
+
+    __slots__ = (
+        "qualname",
+        "hints",
+        "predicates",
+        "positional",
+        "var_positional",
+        "keywords",
+        "var_keyword",
+        "plans",
+    )
+
+    def __init__(
+        self, qualname: str, sig: Signature, hints: Dict, predicates: Dict
+    ) -> None:
+        self.qualname = qualname
+        self.hints = hints
+        self.predicates = predicates
+        self.positional: List[Tuple[str, Any]] = []
+        self.var_positional: Optional[str] = None
+        self.keywords: Set[str] = set()
+        self.var_keyword: Optional[str] = None
+        for parameter in sig.parameters.values():
+            kind = parameter.kind
+            if kind is Parameter.VAR_POSITIONAL:
+                self.var_positional = parameter.name
+            elif kind is Parameter.VAR_KEYWORD:
+                self.var_keyword = parameter.name
+            else:
+                if kind is not Parameter.KEYWORD_ONLY:
+                    self.positional.append(
+                        (parameter.name, predicates.get(parameter.name))
+                    )
+                if kind is not Parameter.POSITIONAL_ONLY:
+                    self.keywords.add(parameter.name)
+        self.plans: ShapeCache[_ArgumentChecks] = ShapeCache(self._plan)
+
+    def _plan(self, args: Tuple, kwargs: Dict) -> _ArgumentChecks:
+        # only the arguments that actually have something to check make it in
+        positional = []
+        size = len(self.positional)
+        for index in range(len(args)):
+            if index < size:
+                name, predicate = self.positional[index]
+            elif self.var_positional is not None:
+                name = self.var_positional
+                predicate = self.predicates.get(name)
+            else:
+                # let the call itself complain about the extra arguments
+                break
+            if predicate is not None:
+                positional.append((index, name, predicate, self.hints[name]))
+        keywords = []
+        for name in kwargs:
+            key = name if name in self.keywords else self.var_keyword
+            predicate = self.predicates.get(key)
+            if predicate is not None:
+                keywords.append((name, predicate, self.hints[key]))
+        return tuple(positional), tuple(keywords)
+
+    def __call__(self, args: Tuple, kwargs: Dict) -> None:
+        positional, keywords = self.plans.get(args, kwargs)
+        for index, name, predicate, hint in positional:
+            value = args[index]
+            if not predicate(value):
+                raise TypeHintViolation(self.qualname, name, value, hint)
+        for name, predicate, hint in keywords:
+            value = kwargs[name]
+            if not predicate(value):
+                raise TypeHintViolation(self.qualname, name, value, hint)
+
+
+BACKENDS: Dict[str, ValidationBackend] = {
+    backend.name: backend
+    for backend in (BeartypeBackend(), PydanticBackend(), StdlibBackend())
+}
+_default_backend: List[ValidationBackend] = []
+
+
+def get_backend(
+    backend: Union[str, ValidationBackend, None] = None
+) -> ValidationBackend:
+    """Looks up a validation backend by name. Without a name we hand back the
+        global default, which comes from the CONCORDAT_BACKEND environment
+        variable unless set_default_backend was called.
+
+    Args:
+        backend (Union[str, ValidationBackend, None], optional): A backend or its name.
+                                                                 Defaults to None.
+
+    Raises:
+        ValueError: We don't know a backend by that name
+
+    Returns:
+        ValidationBackend: The backend
+    """
+    if isinstance(backend, ValidationBackend):
+        return backend
+    if backend is None:
+        if not _default_backend:
+            _default_backend.append(
+                get_backend(os.environ.get(BACKEND_ENV, DEFAULT_BACKEND))
+            )
+        return _default_backend[0]
+    try:
+        return BACKENDS[backend.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown validation backend `{backend}`, pick one of {sorted(BACKENDS)}"
+        ) from None
+
+
+def set_default_backend(backend: Union[str, ValidationBackend]) -> None:
+    """Sets the backend used by every class that doesn't pick its own.
+        Only affects classes created after the call.
+
+    Args:
+        backend (Union[str, ValidationBackend]): A backend or its name
+    """
+    _default_backend[:] = [get_backend(backend)]
+
+
+def implements(obj: Any, interface: type) -> bool:
+    """Whether an object or a type provides every abstract method of an
+        interface with the same type hints, whether or not it inherits from
+        it. Subclasses of the interface always do, InterfaceMeta made sure of
+        that when they were created. The answer is cached per type and
+        interface, weakly on both sides, so dynamically created types and
+        interfaces can still be collected. Methods patched onto a type after
+        it was first checked aren't noticed.
+
+    Usage:
+
+        if implements(adapter, IStorage):
+            route(adapter)
+
+    Args:
+        obj (Any): An instance, or a type
+        interface (type): An interface, the root of a hierarchy built by InterfaceMeta
+
+    Raises:
+        TypeError: `interface` isn't an interface
+
+    Returns:
+        bool: True when every abstract method is there with matching hints
+    """
+    cls = obj if isinstance(obj, type) else type(obj)
+    key = (id(cls), id(interface))
+    known = _implementors.get(key)
+    if known is not None:
+        return known[0]
+    if not isinstance(interface, InterfaceMeta) or len(lineage(interface)) > MRO_JUMP:
+        raise TypeError(f"Can only check against interfaces, got {interface!r}")
+    try:
+        result = issubclass(cls, interface) or _conforms(cls, interface)
+    except NameError:
+        # a forward reference that may still resolve, so don't remember
+        return False
+
+    def forget(_: Any) -> None:
+        _implementors.pop(key, None)
+
+    # the entry goes as soon as either side is collected, before its id
+    # can be handed to a new object
+    _implementors[key] = (result, ref(cls, forget), ref(interface, forget))
+    return result
+
+
+def _conforms(cls: type, interface: type) -> bool:
+    contract = InterfaceMeta._get_interface_hints(  # pylint: disable=protected-access
+        interface
+    )
+    for method, hints in contract.items():
+        try:
+            attribute = getattr_static(cls, method)
+        except AttributeError:
+            return False
+        fnc = raw_function(attribute)
+        if not callable(fnc):
+            return False
+        try:
+            if resolve_hints(fnc) != hints:
+                return False
+        except TypeError:
+            # builtins and the like have no hints to compare
+            return False
+    return True
+
+
+@overload
 def abstract_method(func: Callable) -> Callable:
+    ...
+
+
+@overload
+def abstract_method(
+    func: None = None,
+    *,
+    pure: Union[bool, Purity] = False,
+    maxsize: int = DEFAULT_MAXSIZE,
+    ttl: Optional[float] = None,
+) -> Callable[[Callable], Callable]:
+    ...
+
+
+def abstract_method(
+    func: Optional[Callable] = None,
+    *,
+    pure: Union[bool, Purity] = False,
+    maxsize: int = DEFAULT_MAXSIZE,
+    ttl: Optional[float] = None,
+) -> Any:
     """A decorator indicating abstract methods.
        Requires that the metaclass is InterfaceMeta or must derive from it.
        A class that has a metaclass derived from InterfaceMeta cannot be
@@ -105,6 +1209,11 @@ def abstract_method(func: Callable) -> Callable:
        'super' call mechanisms.  @abstract_method may be used to declare
        abstract methods for properties and descriptors.
 
+       Methods declared pure return the same thing for the same arguments, so
+       every implementation gets a bounded cache in front of its checked method
+       and only cache misses are validated, see concordat.memo. The cache hangs
+       off the method as `cache`, with stats(), invalidate(...) and clear().
+
     Usage:
 
         class C(metaclass=InterfaceMeta):
@@ -113,14 +1222,87 @@ def abstract_method(func: Callable) -> Callable:
             def my_abstract_method(self, ...):
                 ...
 
+            @abstract_method(pure=True, maxsize=1024, ttl=60)
+            def lookup(self, key: str) -> int:
+                ...
+
+    Args:
+        func (Optional[Callable]): The method that we are tagging in our interface
+        pure (Union[bool, Purity], optional): Cache the results of implementations.
+                                              Defaults to False.
+        maxsize (int, optional): How many results each implementation keeps.
+                                 Defaults to DEFAULT_MAXSIZE.
+        ttl (Optional[float], optional): Seconds a result stays fresh, None for
+                                         forever. Defaults to None.
+
+    Raises:
+        TypeError: A coroutine or generator was declared pure, their results
+                   can only be consumed once
+
+    Returns:
+        Callable: The original fuction is returned with __isabstract__ = True,
+                  or a decorator doing that when called with arguments
+    """
+    purity = get_purity(pure, maxsize, ttl)
+
+    def tag(func: Callable) -> Callable:
+        setattr(func, IS_ABSTRACT, True)
+        if purity is not None:
+            if not can_memoize(func):
+                raise TypeError(
+                    f"{func.__qualname__} can't be pure, its results can only be consumed once"
+                )
+            setattr(func, PURE, purity)
+        return func
+
+    return tag if func is None else tag(func)
+
+
+def check_containers(strategy: Union[str, ContainerStrategy]) -> Callable:
+    """A decorator picking the container strategy for a single method,
+        it wins over the one of the class. See concordat.checkers.ContainerStrategy.
+
+    Usage:
+
+        class Bulk(IBulk, containers="shallow"):
+
+            @check_containers("sample(10)")
+            def load(self, rows: List[Dict[str, int]]) -> int:
+                ...
+
     Args:
-        func (Callable): The method that we are tagging in our interface
+        strategy (Union[str, ContainerStrategy]): full, shallow or sample(k)
 
     Returns:
-        Callable: The original fuction is returned with __isabstract__ = True
+        Callable: The decorator, it hands back the very same function
     """
-    setattr(func, IS_ABSTRACT, True)
-    return func
+    parsed = get_container_strategy(strategy)
+
+    def decorator(func: Callable) -> Callable:
+        target = func.__func__ if isinstance(func, staticmethod) else func
+        setattr(target, CONTAINERS, parsed)
+        return func
+
+    return decorator
+
+
+def default_container_strategy(
+    strategy: Union[str, ContainerStrategy, None] = None
+) -> Optional[ContainerStrategy]:
+    """Parses a class's container strategy, falling back on the
+        CONCORDAT_CONTAINERS environment variable, and finally on None
+        which leaves containers to the backend
+
+    Args:
+        strategy (Union[str, ContainerStrategy, None], optional): A strategy or its name.
+                                                                  Defaults to None.
+
+    Returns:
+        Optional[ContainerStrategy]: The strategy
+    """
+    if strategy is None:
+        strategy = os.environ.get(CONTAINERS_ENV) or None
+    return get_container_strategy(strategy)
 
 
 class InterfaceMeta(type):
@@ -135,7 +1317,7 @@ class InterfaceMeta(type):
     """
 
     def __init__(  # pylint: disable=unused-argument,super-init-not-called)
-        cls, name: str, bases: Tuple, namespace: Dict
+        cls, name: str, bases: Tuple, namespace: Dict, **kwargs: Any
     ) -> None:
         """Here we validate the implementations that were defined in our interface.
             Further, we also wrap every method automagically with pydantics validate_arguments
@@ -145,6 +1327,7 @@ class InterfaceMeta(type):
             name (str): The actual class name
             bases (Tuple): all inherited classes
             namespace (Dict): All objects associated with this class
+            kwargs (Any): Class keywords, already handled in __new__
 
         Raises:
             NotImplementedError: In user defined base classes, abstract methods
@@ -157,31 +1340,97 @@ class InterfaceMeta(type):
                        is of inappropriate type to the Interfaces type.
         """
 
-        if len(cls.mro()) > MRO_JUMP:
-            interface_base = cls.mro()[-MRO_JUMP]
+        mro = lineage(cls)
+        if len(mro) > MRO_JUMP:
+            cache = get_cache()
+            if cache is not None and cache.hit(cls):
+                # conformed last time and none of the source changed since
+                registry.record(mro[-MRO_JUMP], cls)
+                return
+            interface_base = mro[-MRO_JUMP]
+            arguments: Tuple = ()
+            if parameters(interface_base):
+                arguments = bound_arguments(
+                    cls.__dict__.get("__orig_bases__", cls.__bases__), interface_base
+                )
+            interface_hints, violations = InterfaceMeta._check_conformance(
+                cls, interface_base, arguments
+            )
+            if violations:
+                _violated(cls, violations)
+                return
+            if cache is not None:
+                cache.store(
+                    cls,
+                    [*interface_hints.values()]
+                    + [
+                        cls.__dict__[METHOD_TABLE][method] or {}
+                        for method in interface_hints
+                    ],
+                )
+            registry.record(interface_base, cls)
+
+    @staticmethod
+    def _check_conformance(
+        implementation: type, interface_base: type, arguments: Tuple
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[Exception]]:
+        """Compares the hints of every abstract method of the interface with
+            the ones of the class. Whatever goes wrong is handed back rather
+            than raised, so a violation collector gets to see all of it,
+            forward references that can't be resolved included.
 
-            must_implement = getattr(interface_base, ABSTRACT_METHODS, [])
+        Args:
+            implementation (type): The class
+            interface_base (type): The interface it implements
+            arguments (Tuple): The type arguments it binds, for generic interfaces
 
-            class_methods = (
-                cls._get_class_methods()  # pylint: disable=no-value-for-parameter
+        Returns:
+            Tuple[Dict[str, Dict[str, Any]], List[Exception]]: The interface's
+                hints per method, and the violations
+        """
+        name = implementation.__name__
+        method_table: Dict[str, Optional[Dict]] = implementation.__dict__[METHOD_TABLE]
+        violations: List[Exception] = []
+        try:
+            interface_hints = InterfaceMeta._get_interface_hints(
+                interface_base, arguments
             )
+        except NameError as error:
+            # a forward reference of the interface that can't be resolved
+            interface_hints = {}
+            violations.append(error)
 
-            for method in must_implement:
-                if method not in class_methods:
-                    raise NotImplementedError(
+        for method, interface_definition in interface_hints.items():
+            if method not in method_table:
+                violations.append(
+                    NotImplementedError(
                         f"""Can't create abstract class {name}!
                     {name} must implement abstract method {method}
                     of class {interface_base.__name__}!"""
                     )
-                interface_definition: Dict[str, str] = get_type_hints(
-                    getattr(interface_base, method)
                 )
-                instance_definition: Dict[str, str] = get_type_hints(
-                    getattr(cls, method)
-                )
-                if instance_definition != interface_definition:
-                    raise TypeError(
-                        f"Instance `{cls.__name__}` inherits from"
+                continue
+            instance_definition = method_table[method]
+            if instance_definition is None:
+                # only methods defined on this very class get resolved here,
+                # inherited ones were resolved when the parent was created
+                try:
+                    instance_definition = resolve_hints(
+                        raw_function(getattr_static(implementation, method))
+                    )
+                except NameError as error:
+                    violations.append(
+                        NameError(
+                            f"Can't resolve the type hints of {name}.{method}: "
+                            + str(error)
+                        )
+                    )
+                    continue
+                method_table[method] = instance_definition
+            if instance_definition != interface_definition:
+                violations.append(
+                    TypeError(
+                        f"Instance `{name}` inherits from"
                         + f" Interface `{interface_base.__name__}`.\n "
                         + f"The method `{method}` doesn't match. We expect:\n"
                         + "\n,".join(
@@ -194,40 +1443,230 @@ class InterfaceMeta(type):
                             ]
                         )
                     )
+                )
+        return interface_hints, violations
 
-    def __new__(cls: Type, name: str, bases: Tuple, namespace: Dict) -> Any:
+    def __new__(  # pylint: disable=too-many-arguments,too-many-locals
+        cls: Type,
+        name: str,
+        bases: Tuple,
+        namespace: Dict,
+        backend: Union[str, ValidationBackend, None] = None,
+        enforcement: Union[str, EnforcementPolicy, None] = None,
+        lazy: Optional[bool] = None,
+        containers: Union[str, ContainerStrategy, None] = None,
+        instrument: Optional[bool] = None,
+        provenance: Optional[bool] = None,
+        slots: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> Any:
         """Since __new__ is called whenever calling on said class name we can reliably
             always set some base attributes for our interface to later reference when
             we instantiate the object.
 
+        Usage:
+
+            class Fast(IValid, backend="stdlib", enforcement="sampled(0.01)"):
+                ...
+
         Args:
             cls (Type): The most primitive of all python types
             name (str): The name of the class
             bases (Tuple): All inherited classes
             namespace (Dict): All objects associated with this class
+            backend (Union[str, ValidationBackend, None], optional): The validation backend
+                for this class and its subclasses. Defaults to the one inherited from a
+                base class, then the global default.
+            enforcement (Union[str, EnforcementPolicy, None], optional): How often the
+                checks run, see concordat.policy. Inherited and defaulted like the backend.
+            lazy (Optional[bool], optional): Build the checked methods the first time
+                they're looked up instead of right now. Inherited, and defaults to the
+                CONCORDAT_LAZY environment variable.
+            containers (Union[str, ContainerStrategy, None], optional): How much of
+                container values to check: full, shallow or sample(k). Inherited, and
+                defaults to the CONCORDAT_CONTAINERS environment variable, then to
+                whatever the backend does on its own.
+            instrument (Optional[bool], optional): Record call counts, validation time
+                and violations per method, see concordat.metrics. Inherited, and
+                defaults to the CONCORDAT_INSTRUMENT environment variable.
+            provenance (Optional[bool], optional): Skip checking containers that
+                were validated already, see concordat.provenance. Inherited, and
+                defaults to the CONCORDAT_PROVENANCE environment variable.
+            slots (Optional[bool], optional): Generate `__slots__` from the attributes
+                annotated in the class body, and a `__setattr__` checking them, see
+                concordat.slots. Inherited, and off by default.
 
         Returns:
             Any: The instance of our class that has been created
         """
+        validation: ValidationBackend = InterfaceMeta._get_setting(
+            bases, namespace, BACKEND, backend, get_backend
+        )
+        policy = InterfaceMeta._get_setting(
+            bases, namespace, ENFORCEMENT, enforcement, get_policy
+        )
+        lazy = InterfaceMeta._get_setting(
+            bases,
+            namespace,
+            LAZY,
+            lazy,
+            lambda value: lazy_by_default() if value is None else bool(value),
+        )
+        strategy = InterfaceMeta._get_setting(
+            bases, namespace, CONTAINERS, containers, default_container_strategy
+        )
+        if strategy is not None and strategy != validation.containers:
+            validation = validation.configure(containers=strategy)
+        instrument = InterfaceMeta._get_setting(
+            bases,
+            namespace,
+            INSTRUMENT,
+            instrument,
+            lambda value: instrument_by_default() if value is None else bool(value),
+        )
+        if instrument != validation.instrument:
+            validation = validation.configure(instrument=instrument)
+        provenance = InterfaceMeta._get_setting(
+            bases,
+            namespace,
+            PROVENANCE,
+            provenance,
+            lambda value: provenance_by_default() if value is None else bool(value),
+        )
+        if provenance != validation.provenance:
+            validation = validation.configure(provenance=provenance)
+        slotted = InterfaceMeta._get_setting(bases, namespace, SLOTS, slots, bool)
+        InterfaceMeta._specialize_inherited(bases, namespace)
         namespace[ABSTRACT_METHODS] = InterfaceMeta._get_abstract_methods(namespace)
         namespace[ALL_METHODS] = InterfaceMeta._get_all_methods(namespace)
+        namespace[METHOD_TABLE] = InterfaceMeta._get_method_table(
+            bases, namespace[ALL_METHODS]
+        )
+        pure = namespace[PURE_METHODS] = InterfaceMeta._get_pure_methods(
+            bases, namespace
+        )
         for attribute_name, attribute in namespace.items():
-            if isinstance(attribute, Callable):  # type: ignore
-                attribute = return_type_wrapper(beartype(attribute))
             if isinstance(attribute, staticmethod):
                 # Here we decouple the static method from the function
-                # and wedge the validate_arguments between the staticmethod
+                # and wedge the validation between the staticmethod
                 # wrapper and go on our merry way baby
-                attribute = staticmethod(
-                    return_type_wrapper(beartype(attribute.__func__))
+                fnc, static = attribute.__func__, True
+            elif isinstance(attribute, Callable):  # type: ignore
+                # staticmethods are callable themselves from 3.10 onwards,
+                # so they have to be caught before we get here
+                fnc, static = attribute, False
+            else:
+                continue
+            method_policy = policy
+            if attribute_name in pure and not getattr(fnc, IS_ABSTRACT, False):
+                method_policy = Memoized(policy, pure[attribute_name])
+            if lazy and isfunction(fnc):
+                namespace[attribute_name] = LazyMethod(
+                    fnc, method_policy, validation, static
                 )
-                # attribute = staticmethod(type_enforcer(attribute.__func__))
-            namespace[attribute_name] = attribute
+            else:
+                namespace[attribute_name] = method_policy.install(
+                    fnc, validation, static
+                )
+        typed = add_slots(bases, namespace) if slotted else ()
         cls = super().__new__(  # pylint: disable=self-cls-assignment
-            cls, name, bases, namespace
+            cls, name, bases, namespace, **kwargs
         )  # pylint: disable=trailing-whitespace
+        if typed:
+            install_setattr(cls, strategy, policy.name != "off")
         return cls
 
+    @staticmethod
+    def _get_setting(
+        bases: Tuple,
+        namespace: Dict,
+        attribute: str,
+        explicit: Any,
+        resolve: Callable[[Any], Any],
+    ) -> Any:
+        """Works out a per class setting. A class keyword wins and is remembered
+            on the class for its subclasses, then whatever a base class chose,
+            and finally the global default, which is `resolve(None)`.
+
+        Args:
+            bases (Tuple): All inherited classes
+            namespace (Dict): All objects associated with this class
+            attribute (str): The class attribute holding the setting
+            explicit (Any): The class keyword, None when not given
+            resolve (Callable[[Any], Any]): Turns the keyword into the setting
+
+        Returns:
+            Any: The setting
+        """
+        if explicit is not None:
+            value = resolve(explicit)
+            namespace[attribute] = value
+            return value
+        value = InterfaceMeta._get_inherited(bases, attribute)
+        return resolve(None) if value is None else value
+
+    @staticmethod
+    def _specialize_inherited(  # pylint: disable=too-many-locals
+        bases: Tuple, namespace: Dict
+    ) -> None:
+        """A class subclassing a specialization of a generic implementation,
+            eg `UserMemoryRepo(MemoryRepo[User])`, gets twins of the methods it
+            inherits that are annotated with type variables, with the bound
+            types substituted, so they're checked against those
+
+        Args:
+            bases (Tuple): All inherited classes
+            namespace (Dict): All objects associated with this class
+        """
+        orig_bases = namespace.get("__orig_bases__")
+        if orig_bases is None:
+            return
+        qualname = namespace.get("__qualname__", "")
+        seen = set(namespace)
+        for base in bases:
+            for klass in lineage(base)[: -MRO_JUMP or None]:
+                generic = bool(parameters(klass))
+                for method in klass.__dict__.get(ALL_METHODS, ()):
+                    if method in seen:
+                        continue
+                    seen.add(method)
+                    attribute = klass.__dict__.get(method)
+                    fnc = raw_function(attribute)
+                    if not generic or not isfunction(fnc):
+                        continue
+                    try:
+                        hints = resolve_hints(fnc)
+                    except NameError:
+                        continue
+                    if not any(has_type_vars(hint) for hint in hints.values()):
+                        continue
+                    mapping = type_arguments(orig_bases, klass)
+                    specialized = specialize_hints(fnc, hints, mapping)
+                    if specialized == hints:
+                        continue
+                    twin = specialize_function(fnc, specialized, f"{qualname}.{method}")
+                    static = isinstance(attribute, staticmethod) or getattr(
+                        attribute, "static", False
+                    )
+                    namespace[method] = staticmethod(twin) if static else twin
+
+    @staticmethod
+    def _get_inherited(bases: Tuple, attribute: str) -> Any:
+        """Finds a setting that one of our base classes chose explicitly
+
+        Args:
+            bases (Tuple): All inherited classes
+            attribute (str): The class attribute holding the setting
+
+        Returns:
+            Any: The first setting found, or None
+        """
+        for base in bases:
+            value = getattr(base, attribute, None)
+            if value is not None:
+                return value
+        return None
+
     @staticmethod
     def _get_abstract_methods(namespace: Dict) -> List[Callable]:
         """A way for us to retrieve all the methods that were
@@ -246,6 +1685,26 @@ class InterfaceMeta(type):
             if callable(val) and getattr(val, IS_ABSTRACT, False)
         ]
 
+    @staticmethod
+    def _get_pure_methods(bases: Tuple, namespace: Dict) -> Dict[str, Purity]:
+        """The methods an interface in our hierarchy declared pure
+
+        Args:
+            bases (Tuple): All inherited classes
+            namespace (Dict): All objects associated with this class
+
+        Returns:
+            Dict[str, Purity]: method name -> how its results are cached
+        """
+        pure: Dict[str, Purity] = {}
+        for base in reversed(bases):
+            pure.update(base.__dict__.get(PURE_METHODS, {}))
+        for name in namespace[ABSTRACT_METHODS]:
+            purity = getattr(namespace[name], PURE, None)
+            if purity is not None:
+                pure[name] = purity
+        return pure
+
     @staticmethod
     def _get_all_methods(namespace: Dict) -> List[Callable]:
         """A way for us to retrieve all the methods that
@@ -263,6 +1722,73 @@ class InterfaceMeta(type):
             if callable(val) or isinstance(val, staticmethod)
         ]
 
+    @staticmethod
+    def _get_method_table(bases: Tuple, all_methods: List[str]) -> Dict:
+        """Builds the method table of a new class from the tables of its parents,
+            so we never have to walk the whole MRO again. The table maps every
+            method the class implements to its resolved type hints, or None
+            while they haven't been needed yet. Like _get_class_methods, methods
+            of the Interface itself don't count as implemented.
+
+        Args:
+            bases (Tuple): All inherited classes
+            all_methods (List[str]): The methods defined on the new class itself
+
+        Returns:
+            Dict: method name -> resolved type hints or None
+        """
+        table: Dict[str, Optional[Dict]] = {}
+        for base in reversed(bases):
+            if len(lineage(base)) > MRO_JUMP:
+                table.update(base.__dict__.get(METHOD_TABLE, {}))
+        for method in all_methods:
+            table[method] = None
+        return table
+
+    @staticmethod
+    def _get_interface_hints(
+        interface_base: type, arguments: Tuple = ()
+    ) -> Dict[str, Dict]:
+        """The resolved type hints of every abstract method on an interface.
+            Resolved once, the first time an implementation needs them,
+            since forward references may not resolve while the interface
+            is still being defined. The hints of a generic interface are
+            substituted once per specialization, see concordat.generics.
+
+        Args:
+            interface_base (type): The interface at the root of the hierarchy
+            arguments (Tuple, optional): The type arguments of a generic interface,
+                                         empty for the hints as written. Defaults to ().
+
+        Returns:
+            Dict[str, Dict]: abstract method name -> resolved type hints
+        """
+        hints = interface_base.__dict__.get(ABSTRACT_HINTS)
+        if hints is None:
+            hints = {
+                method: resolve_hints(
+                    raw_function(getattr_static(interface_base, method))
+                )
+                for method in getattr(interface_base, ABSTRACT_METHODS, [])
+            }
+            setattr(interface_base, ABSTRACT_HINTS, hints)
+        if not arguments:
+            return hints
+        specializations = interface_base.__dict__.get(GENERIC_HINTS)
+        if specializations is None:
+            specializations = {}
+            setattr(interface_base, GENERIC_HINTS, specializations)
+        specialized = specializations.get(arguments)
+        if specialized is None:
+            mapping = dict(zip(parameters(interface_base), arguments))
+            specialized = specializations[arguments] = {
+                method: {
+                    name: substitute(hint, mapping) for name, hint in types.items()
+                }
+                for method, types in hints.items()
+            }
+        return specialized
+
     def _get_class_methods(cls) -> Set:
         """Gets all unique methods from the current class.
            This excludes the Interface methods, but includes all inherited methods,
@@ -271,6 +1797,4 @@ class InterfaceMeta(type):
         Returns:
             Set: All class methods
         """
-        return {
-            i for cls in cls.mro()[:-MRO_JUMP] for i in getattr(cls, ALL_METHODS, [])
-        }
+        return set(cls.__dict__.get(METHOD_TABLE, ()))
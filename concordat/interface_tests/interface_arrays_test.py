@@ -0,0 +1,193 @@
+import array
+from typing import Any, NamedTuple, Optional, Tuple
+
+import pytest
+from beartype.roar import BeartypeCallHintPepParamException
+
+from concordat.arrays import Array, Buffer, is_array_hint
+from concordat.checkers import TypeHintViolation
+from concordat.interface import InterfaceMeta, abstract_method, get_backend
+
+
+class Flags(NamedTuple):
+    c_contiguous: bool
+    f_contiguous: bool
+
+
+class Frame:
+    """Anything with a dtype and a shape passes for an array, like a tensor"""
+
+    def __init__(self, dtype: str, shape: Tuple[int, ...], order: str = "C") -> None:
+        self.dtype = dtype
+        self.shape = shape
+        self.flags = Flags(order == "C", order == "F")
+
+    def __iter__(self) -> Any:
+        raise AssertionError("the elements were looked at")
+
+
+def test_specializations_are_cached() -> None:
+    assert Array["float64", (None, 3)] is Array["float64", (None, 3)]
+    assert Array["float64", (None, 3)] is not Array["float64", (None, 4)]
+    assert Array["float64"] is Array["float64", None, None]
+    assert Buffer["@d"] is Buffer["d"]
+    assert repr(Array["float64", (None, 3), "C"]) == "Array[float64, (None, 3), C]"
+    assert repr(Buffer["B"]) == "Buffer[B, Any]"
+    assert issubclass(Array["float64"], Array)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        ("float64", "big"),
+        ("float64", 2),
+        ("float64", (-1,)),
+        ("float64", None, "K"),
+        ("float64", None, None, None),
+    ],
+)
+def test_bad_parameters(params: tuple) -> None:
+    with pytest.raises(TypeError):
+        Array[params]  # pylint: disable=pointless-statement
+    with pytest.raises(TypeError):
+        Buffer[1]  # pylint: disable=pointless-statement
+    with pytest.raises(TypeError):
+        Array["float64"]["float64"]  # type: ignore # pylint: disable=pointless-statement
+    with pytest.raises(TypeError):
+        Array["float64"]()
+
+
+def test_array_metadata() -> None:
+    frame = Frame("float64", (10, 3))
+    assert isinstance(frame, Array)
+    assert isinstance(frame, Array["float64"])
+    assert isinstance(frame, Array["float64", (None, 3)])
+    assert isinstance(frame, Array["float64", (10, 3), "C"])
+    assert isinstance(frame, Array[None, (None, None), "A"])
+    assert not isinstance(frame, Array["float32"])
+    assert not isinstance(frame, Array["float64", (None, 4)])
+    assert not isinstance(frame, Array["float64", (None,)])
+    assert not isinstance(frame, Array["float64", None, "F"])
+    assert isinstance(Frame("float64", (3, 10), "F"), Array[None, None, "F"])
+    assert not isinstance([1.0, 2.0], Array)
+    assert not isinstance(None, Array["float64"])
+
+
+def test_buffer_metadata() -> None:
+    doubles = array.array("d", [1.0, 2.0])
+    assert isinstance(doubles, Buffer)
+    assert isinstance(doubles, Buffer["d"])
+    assert isinstance(doubles, Buffer["d", "F"])
+    assert not isinstance(doubles, Buffer["B"])
+    assert isinstance(b"abc", Buffer["B"])
+    assert isinstance(memoryview(doubles), Buffer["d"])
+    grid = memoryview(bytearray(6)).cast("B", (2, 3))
+    assert isinstance(grid, Buffer["B", "C"])
+    assert not isinstance(grid, Buffer["B", "F"])
+    assert not isinstance(memoryview(bytearray(6))[::2], Buffer[None, "A"])
+    assert not isinstance("abc", Buffer)
+    assert not isinstance(Frame("float64", (1,)), Buffer)
+
+
+def test_buffer_views_are_released() -> None:
+    data = bytearray(b"abc")
+    assert isinstance(data, Buffer["B"])
+    # a view still exported would make this raise BufferError
+    data.extend(b"def")
+
+
+def test_is_array_hint() -> None:
+    assert is_array_hint(Array["float64"])
+    assert is_array_hint(Buffer)
+    assert is_array_hint(memoryview)
+    assert is_array_hint(Optional[Buffer["B"]])
+    assert not is_array_hint(Optional[int])
+    assert not is_array_hint(bytes)
+
+
+class IModel(metaclass=InterfaceMeta):
+    @abstract_method
+    def predict(self, rows: Array["float64", (None, 3)]) -> Array["float64", (None,)]:
+        pass
+
+    @abstract_method
+    def load(self, raw: Buffer["B"], previous: Optional[memoryview] = None) -> Any:
+        pass
+
+
+BACKENDS = [
+    ("beartype", BeartypeCallHintPepParamException),
+    # arrays skip pydantic, so it raises what the stdlib checks raise
+    ("pydantic", TypeHintViolation),
+    ("stdlib", TypeHintViolation),
+    ("stdlib.general", TypeHintViolation),
+]
+
+
+def make_model(backend: str) -> IModel:
+    if backend == "stdlib.general":
+        backend = get_backend("stdlib").configure(specialize=False)  # type: ignore
+
+    class Model(IModel, backend=backend):  # type: ignore
+        def predict(
+            self, rows: Array["float64", (None, 3)]
+        ) -> Array["float64", (None,)]:
+            return Frame("float64", (rows.shape[0],))
+
+        def load(self, raw: Buffer["B"], previous: Optional[memoryview] = None) -> Any:
+            return raw
+
+    return Model()
+
+
+@pytest.mark.parametrize("backend,error", BACKENDS)
+def test_checked_by_metadata_only(backend: str, error: type) -> None:
+    model = make_model(backend)
+    assert model.predict(Frame("float64", (5, 3))).shape == (5,)
+    with pytest.raises(error):
+        model.predict(Frame("float32", (5, 3)))
+    with pytest.raises(error):
+        model.predict(Frame("float64", (5, 4)))
+    with pytest.raises(error):
+        model.load(array.array("d", [1.0]))
+
+
+@pytest.mark.parametrize("backend,error", BACKENDS)
+def test_never_copied(backend: str, error: type) -> None:
+    model = make_model(backend)
+    data = bytearray(b"abc")
+    assert model.load(data) is data
+    view = memoryview(data)
+    assert model.load(view, view) is view
+    view.release()
+
+
+def test_pydantic_leaves_arrays_alone() -> None:
+    checks = get_backend("pydantic").compile(IModel.predict)
+    assert checks[0] is not None and checks[1] is not None
+    # plain isinstance checks, no pydantic model involved
+    assert not hasattr(checks[1], "model")
+
+
+def test_numpy() -> None:
+    numpy = pytest.importorskip("numpy")
+
+    class IVectors(metaclass=InterfaceMeta):
+        @abstract_method
+        def norm(self, rows: numpy.ndarray) -> Array["float32", (None,), "C"]:
+            pass
+
+    class Vectors(IVectors, backend="pydantic"):  # type: ignore
+        def norm(self, rows: numpy.ndarray) -> Array["float32", (None,), "C"]:
+            assert rows is seen
+            return numpy.sqrt((rows * rows).sum(axis=1))
+
+    seen = numpy.ones((4, 3), dtype="float32")
+    assert Vectors().norm(seen).shape == (4,)
+    assert is_array_hint(numpy.ndarray)
+    assert isinstance(seen, Array[numpy.float32, (4, 3), "C"])
+    assert not isinstance(seen.T, Array[None, None, "C"])
+    with pytest.raises(TypeHintViolation):
+        Vectors().norm([[1.0]])  # type: ignore
+    with pytest.raises(TypeHintViolation):
+        Vectors().norm(numpy.ones((4, 3), dtype="float64"))
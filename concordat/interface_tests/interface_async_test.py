@@ -0,0 +1,181 @@
+import asyncio
+from inspect import iscoroutinefunction
+from typing import Any, AsyncGenerator, AsyncIterator, Iterator, List
+
+import pytest
+from beartype.roar import (
+    BeartypeCallHintPepParamException,
+    BeartypeCallHintPepReturnException,
+)
+from pydantic import ValidationError
+
+from concordat.checkers import TypeHintViolation
+from concordat.interface import (
+    InterfaceMeta,
+    abstract_method,
+    get_backend,
+    return_type_wrapper,
+)
+from concordat.streams import (
+    CheckedAsyncGenerator,
+    CheckedAsyncIterator,
+    CheckedIterator,
+)
+
+ERRORS = {
+    "beartype": (BeartypeCallHintPepParamException, BeartypeCallHintPepReturnException),
+    "pydantic": (ValidationError, ValidationError),
+    "stdlib": (TypeHintViolation, TypeHintViolation),
+}
+
+
+class IService(metaclass=InterfaceMeta):
+    @abstract_method
+    async def fetch(self, key: str, value: Any) -> int:
+        pass
+
+    @abstract_method
+    async def stream(self, items: List[Any]) -> AsyncGenerator[int, None]:
+        yield 0
+
+    @abstract_method
+    def pages(self, items: List[Any]) -> AsyncIterator[int]:
+        pass
+
+
+class Pages:
+    def __init__(self, items: List[Any]) -> None:
+        self.items = iter(items)
+
+    def __aiter__(self) -> "Pages":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return next(self.items)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+def make_service(backend: str, enforcement: str = "full") -> IService:
+    class Service(IService, backend=backend, enforcement=enforcement):  # type: ignore
+        async def fetch(self, key: str, value: Any) -> int:
+            await asyncio.sleep(0)
+            return value
+
+        async def stream(self, items: List[Any]) -> AsyncGenerator[int, None]:
+            for item in items:
+                await asyncio.sleep(0)
+                yield item
+
+        def pages(self, items: List[Any]) -> AsyncIterator[int]:
+            return Pages(items)
+
+    return Service()
+
+
+async def collect(iterator: Any) -> List[Any]:
+    return [item async for item in iterator]
+
+
+@pytest.mark.parametrize("backend", list(ERRORS))
+def test_awaited_result_is_checked(backend: str) -> None:
+    param_error, return_error = ERRORS[backend]
+    service = make_service(backend)
+    assert iscoroutinefunction(type(service).fetch)
+    assert asyncio.run(service.fetch("k", 1)) == 1
+    with pytest.raises(return_error):
+        asyncio.run(service.fetch("k", "not an int"))
+    with pytest.raises(param_error):
+        asyncio.run(service.fetch([], 1))  # type: ignore
+
+
+@pytest.mark.parametrize("backend", list(ERRORS))
+def test_async_generators_check_each_item(backend: str) -> None:
+    return_error = ERRORS[backend][1]
+    service = make_service(backend)
+    stream = service.stream([1, 2])
+    assert isinstance(stream, CheckedAsyncGenerator)
+    assert asyncio.run(collect(stream)) == [1, 2]
+    with pytest.raises(return_error):
+        asyncio.run(collect(service.stream([1, "two"])))
+
+
+@pytest.mark.parametrize("backend", list(ERRORS))
+def test_async_iterators_check_each_item(backend: str) -> None:
+    return_error = ERRORS[backend][1]
+    service = make_service(backend)
+    pages = service.pages([1, 2])
+    assert isinstance(pages, CheckedAsyncIterator)
+    assert asyncio.run(collect(pages)) == [1, 2]
+    with pytest.raises(return_error):
+        asyncio.run(collect(service.pages(["one"])))
+
+
+@pytest.mark.parametrize("backend", list(ERRORS))
+def test_coroutines_returning_iterators(backend: str) -> None:
+    return_error = ERRORS[backend][1]
+
+    async def pages(items: List[Any]) -> AsyncIterator[int]:
+        await asyncio.sleep(0)
+        return Pages(items)
+
+    async def rows(items: List[Any]) -> Iterator[int]:
+        await asyncio.sleep(0)
+        return iter(items)
+
+    for wrapped in (get_backend(backend).wrap(pages), return_type_wrapper(pages)):
+        assert iscoroutinefunction(wrapped)
+        checked = asyncio.run(wrapped([1, 2]))
+        assert isinstance(checked, CheckedAsyncIterator)
+        assert asyncio.run(collect(checked)) == [1, 2]
+    with pytest.raises(return_error):
+        asyncio.run(collect(asyncio.run(get_backend(backend).wrap(pages)(["one"]))))
+    checked = asyncio.run(get_backend(backend).wrap(rows)([1, 2]))
+    assert isinstance(checked, CheckedIterator) and list(checked) == [1, 2]
+
+
+def test_async_generator_methods_pass_through() -> None:
+    service = make_service("stdlib")
+
+    async def run() -> List[int]:
+        stream = service.stream([1, 2, 3])
+        first = await stream.asend(None)
+        await stream.aclose()
+        return [first]
+
+    assert asyncio.run(run()) == [1]
+
+
+@pytest.mark.parametrize("enforcement", ["sampled(1.0)", "warmup(5)", "off"])
+def test_policies_keep_coroutines(enforcement: str) -> None:
+    service = make_service("stdlib", enforcement)
+    assert iscoroutinefunction(type(service).fetch)
+    assert asyncio.run(service.fetch("k", 1)) == 1
+    if enforcement != "off":
+        with pytest.raises(TypeHintViolation):
+            asyncio.run(service.fetch("k", "nope"))
+
+
+def test_deferred_coroutines() -> None:
+    async def build() -> "LateType":  # type: ignore # noqa: F821
+        return LateType()
+
+    wrapped = get_backend("stdlib").wrap(build)
+    assert iscoroutinefunction(wrapped)
+    globals()["LateType"] = type("LateType", (), {})
+    try:
+        assert isinstance(asyncio.run(wrapped()), globals()["LateType"])
+    finally:
+        del globals()["LateType"]
+
+
+def test_return_type_wrapper_awaits() -> None:
+    @return_type_wrapper
+    async def number(value: Any) -> int:
+        return value
+
+    assert iscoroutinefunction(number)
+    assert asyncio.run(number(1)) == 1
+    with pytest.raises(ValidationError):
+        asyncio.run(number("one"))
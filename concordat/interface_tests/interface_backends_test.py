@@ -0,0 +1,123 @@
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from beartype.roar import (
+    BeartypeCallHintPepParamException,
+    BeartypeCallHintPepReturnException,
+)
+from pydantic import ValidationError
+
+from concordat import interface
+from concordat.checkers import TypeHintViolation
+from concordat.interface import (
+    BACKEND,
+    InterfaceMeta,
+    StdlibBackend,
+    abstract_method,
+    get_backend,
+    set_default_backend,
+)
+
+
+class IStore(metaclass=InterfaceMeta):
+    @abstract_method
+    def put(self, key: str, values: List[int], tag: Optional[str] = None) -> int:
+        pass
+
+    @abstract_method
+    def get(self, key: str) -> Dict[str, Tuple[int, ...]]:
+        pass
+
+
+def make_store(backend: str, bad_return: bool = False) -> IStore:
+    class Store(IStore, backend=backend):  # type: ignore
+        def put(self, key: str, values: List[int], tag: Optional[str] = None) -> int:
+            return "oops" if bad_return else len(values)  # type: ignore
+
+        def get(self, key: str) -> Dict[str, Tuple[int, ...]]:
+            return {key: (1, 2)}
+
+    return Store()
+
+
+@pytest.mark.parametrize(
+    "backend,param_error,return_error",
+    [
+        (
+            "beartype",
+            BeartypeCallHintPepParamException,
+            BeartypeCallHintPepReturnException,
+        ),
+        ("pydantic", ValidationError, ValidationError),
+        ("stdlib", TypeHintViolation, TypeHintViolation),
+    ],
+)
+def test_backends(backend: str, param_error: type, return_error: type) -> None:
+    store = make_store(backend)
+    assert store.put("k", [1, 2], tag="t") == 2
+    assert store.put(key="k", values=[]) == 0
+    assert store.get("k") == {"k": (1, 2)}
+
+    with pytest.raises(param_error):
+        store.put("k", ["not an int"])  # type: ignore
+    with pytest.raises(param_error):
+        store.put("k", [1], tag=[1])  # type: ignore
+    with pytest.raises(return_error):
+        make_store(backend, bad_return=True).put("k", [1])
+
+
+def test_each_value_is_checked_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[str] = []
+    original = interface.StdlibBackend.compile
+
+    def counting(self, fnc):  # type: ignore
+        check_args, check_return = original(self, fnc)
+
+        def args(a, k):  # type: ignore
+            calls.append("args")
+            check_args(a, k)
+
+        def ret(value):  # type: ignore
+            calls.append("return")
+            check_return(value)
+
+        return args, ret
+
+    monkeypatch.setattr(interface.StdlibBackend, "compile", counting)
+    store = make_store("stdlib")
+    store.put("k", [1])
+    assert calls == ["args", "return"]
+
+
+def test_stdlib_rejects_bad_elements() -> None:
+    store = make_store("stdlib")
+    with pytest.raises(TypeHintViolation) as error:
+        store.put("k", [1, "2"])  # type: ignore
+    assert error.value.parameter == "values"
+
+
+def test_backend_is_inherited() -> None:
+    store = make_store("stdlib")
+
+    class Child(type(store)):  # type: ignore
+        pass
+
+    assert getattr(Child, BACKEND) is get_backend("stdlib")
+    with pytest.raises(TypeHintViolation):
+        Child().put(1, [1])
+
+
+def test_default_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(interface, "_default_backend", [])
+    monkeypatch.setenv(interface.BACKEND_ENV, "stdlib")
+    assert isinstance(get_backend(), StdlibBackend)
+
+    set_default_backend("pydantic")
+    assert get_backend().name == "pydantic"
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+
+        class Nope(IStore, backend="nope"):  # type: ignore
+            pass
@@ -0,0 +1,97 @@
+from inspect import signature
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from pydantic import ValidationError
+
+from concordat.binding import ShapeCache, binder, call_shape
+from concordat.checkers import TypeHintViolation
+from concordat.interface import InterfaceMeta, abstract_method
+
+
+def target(a, b=1, c=2, *args, d, e=3, **kwargs):  # type: ignore
+    pass
+
+
+@pytest.mark.parametrize(
+    "args,kwargs",
+    [
+        ((0,), {"d": 4}),
+        ((0, 1, 2, 5, 6), {"d": 4, "x": 7}),
+        ((0,), {"c": 2, "d": 4, "e": 5, "y": 9}),
+        ((0, 1), {"e": 5, "d": 4}),
+    ],
+)
+def test_binder_matches_signature_bind(args, kwargs) -> None:  # type: ignore
+    sig = signature(target)
+    bind = binder(sig)
+    for _ in range(2):
+        assert bind(args, kwargs) == sig.bind(*args, **kwargs).arguments
+
+
+def test_bad_shapes_raise_and_are_not_kept() -> None:
+    bind = binder(signature(target))
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            bind((), {"d": 1})
+    assert len(bind.plans) == 0  # type: ignore
+
+
+def test_call_shape() -> None:
+    assert call_shape((1, 2), {}) == 2
+    assert call_shape((1, 2), {"id": 3}) == (2, ("id",))
+    assert call_shape((1, 2), {"id": 3}) != call_shape((1, 2), {"name": 3})
+
+
+def test_lru_is_bounded() -> None:
+    built: List[Any] = []
+
+    def build(args: Tuple, kwargs: Dict) -> int:
+        built.append(call_shape(args, kwargs))
+        return len(built)
+
+    shapes = ShapeCache(build, size=2)
+    assert shapes.get((1,), {}) == 1
+    assert shapes.get((1, 2), {}) == 2
+    # used lately, so it survives the next new shape
+    assert shapes.get((3,), {}) == 1
+    assert shapes.get((), {"x": 1}) == 3
+    assert len(shapes) == 2
+    assert shapes.get((5,), {}) == 1
+    assert shapes.get((1, 2), {}) == 4
+
+
+class IStore(metaclass=InterfaceMeta):
+    @abstract_method
+    def put(self, path: str, tags: List[str], id: int = 0) -> int:
+        pass
+
+
+@pytest.mark.parametrize(
+    "backend,error", [("stdlib", TypeHintViolation), ("pydantic", ValidationError)]
+)
+def test_shapes_are_planned_once(
+    backend: str, error: type, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class Store(IStore, backend=backend):  # type: ignore
+        def put(self, path: str, tags: List[str], id: int = 0) -> int:
+            return id
+
+    store = Store()
+    plans: List[Any] = []
+    original = ShapeCache.get
+
+    def counting(self, args, kwargs):  # type: ignore
+        if call_shape(args, kwargs) not in self.plans:
+            plans.append(call_shape(args, kwargs))
+        return original(self, args, kwargs)
+
+    monkeypatch.setattr(ShapeCache, "get", counting)
+    for _ in range(3):
+        assert store.put("a", [], id=2) == 2
+        assert store.put("a", []) == 0
+    assert plans == [(3, ("id",)), 3]
+    with pytest.raises(error):
+        store.put("a", [], id="x")  # type: ignore
+    with pytest.raises(error):
+        store.put(None, [])  # type: ignore
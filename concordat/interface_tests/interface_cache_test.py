@@ -0,0 +1,183 @@
+import importlib.util
+import json
+import os
+import sys
+from itertools import count
+from pathlib import Path
+from types import ModuleType
+from typing import Iterator, List
+
+import pytest
+
+from concordat import interface
+from concordat.cache import DEPENDENCIES, get_cache, set_cache_dir
+
+SOURCE = """
+from typing import List
+
+from concordat.interface import InterfaceMeta, abstract_method
+
+
+class IStore(metaclass=InterfaceMeta, lazy=True):
+    @abstract_method
+    def put(self, key: str, values: List[int]) -> int:
+        pass
+
+
+class Store(IStore):
+    def put(self, key: str, values: List[int]) -> {returns}:
+        return len(values)
+"""
+
+_names = count()
+
+
+def load(path: Path) -> ModuleType:
+    name = f"cached_module_{next(_names)}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)  # type: ignore
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)  # type: ignore
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Iterator[Path]:
+    directory = tmp_path / "cache"
+    set_cache_dir(str(directory))
+    yield directory
+    set_cache_dir(None)
+
+
+@pytest.fixture
+def resolved(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    calls: List[str] = []
+    original = interface.get_type_hints
+
+    def counting(fnc, *args, **kwargs):  # type: ignore
+        calls.append(fnc.__qualname__)
+        return original(fnc, *args, **kwargs)
+
+    monkeypatch.setattr(interface, "get_type_hints", counting)
+    return calls
+
+
+def write(path: Path, returns: str) -> Path:
+    path.write_text(SOURCE.replace("{returns}", returns))
+    # make sure an edit is noticed even within the same mtime tick
+    stamp = next(_names)
+    os.utime(path, ns=(stamp, stamp))
+    return path
+
+
+def test_hit_skips_the_check(
+    tmp_path: Path, cache_dir: Path, resolved: List[str]
+) -> None:
+    source = write(tmp_path / "store.py", "int")
+    load(source)
+    assert "Store.put" in resolved
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    resolved.clear()
+    module = load(source)
+    assert resolved == []
+    assert module.Store().put("k", [1, 2]) == 2
+
+
+def test_stale_entries_are_ignored(tmp_path: Path, cache_dir: Path) -> None:
+    source = write(tmp_path / "store.py", "int")
+    load(source)
+    write(source, "str")
+    with pytest.raises(TypeError):
+        load(source)
+
+
+def test_corrupt_entries_are_ignored(
+    tmp_path: Path, cache_dir: Path, resolved: List[str]
+) -> None:
+    source = write(tmp_path / "store.py", "int")
+    load(source)
+    (entry,) = cache_dir.glob("*.json")
+    entry.write_text("{not json")
+
+    resolved.clear()
+    load(source)
+    assert "Store.put" in resolved
+    # and rewritten
+    resolved.clear()
+    load(source)
+    assert resolved == []
+
+
+def test_failures_are_not_cached(tmp_path: Path, cache_dir: Path) -> None:
+    source = write(tmp_path / "store.py", "str")
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            load(source)
+    assert list(cache_dir.glob("*.json")) == []
+
+
+def test_off_by_default(tmp_path: Path, resolved: List[str]) -> None:
+    assert get_cache() is None
+    source = write(tmp_path / "store.py", "int")
+    load(source)
+    resolved.clear()
+    load(source)
+    assert "Store.put" in resolved
+
+
+def test_unwritable_directory_is_harmless(tmp_path: Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    set_cache_dir(str(blocker / "cache"))
+    try:
+        assert load(write(tmp_path / "store.py", "int")).Store().put("k", []) == 0
+    finally:
+        set_cache_dir(None)
+
+
+DEPENDENT = """
+from concordat.interface import InterfaceMeta, abstract_method
+from {models} import Key, Order
+
+
+class IStore(metaclass=InterfaceMeta):
+    @abstract_method
+    def put(self, key: str, order: Order) -> int:
+        pass
+
+
+class Store(IStore):
+    def put(self, key: Key, order: Order) -> int:
+        return 1
+"""
+
+
+def test_imported_modules_and_hint_types_are_dependencies(
+    tmp_path: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    models = f"cached_models_{next(_names)}"
+    monkeypatch.syspath_prepend(str(tmp_path))
+    types = tmp_path / f"{models}_types.py"
+    types.write_text("class Order: pass\n")
+    module = tmp_path / f"{models}.py"
+    module.write_text(f"from {models}_types import Order\nKey = str\n")
+    source = tmp_path / "store.py"
+    source.write_text(DEPENDENT.format(models=models))
+    load(source)
+    (entry,) = cache_dir.glob("*.json")
+    dependencies = json.loads(entry.read_text())[DEPENDENCIES]
+    # imported by the store, and defining a type in its hints
+    assert str(module) in dependencies and str(types) in dependencies
+
+    # the alias changed, the store's source didn't
+    module.write_text(f"from {models}_types import Order\nKey = int\n")
+    stamp = next(_names)
+    os.utime(module, ns=(stamp, stamp))
+    del sys.modules[models]
+    with pytest.raises(TypeError):
+        load(source)
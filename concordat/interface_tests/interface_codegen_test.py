@@ -0,0 +1,143 @@
+import sys
+from typing import Any, Dict, List, Optional, Union
+
+import pytest
+
+from concordat.checkers import TypeHintViolation
+from concordat.codegen import SOURCE, generate, simple_hint
+from concordat.interface import (
+    RAW_FUNCTION,
+    InterfaceMeta,
+    abstract_method,
+    get_backend,
+)
+
+
+class IStore(metaclass=InterfaceMeta):
+    @abstract_method
+    def put(self, key: str, size: int = 0, *, owner: Optional[str] = None) -> int:
+        pass
+
+    @abstract_method
+    def find(self, keys: List[str]) -> int:
+        pass
+
+
+class Store(IStore, backend="stdlib"):  # type: ignore
+    def put(self, key: str, size: int = 0, *, owner: Optional[str] = None) -> int:
+        return size
+
+    def find(self, keys: List[str]) -> int:
+        return len(keys)
+
+
+@pytest.mark.parametrize(
+    "hint,expected",
+    [
+        (int, ((int,), False)),
+        (None, ((), True)),
+        (Optional[str], ((str,), True)),
+        (Union[int, str], ((int, str), False)),
+        (List[int], None),
+        (Union[int, List[int]], None),
+        (Any, None),
+    ],
+)
+def test_simple_hint(hint, expected) -> None:  # type: ignore
+    assert simple_hint(hint) == expected
+
+
+def test_flat_signatures_are_generated() -> None:
+    put = Store.__dict__["put"]
+    assert hasattr(put, SOURCE)
+    assert getattr(put, RAW_FUNCTION).__name__ == "put"
+    assert not hasattr(Store.__dict__["find"], SOURCE)
+
+
+def test_binding_and_defaults() -> None:
+    store = Store()
+    assert store.put("k") == 0
+    assert store.put("k", 3, owner="me") == 3
+    assert store.put(key="k", size=2) == 2
+    assert store.put("k", True) is True
+    with pytest.raises(TypeError, match="positional"):
+        store.put("k", 1, "me")  # type: ignore
+    with pytest.raises(TypeError, match="missing"):
+        store.put()  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "args,kwargs,parameter",
+    [
+        (("k", "1"), {}, "size"),
+        ((1,), {}, "key"),
+        (("k",), {"owner": 1}, "owner"),
+        (("k",), {"size": None}, "size"),
+    ],
+)
+def test_violations(args, kwargs, parameter) -> None:  # type: ignore
+    with pytest.raises(TypeHintViolation) as error:
+        Store().put(*args, **kwargs)
+    assert error.value.parameter == parameter
+    assert error.value.qualname == "Store.put"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="positional only parameters")
+def test_return_and_positional_only() -> None:
+    namespace: Dict[str, Any] = {}
+    # exec'd, so older pythons can still parse this module
+    exec("def pick(value, /, flag):\n    return value\n", namespace)
+    pick = namespace["pick"]
+
+    checked = generate(pick, {"value": Union[int, str], "flag": bool, "return": None})
+    assert checked is not None
+    with pytest.raises(TypeError):
+        checked(value=1, flag=True)
+    with pytest.raises(TypeHintViolation, match="return"):
+        checked(1, True)
+    with pytest.raises(TypeHintViolation, match="value"):
+        checked(1.5, True)
+
+
+def test_fallbacks() -> None:
+    def many(*values: int) -> int:
+        return len(values)
+
+    def clash(__concordat_fnc: int) -> int:
+        return __concordat_fnc
+
+    assert generate(many, {"values": int, "return": int}) is None
+    assert generate(clash, {"__concordat_fnc": int, "return": int}) is None
+
+
+def test_parameters_named_like_builtins() -> None:
+    def create(  # pylint: disable=redefined-builtin
+        type: str, isinstance: Union[int, str]
+    ) -> int:
+        return 1
+
+    checked = generate(
+        create, {"type": str, "isinstance": Union[int, str], "return": int}
+    )
+    assert checked is not None
+    assert checked("a", 1) == 1
+    with pytest.raises(TypeHintViolation):
+        checked(1, 1)
+    with pytest.raises(TypeHintViolation):
+        checked("a", 1.0)
+
+
+def test_can_be_turned_off() -> None:
+    backend = get_backend("stdlib").configure(specialize=False)
+
+    class General(IStore, backend=backend):  # type: ignore
+        def put(self, key: str, size: int = 0, *, owner: Optional[str] = None) -> int:
+            return size
+
+        def find(self, keys: List[str]) -> int:
+            return len(keys)
+
+    assert not hasattr(General.__dict__["put"], SOURCE)
+    assert "unspecialized" in repr(backend)
+    with pytest.raises(TypeHintViolation):
+        General().put(1)  # type: ignore
@@ -0,0 +1,191 @@
+from typing import Dict, List, Set, Tuple
+
+import pytest
+from beartype.roar import BeartypeCallHintPepParamException
+
+from concordat.checkers import (
+    CONTAINERS,
+    FULL,
+    SHALLOW,
+    TypeHintViolation,
+    compile_hint,
+    get_container_strategy,
+    is_container_hint,
+    sample,
+)
+from concordat.interface import (
+    InterfaceMeta,
+    abstract_method,
+    check_containers,
+    get_backend,
+)
+
+
+class IBulk(metaclass=InterfaceMeta):
+    @abstract_method
+    def load(self, rows: List[int]) -> int:
+        pass
+
+    @abstract_method
+    def index(self, rows: Dict[str, List[int]]) -> List[str]:
+        pass
+
+
+def make_bulk(backend: str, containers: str) -> IBulk:
+    class Bulk(IBulk, backend=backend, containers=containers):  # type: ignore
+        def load(self, rows: List[int]) -> int:
+            return len(rows)
+
+        def index(self, rows: Dict[str, List[int]]) -> List[str]:
+            return list(rows)
+
+    return Bulk()
+
+
+@pytest.mark.parametrize(
+    "spec,expected",
+    [
+        ("full", FULL),
+        ("shallow", SHALLOW),
+        ("sample(10)", sample(10)),
+        ("sample:3", sample(3)),
+        (None, None),
+        (FULL, FULL),
+    ],
+)
+def test_get_container_strategy(spec, expected) -> None:  # type: ignore
+    assert get_container_strategy(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["everything", "sample(0)", "sample(x)", "full(2)"])
+def test_bad_container_strategy(spec: str) -> None:
+    with pytest.raises(ValueError):
+        get_container_strategy(spec)
+
+
+def test_is_container_hint() -> None:
+    assert is_container_hint(List[int])
+    assert is_container_hint(Dict[str, int])
+    assert is_container_hint(Tuple[int, ...])
+    assert not is_container_hint(int)
+    assert not is_container_hint(list)
+    assert not is_container_hint(str)
+
+
+class Counting(type):
+    checks = 0
+
+    def __instancecheck__(cls, instance):  # type: ignore
+        Counting.checks += 1
+        return True
+
+
+class Row(metaclass=Counting):
+    pass
+
+
+@pytest.mark.parametrize(
+    "strategy,expected", [(FULL, 1000), (sample(5), 5), (SHALLOW, 0)]
+)
+def test_strategies_bound_the_work(strategy, expected) -> None:  # type: ignore
+    rows = list(range(1000))
+    for hint, value in ((List[Row], rows), (Set[Row], set(rows))):
+        predicate = compile_hint(hint, strategy)
+        Counting.checks = 0
+        assert predicate(value)  # type: ignore
+        assert Counting.checks == expected
+
+
+@pytest.mark.parametrize("strategy", [FULL, sample(3)])
+def test_sampled_checks_catch_uniform_garbage(strategy) -> None:  # type: ignore
+    predicate = compile_hint(List[int], strategy)
+    assert predicate([1, 2, 3] * 100)  # type: ignore
+    assert not predicate(["a"] * 100)  # type: ignore
+    assert not predicate({"a"})  # type: ignore
+
+
+@pytest.mark.parametrize("hint", [Set[int], Dict[int, int]])
+def test_sampled_sets_and_mappings_reach_every_element(hint) -> None:  # type: ignore
+    predicate = compile_hint(hint, sample(3))
+    values = list(range(99)) + ["a"]
+    value = set(values) if hint is Set[int] else dict(zip(values, values))
+    # a prefix would never reach the bad entry, a random window does
+    assert not all(predicate(value) for _ in range(1000))  # type: ignore
+
+
+def test_sample_of_small_containers() -> None:
+    assert compile_hint(List[int], sample(10))([1, 2])  # type: ignore
+    assert not compile_hint(List[int], sample(10))([1, "a"])  # type: ignore
+    assert compile_hint(Set[int], sample(1))({1})  # type: ignore
+    assert compile_hint(List[int], SHALLOW)(["a"] * 10)  # type: ignore
+
+
+@pytest.mark.parametrize("backend", ["beartype", "pydantic", "stdlib"])
+def test_shallow_only_checks_the_outer_type(backend: str) -> None:
+    bulk = make_bulk(backend, "shallow")
+    assert bulk.load(["not", "ints"]) == 2  # type: ignore
+    assert bulk.index({"a": ["b"]}) == ["a"]  # type: ignore
+    with pytest.raises(TypeHintViolation):
+        bulk.load({"not": "a list"})  # type: ignore
+
+
+@pytest.mark.parametrize("backend", ["beartype", "pydantic", "stdlib"])
+def test_full_checks_everything(backend: str) -> None:
+    bulk = make_bulk(backend, "full")
+    rows = list(range(100)) + ["sneaky"]
+    with pytest.raises(TypeHintViolation):
+        bulk.load(rows)  # type: ignore
+    with pytest.raises(TypeHintViolation):
+        bulk.index({"a": [1, "b"]})  # type: ignore
+
+
+@pytest.mark.parametrize("backend", ["beartype", "pydantic", "stdlib"])
+def test_containers_are_never_copied(backend: str) -> None:
+    class Keeper(IBulk, backend=backend, containers="sample(5)"):  # type: ignore
+        def load(self, rows: List[int]) -> int:
+            self.rows = rows  # pylint: disable=attribute-defined-outside-init
+            return len(rows)
+
+        def index(self, rows: Dict[str, List[int]]) -> List[str]:
+            self.rows = rows  # pylint: disable=attribute-defined-outside-init
+            return list(rows)
+
+    keeper = Keeper()
+    rows = list(range(10_000))
+    keeper.load(rows)
+    assert keeper.rows is rows
+    mapping = {"a": rows}
+    keeper.index(mapping)
+    assert keeper.rows is mapping
+
+
+def test_strategy_is_inherited_and_method_wins() -> None:
+    class Shallow(IBulk, backend="stdlib", containers="shallow"):  # type: ignore
+        def load(self, rows: List[int]) -> int:
+            return len(rows)
+
+        @check_containers("full")
+        def index(self, rows: Dict[str, List[int]]) -> List[str]:
+            return list(rows)
+
+    class Child(Shallow):
+        pass
+
+    assert Child.__dict__.get(CONTAINERS) is None
+    child = Child()
+    assert child.load(["x"]) == 1  # type: ignore
+    with pytest.raises(TypeHintViolation):
+        child.index({"a": ["b"]})  # type: ignore
+
+
+def test_no_strategy_keeps_backend_behaviour() -> None:
+    assert get_backend("beartype").containers is None
+    bulk = make_bulk("beartype", None)  # type: ignore
+    with pytest.raises(BeartypeCallHintPepParamException):
+        bulk.load(["a"])  # type: ignore
+
+
+def test_environment_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CONCORDAT_CONTAINERS", "shallow")
+    bulk = make_bulk("stdlib", None)  # type: ignore
+    assert bulk.load(["a"]) == 1  # type: ignore
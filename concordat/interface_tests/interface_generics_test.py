@@ -0,0 +1,124 @@
+import sys
+from typing import Generic, List, Optional, TypeVar
+
+import pytest
+from beartype.roar import BeartypeCallHintPepParamException
+
+from concordat.generics import GENERIC_HINTS
+from concordat.interface import InterfaceMeta, abstract_method, implements
+from concordat.registry import registry
+
+if sys.version_info < (3, 7):
+    pytest.skip("GenericMeta clashes with InterfaceMeta", allow_module_level=True)
+
+T = TypeVar("T")
+
+
+class User:
+    def __init__(self, key: int) -> None:
+        self.key = key
+
+
+class Order:
+    pass
+
+
+class IRepository(Generic[T], metaclass=InterfaceMeta):
+    @abstract_method
+    def get(self, key: int) -> Optional[T]:
+        pass
+
+    @abstract_method
+    def add(self, item: T) -> None:
+        pass
+
+    @abstract_method
+    def all(self) -> List[T]:
+        pass
+
+
+class UserRepo(IRepository[User]):
+    def __init__(self) -> None:
+        self.users: List[User] = []
+
+    def get(self, key: int) -> Optional[User]:
+        return next((user for user in self.users if user.key == key), None)
+
+    def add(self, item: User) -> None:
+        self.users.append(item)
+
+    def all(self) -> List[User]:
+        return self.users
+
+
+class MemoryRepo(IRepository[T]):
+    def __init__(self) -> None:
+        self.items: List[T] = []
+
+    def get(self, key: int) -> Optional[T]:
+        return self.items[key] if key < len(self.items) else None
+
+    def add(self, item: T) -> None:
+        self.items.append(item)
+
+    def all(self) -> List[T]:
+        return self.items
+
+
+class UserMemoryRepo(MemoryRepo[User]):
+    pass
+
+
+def test_specialization_conforms() -> None:
+    repo = UserRepo()
+    repo.add(User(1))
+    assert repo.get(1).key == 1  # type: ignore
+    with pytest.raises(BeartypeCallHintPepParamException):
+        repo.add(Order())  # type: ignore
+    assert implements(UserRepo, IRepository)
+    path = f"{__name__}:UserRepo"
+    assert path in registry.names(IRepository)
+    assert registry.get(IRepository, path) is UserRepo
+
+
+def test_mismatch_with_the_bound_type() -> None:
+    with pytest.raises(TypeError, match="The method `add` doesn't match"):
+
+        class Mixed(IRepository[User]):  # pylint: disable=unused-variable
+            def get(self, key: int) -> Optional[User]:
+                pass
+
+            def add(self, item: Order) -> None:
+                pass
+
+            def all(self) -> List[User]:
+                pass
+
+
+def test_inherited_methods_check_the_bound_type() -> None:
+    generic = MemoryRepo()  # type: ignore
+    generic.add(Order())
+    repo = UserMemoryRepo()
+    repo.add(User(1))
+    assert repo.all()[0].key == 1
+    with pytest.raises(BeartypeCallHintPepParamException):
+        repo.add(Order())  # type: ignore
+    # the generic parent is left alone
+    generic.add(User(2))
+    assert UserMemoryRepo.add.__qualname__ == "UserMemoryRepo.add"
+
+
+def test_hints_substituted_once_per_specialization() -> None:
+    class OtherUserRepo(UserRepo):
+        pass
+
+    specializations = IRepository.__dict__[GENERIC_HINTS]
+    hints = specializations[(User,)]
+    assert hints["add"] == {"item": User, "return": type(None)}
+    assert hints["all"] == {"return": List[User]}
+
+    class AnotherUserRepo(MemoryRepo[User]):  # pylint: disable=unused-variable
+        pass
+
+    assert specializations[(User,)] is hints
+    assert OtherUserRepo().all() == []
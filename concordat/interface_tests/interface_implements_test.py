@@ -0,0 +1,137 @@
+import gc
+import weakref
+from typing import Any, List
+
+import pytest
+
+import concordat
+from concordat import interface
+from concordat.interface import InterfaceMeta, abstract_method, implements
+
+
+class IStorage(metaclass=InterfaceMeta):
+    @abstract_method
+    def get(self, key: str) -> bytes:
+        pass
+
+    @abstract_method
+    def keys(self) -> List[str]:
+        pass
+
+
+class Storage(IStorage):
+    def get(self, key: str) -> bytes:
+        return b""
+
+    def keys(self) -> List[str]:
+        return []
+
+
+class Adapter:
+    def get(self, key: str) -> bytes:
+        return b""
+
+    def keys(self) -> List[str]:
+        return []
+
+
+class Partial:
+    def get(self, key: str) -> bytes:
+        return b""
+
+
+class WrongHints:
+    def get(self, key: bytes) -> bytes:
+        return b""
+
+    def keys(self) -> List[str]:
+        return []
+
+
+class NotCallable:
+    get = "nope"
+    keys = 1
+
+
+class StaticAdapter:
+    @staticmethod
+    def get(key: str) -> bytes:
+        return b""
+
+    @staticmethod
+    def keys() -> List[str]:
+        return []
+
+
+@pytest.mark.parametrize(
+    "candidate,expected",
+    [
+        (Storage, True),
+        (Storage(), True),
+        (Adapter, True),
+        (Adapter(), True),
+        (StaticAdapter, True),
+        (Partial(), False),
+        (WrongHints, False),
+        (NotCallable, False),
+        (object(), False),
+        (dict, False),
+    ],
+)
+def test_implements(candidate: Any, expected: bool) -> None:
+    assert implements(candidate, IStorage) is expected
+    assert implements(candidate, IStorage) is expected
+
+
+def test_results_are_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    class Fresh(Adapter):
+        pass
+
+    assert implements(Fresh, IStorage)
+    monkeypatch.setattr(interface, "_conforms", None)
+    assert implements(Fresh(), IStorage)
+    assert interface._implementors[(id(Fresh), id(IStorage))][0] is True
+
+
+def test_dynamic_types_are_not_kept_alive() -> None:
+    dynamic = type("Dynamic", (Adapter,), {})
+    reference = weakref.ref(dynamic)
+    key = (id(dynamic), id(IStorage))
+    assert implements(dynamic, IStorage)
+    del dynamic
+    gc.collect()
+    assert reference() is None
+    assert key not in interface._implementors
+
+
+def test_dynamic_interfaces_are_not_kept_alive() -> None:
+    class IDynamic(metaclass=InterfaceMeta):
+        @abstract_method
+        def keys(self) -> List[str]:
+            pass
+
+    reference = weakref.ref(IDynamic)
+    assert implements(Adapter, IDynamic)
+    del IDynamic
+    gc.collect()
+    assert reference() is None
+
+
+def test_unresolved_forward_references_are_not_cached() -> None:
+    class Later:
+        def get(self, key: "Missing") -> bytes:  # type: ignore # noqa: F821
+            return b""
+
+        def keys(self) -> List[str]:
+            return []
+
+    assert not implements(Later, IStorage)
+    assert (id(Later), id(IStorage)) not in interface._implementors
+
+
+def test_needs_an_interface() -> None:
+    with pytest.raises(TypeError):
+        implements(Adapter, object)
+    with pytest.raises(TypeError):
+        implements(Adapter, Storage)
+    assert concordat.implements is implements
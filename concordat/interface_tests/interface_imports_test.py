@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+SNIPPET = """
+import sys
+{code}
+print("pydantic" in sys.modules, "beartype" in sys.modules)
+"""
+
+
+def loaded(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(code=code)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.mark.parametrize(
+    "code,expected",
+    [
+        ("import concordat.interface", "False False"),
+        (
+            "from concordat.interface import InterfaceMeta\n"
+            "class A(metaclass=InterfaceMeta, backend='stdlib'):\n"
+            "    def run(self, path: str) -> int:\n"
+            "        return 1\n"
+            "A().run('x')",
+            "False False",
+        ),
+        (
+            "from concordat.interface import InterfaceMeta\n"
+            "class A(metaclass=InterfaceMeta, enforcement='off'):\n"
+            "    def run(self, path: str) -> int:\n"
+            "        return 1\n",
+            "False False",
+        ),
+        (
+            "from concordat.interface import InterfaceMeta\n"
+            "class A(metaclass=InterfaceMeta, backend='beartype'):\n"
+            "    def run(self, path: str) -> int:\n"
+            "        return 1\n",
+            "False True",
+        ),
+        ("from concordat.interface import ReturnValue", "True False"),
+    ],
+)
+def test_engines_are_imported_on_demand(code: str, expected: str) -> None:
+    assert loaded(code) == expected
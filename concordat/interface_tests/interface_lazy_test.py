@@ -0,0 +1,119 @@
+from typing import Any, List
+
+import pytest
+
+from concordat import interface
+from concordat.checkers import TypeHintViolation
+from concordat.interface import BACKEND, InterfaceMeta, abstract_method
+from concordat.policy import LAZY_ENV, LazyMethod
+
+
+class IPlugin(metaclass=InterfaceMeta, backend="stdlib", lazy=True):
+    @abstract_method
+    def handle(self, payload: str) -> int:
+        pass
+
+    @abstract_method
+    def describe(name: str) -> str:
+        ...
+
+
+def make_plugin(**kwargs: Any) -> Any:
+    class Plugin(IPlugin, **kwargs):  # type: ignore
+        def handle(self, payload: str) -> int:
+            return len(payload)
+
+        @staticmethod
+        def describe(name: str) -> str:
+            return name
+
+        def unused(self, count: int) -> int:
+            return count
+
+    return Plugin
+
+
+@pytest.fixture
+def compiled(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    names: List[str] = []
+    original = interface.StdlibBackend.compile
+
+    def counting(self, fnc):  # type: ignore
+        names.append(fnc.__name__)
+        return original(self, fnc)
+
+    monkeypatch.setattr(interface.StdlibBackend, "compile", counting)
+    return names
+
+
+def test_nothing_is_built_at_class_creation(compiled: List[str]) -> None:
+    Plugin = make_plugin()
+    assert compiled == []
+    assert isinstance(Plugin.__dict__["handle"], LazyMethod)
+    assert isinstance(Plugin.__dict__["unused"], LazyMethod)
+
+
+def test_first_lookup_replaces_the_descriptor(compiled: List[str]) -> None:
+    Plugin = make_plugin()
+    plugin = Plugin()
+    assert plugin.handle("abc") == 3
+    assert compiled == ["handle"]
+    assert getattr(Plugin.__dict__["handle"], BACKEND).name == "stdlib"
+    with pytest.raises(TypeHintViolation):
+        plugin.handle(1)
+    assert compiled == ["handle"]
+
+    assert Plugin.describe("x") == "x"
+    assert isinstance(Plugin.__dict__["describe"], staticmethod)
+    with pytest.raises(TypeHintViolation):
+        plugin.describe(1)
+    assert isinstance(Plugin.__dict__["unused"], LazyMethod)
+
+
+def test_subclass_lookup_installs_on_the_owner() -> None:
+    Plugin = make_plugin()
+
+    class Child(Plugin):  # type: ignore
+        pass
+
+    assert Child().handle("ab") == 2
+    assert "handle" not in Child.__dict__
+    assert not isinstance(Plugin.__dict__["handle"], LazyMethod)
+
+
+def test_conformance_is_checked_without_building() -> None:
+    with pytest.raises(TypeError):
+
+        class Bad(IPlugin):
+            def handle(self, payload: int) -> int:
+                return payload
+
+            @staticmethod
+            def describe(name: str) -> str:
+                return name
+
+
+def test_lazy_with_warmup() -> None:
+    Plugin = make_plugin(enforcement="warmup(1)")
+    plugin = Plugin()
+    with pytest.raises(TypeHintViolation):
+        plugin.handle(1)
+    # the budget is spent, this call swaps the raw function in
+    assert plugin.handle([1]) == 1  # type: ignore
+    assert not hasattr(Plugin.__dict__["handle"], "__wrapped__")
+
+
+def test_eager_opt_out() -> None:
+    Plugin = make_plugin(lazy=False)
+    assert not isinstance(Plugin.__dict__["handle"], LazyMethod)
+
+
+def test_lazy_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(LAZY_ENV, "1")
+
+    class Anything(metaclass=InterfaceMeta):
+        def run(self) -> int:
+            return 1
+
+    assert isinstance(Anything.__dict__["run"], LazyMethod)
+    assert Anything().run() == 1
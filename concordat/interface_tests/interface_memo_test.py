@@ -0,0 +1,166 @@
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from concordat.checkers import TypeHintViolation
+from concordat.interface import InterfaceMeta, abstract_method
+from concordat.memo import MemoCache, Purity, get_purity
+from concordat.policy import raw_function
+
+
+class IResolver(metaclass=InterfaceMeta, backend="stdlib"):
+    @abstract_method(pure=True, maxsize=2)
+    def resolve(self, key: str) -> int:
+        pass
+
+    @abstract_method(pure=True)
+    def scale(value: int, factor: int = 2) -> int:
+        pass
+
+    @abstract_method
+    def impure(self, key: str) -> int:
+        pass
+
+
+def make_resolver(**keywords) -> Any:  # type: ignore
+    calls: List[str] = []
+
+    class Resolver(IResolver, **keywords):  # type: ignore
+        def resolve(self, key: str) -> int:
+            calls.append(key)
+            return len(key)
+
+        @staticmethod
+        def scale(value: int, factor: int = 2) -> int:
+            calls.append("scale")
+            return value * factor
+
+        def impure(self, key: str) -> int:
+            calls.append(key)
+            return len(key)
+
+    Resolver.calls = calls  # type: ignore
+    return Resolver
+
+
+def test_hits_skip_the_call_and_the_checks() -> None:
+    Resolver = make_resolver()
+    resolver = Resolver()
+    assert resolver.resolve("abc") == 3
+    assert resolver.resolve("abc") == 3
+    assert Resolver.calls == ["abc"]
+
+    stats = Resolver.resolve.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    with pytest.raises(TypeHintViolation):
+        resolver.resolve(1)
+    assert Resolver.calls == ["abc"]
+
+
+def test_staticmethods_and_keywords() -> None:
+    Resolver = make_resolver()
+    assert Resolver.scale(2) == 4
+    assert Resolver().scale(2) == 4
+    assert Resolver.scale(2, factor=3) == 6
+    assert Resolver.scale(2, factor=3) == 6
+    assert Resolver.calls == ["scale", "scale"]
+
+
+def test_keys_are_typed() -> None:
+    Resolver = make_resolver(backend="stdlib")
+    assert Resolver.scale(1) == 2
+    with pytest.raises(TypeHintViolation):
+        Resolver.scale(1.0)
+
+
+def test_lru_eviction_and_invalidation() -> None:
+    Resolver = make_resolver()
+    resolver = Resolver()
+    cache: MemoCache = Resolver.resolve.cache
+    for key in ("a", "bb", "a", "ccc", "bb"):
+        resolver.resolve(key)
+    # "bb" was pushed out by "ccc" since "a" was used more recently
+    assert Resolver.calls == ["a", "bb", "ccc", "bb"]
+    assert cache.stats()["evictions"] == 2
+
+    assert cache.invalidate(resolver, "bb")
+    assert not cache.invalidate(resolver, "bb")
+    resolver.resolve("bb")
+    assert Resolver.calls[-1] == "bb" and len(Resolver.calls) == 5
+    cache.clear()
+    assert cache.stats()["size"] == 0
+
+
+def test_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("concordat.memo.time.monotonic", lambda: now[0])
+    cache = MemoCache(Purity(maxsize=4, ttl=10))
+    cache.store("key", 1)
+    assert cache.lookup("key") == (True, 1)
+    now[0] += 11
+    assert cache.lookup("key") == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_unhashable_arguments_are_not_cached() -> None:
+    class IMapper(metaclass=InterfaceMeta, backend="stdlib"):
+        @abstract_method(pure=True)
+        def total(self, values: List[int]) -> int:
+            pass
+
+    class Mapper(IMapper):
+        def total(self, values: List[int]) -> int:
+            return sum(values)
+
+    assert Mapper().total([1, 2]) == 3
+    with pytest.raises(TypeHintViolation):
+        Mapper().total(["a"])  # type: ignore
+    assert Mapper.total.cache.stats()["size"] == 0  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "keywords", [{"lazy": True}, {"enforcement": "warmup(5)"}, {"instrument": True}]
+)
+def test_works_with_every_setting(keywords: Dict) -> None:
+    Resolver = make_resolver(**keywords)
+    resolver = Resolver()
+    for _ in range(3):
+        assert resolver.resolve("abc") == 3
+        with pytest.raises(TypeHintViolation):
+            resolver.resolve(1)
+    assert Resolver.calls == ["abc"]
+    assert raw_function(vars(Resolver)["resolve"]).__name__ == "resolve"
+
+
+def test_impure_methods_and_interfaces_are_untouched() -> None:
+    Resolver = make_resolver()
+    Resolver().impure("a")
+    Resolver().impure("a")
+    assert Resolver.calls == ["a", "a"]
+    assert not hasattr(Resolver.impure, "cache")
+    assert not hasattr(IResolver.resolve, "cache")
+
+
+def test_subclasses_inherit_purity() -> None:
+    Resolver = make_resolver()
+
+    class Child(Resolver):  # type: ignore
+        def resolve(self, key: str) -> int:
+            return 0
+
+    assert hasattr(Child.resolve, "cache")
+
+
+def test_bad_declarations() -> None:
+    assert get_purity(False) is None
+    assert get_purity(True, 8, 1.5) == Purity(8, 1.5)
+    with pytest.raises(ValueError):
+        abstract_method(pure=True, maxsize=0)
+    with pytest.raises(ValueError):
+        abstract_method(pure=True, ttl=-1)
+
+    def stream(self) -> Iterator[int]:  # type: ignore
+        yield 1
+
+    with pytest.raises(TypeError, match="consumed once"):
+        abstract_method(pure=True)(stream)
@@ -0,0 +1,162 @@
+import asyncio
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+import concordat
+from concordat import metrics
+from concordat.checkers import TypeHintViolation
+from concordat.interface import InterfaceMeta, abstract_method
+
+
+class IWorker(metaclass=InterfaceMeta):
+    @abstract_method
+    def work(self, value: Any) -> int:
+        pass
+
+    @abstract_method
+    async def later(self, value: Any) -> int:
+        pass
+
+    @abstract_method
+    def items(self, values: List[Any]) -> Iterator[int]:
+        pass
+
+
+class Worker(IWorker, backend="stdlib", instrument=True):  # type: ignore
+    def work(self, value: Any) -> int:
+        return value
+
+    async def later(self, value: Any) -> int:
+        return value
+
+    def items(self, values: List[Any]) -> Iterator[int]:
+        return iter(values)
+
+
+class Plain(IWorker, backend="stdlib"):  # type: ignore
+    def work(self, value: Any) -> int:
+        return value
+
+    async def later(self, value: Any) -> int:
+        return value
+
+    def items(self, values: List[Any]) -> Iterator[int]:
+        return iter(values)
+
+
+def stats_of(method: str) -> Dict[str, float]:
+    return metrics.snapshot()[f"{__name__}.Worker.{method}"]
+
+
+@pytest.fixture(autouse=True)
+def clean() -> Iterator[None]:
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_calls_time_and_violations() -> None:
+    worker = Worker()
+    for value in range(10):
+        worker.work(value)
+    with pytest.raises(TypeHintViolation):
+        worker.work("nope")
+    stats = stats_of("work")
+    assert stats["calls"] == 11
+    assert stats["violations"] == 1
+    assert stats["validation_ns"] > 0
+    assert 0 < stats["p50_ns"] <= stats["p90_ns"] <= stats["p99_ns"]
+
+
+def test_failed_and_skipped_calls_are_recorded() -> None:
+    class IEcho(metaclass=InterfaceMeta):
+        @abstract_method
+        def echo(self, value: int) -> str:
+            pass
+
+    class Echo(IEcho, backend="stdlib", instrument=True):  # type: ignore
+        def echo(self, value: int) -> str:
+            return value  # type: ignore
+
+    echo = Echo()
+    with pytest.raises(TypeHintViolation):
+        echo.echo(1)
+    stats = metrics.snapshot()[f"{__name__}.{Echo.echo.__qualname__}"]
+    # a single sample with the argument and the failed return check in it
+    assert stats["calls"] == 1 and stats["violations"] == 1
+    assert stats["validation_ns"] == stats["p50_ns"] > 0
+
+    worker = Worker()
+    worker.work(1)
+    with concordat.enforcement("off"):
+        worker.work(2)
+    stats = stats_of("work")
+    assert stats["calls"] == 2
+    assert stats["mean_ns"] == stats["validation_ns"] / 2
+
+
+def test_async_and_streams() -> None:
+    worker = Worker()
+    asyncio.run(worker.later(1))
+    with pytest.raises(TypeHintViolation):
+        asyncio.run(worker.later("one"))
+    assert stats_of("later")["calls"] == 2
+    assert stats_of("later")["violations"] == 1
+
+    stream = worker.items([1, "two"])
+    assert next(stream) == 1
+    with pytest.raises(TypeHintViolation):
+        next(stream)
+    assert stats_of("items")["calls"] == 1
+    assert stats_of("items")["violations"] == 1
+
+
+def test_disabled_path_is_untouched() -> None:
+    Plain().work(1)
+    assert not any(".Plain." in name for name in metrics.snapshot())
+    # the very same wrapper an uninstrumented class always had
+    assert not Plain.__dict__["work"].__code__.co_filename.endswith("metrics.py")
+    assert Worker.__dict__["work"].__code__.co_filename.endswith("metrics.py")
+
+
+def test_setting_is_inherited_and_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    class Child(Worker):
+        def work(self, value: Any) -> int:
+            return value
+
+    Child().work(1)
+    name = f"{Child.work.__module__}.{Child.work.__qualname__}"
+    assert metrics.snapshot()[name]["calls"] == 1
+
+    monkeypatch.setenv("CONCORDAT_INSTRUMENT", "1")
+
+    class FromEnv(Plain):
+        def work(self, value: Any) -> int:
+            return value
+
+    FromEnv().work(1)
+    assert any(name.endswith("FromEnv.work") for name in metrics.snapshot())
+
+
+def test_collectors() -> None:
+    seen: List[metrics.Snapshot] = []
+    metrics.add_collector(seen.append)
+    try:
+        Worker().work(1)
+        published = metrics.publish()
+    finally:
+        metrics.remove_collector(seen.append)
+    assert seen == [published]
+    assert published[f"{__name__}.Worker.work"]["calls"] == 1
+    metrics.publish()
+    assert len(seen) == 1
+
+
+def test_reset_keeps_methods_instrumented() -> None:
+    worker = Worker()
+    worker.work(1)
+    metrics.reset()
+    assert stats_of("work")["calls"] == 0
+    worker.work(1)
+    assert stats_of("work")["calls"] == 1
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+from typing import Iterator, List
+
+import pytest
+
+from concordat import observe
+from concordat.interface import InterfaceMeta, abstract_method
+from concordat.observe import Violation, ViolationBuffer
+from concordat.policy import Observe, get_policy
+
+
+@pytest.fixture(autouse=True)
+def buffer() -> Iterator[ViolationBuffer]:
+    previous = observe.get_buffer()
+    fresh = ViolationBuffer(capacity=8, per_site=2, interval=60)
+    observe.set_buffer(fresh)
+    yield fresh
+    observe.set_buffer(previous)
+
+
+class IService(metaclass=InterfaceMeta):
+    @abstract_method
+    def fetch(self, key: str, size: int) -> int:
+        pass
+
+    @abstract_method
+    def items(self, count: int) -> Iterator[int]:
+        pass
+
+    @abstract_method
+    async def later(self, key: str) -> str:
+        pass
+
+
+def make_service(backend: str) -> IService:
+    class Service(IService, backend=backend, enforcement="observe"):  # type: ignore
+        def fetch(self, key: str, size: int) -> int:
+            return "oops" if size < 0 else size  # type: ignore
+
+        def items(self, count: int) -> Iterator[int]:
+            yield from [1, "two", 3][:count]  # type: ignore
+
+        async def later(self, key: str) -> str:
+            return key
+
+    return Service()
+
+
+@pytest.mark.parametrize("backend", ["beartype", "pydantic", "stdlib"])
+def test_violations_are_recorded_not_raised(
+    backend: str, buffer: ViolationBuffer
+) -> None:
+    service = make_service(backend)
+    assert service.fetch("k", 1) == 1
+    assert len(buffer) == 0
+
+    assert service.fetch("k", -1) == "oops"
+    assert service.fetch(None, 1) == 1  # type: ignore
+    assert list(service.items(3)) == [1, "two", 3]
+    assert asyncio.run(service.later([])) == []  # type: ignore
+
+    found = buffer.drain()
+    assert [(v.method.split(".")[-1], v.where) for v in found] == [
+        ("fetch", "return"),
+        ("fetch", "arguments"),
+        ("items", "item"),
+        ("later", "arguments"),
+        ("later", "return"),
+    ]
+    returned, arguments = found[0], found[1]
+    assert returned.types == "str" and returned.value == "'oops'"
+    assert arguments.types == "(Service, NoneType, int)"
+    assert arguments.error
+    assert len(buffer) == 0
+
+
+def test_rate_limit_per_site(
+    buffer: ViolationBuffer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = [0.0]
+    monkeypatch.setattr(observe.time, "monotonic", lambda: now[0])
+    service = make_service("stdlib")
+    for _ in range(5):
+        service.fetch("k", -1)
+    service.fetch(None, 1)  # type: ignore
+    assert [v.where for v in buffer.drain()] == ["return", "return", "arguments"]
+
+    now[0] += 61
+    service.fetch("k", -1)
+    (violation,) = buffer.drain()
+    assert violation.suppressed == 3
+
+
+def test_ring_buffer_is_bounded(buffer: ViolationBuffer) -> None:
+    for index in range(20):
+        buffer.record(f"m{index}", "return", "str", "'x'", TypeError("bad"))
+    assert len(buffer) == 8
+    assert [v.method for v in buffer.drain(limit=2)] == ["m12", "m13"]
+    assert len(buffer) == 6
+
+
+def test_drain_in_background(buffer: ViolationBuffer) -> None:
+    batches: List[List[Violation]] = []
+    arrived = threading.Event()
+
+    def sink(found: List[Violation]) -> None:
+        batches.append(found)
+        arrived.set()
+
+    stop = observe.drain_in_background(sink, interval=0.01)
+    try:
+        make_service("stdlib").fetch("k", -1)
+        assert arrived.wait(5)
+    finally:
+        stop.set()
+    assert batches[0][0].where == "return"
+
+
+def test_policy() -> None:
+    assert isinstance(get_policy("observe"), Observe)
+    with pytest.raises(ValueError):
+        get_policy("observe(1)")
+
+
+def test_bad_buffers() -> None:
+    with pytest.raises(ValueError):
+        ViolationBuffer(capacity=0)
+
+
+def test_dropped_violations_are_not_described(
+    buffer: ViolationBuffer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    described: List[object] = []
+    short_repr = observe.short_repr
+
+    def counting(value: object) -> str:
+        described.append(value)
+        return short_repr(value)
+
+    monkeypatch.setattr(observe, "short_repr", counting)
+    service = make_service("stdlib")
+    big = ["x"] * 200_000
+    for _ in range(50):
+        service.fetch(big, 1)  # type: ignore
+    # the rate limit lets two through, only those two get the repr of their
+    # arguments and of their error
+    assert len(described) == 4
+    violations = buffer.drain()
+    assert len(violations) == 2
+    assert all(len(violation.value) <= 100 for violation in violations)
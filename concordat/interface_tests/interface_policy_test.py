@@ -0,0 +1,145 @@
+from typing import Any
+
+import pytest
+
+from concordat import policy as policy_module
+from concordat.checkers import TypeHintViolation
+from concordat.interface import InterfaceMeta, abstract_method
+from concordat.policy import (
+    ENFORCEMENT,
+    Full,
+    Off,
+    Sampled,
+    Warmup,
+    get_policy,
+    set_default_policy,
+)
+
+
+class ICounter(metaclass=InterfaceMeta, backend="stdlib"):
+    @abstract_method
+    def add(self, amount: int) -> int:
+        pass
+
+    @abstract_method
+    def zero(amount: int) -> int:
+        ...
+
+
+def make_counter(enforcement: Any) -> Any:
+    class Counter(ICounter, enforcement=enforcement):  # type: ignore
+        def add(self, amount: int) -> int:
+            return amount
+
+        @staticmethod
+        def zero(amount: int) -> int:
+            return 0
+
+    return Counter
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("full", Full()),
+        ("OFF", Off()),
+        ("warmup(10)", Warmup(10)),
+        ("warmup:10", Warmup(10)),
+        ("sampled(0.25)", Sampled(0.25)),
+        (" sampled( 0.5 ) ", Sampled(0.5)),
+    ],
+)
+def test_parse_policy(text: str, expected: Any) -> None:
+    assert get_policy(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["sometimes", "warmup", "warmup(-1)", "sampled", "sampled(2)", "full(3)"],
+)
+def test_parse_bad_policy(text: str) -> None:
+    with pytest.raises(ValueError):
+        get_policy(text)
+
+
+def test_full_checks_everything() -> None:
+    counter = make_counter("full")()
+    with pytest.raises(TypeHintViolation):
+        counter.add("1")
+    with pytest.raises(TypeHintViolation):
+        counter.zero("1")
+
+
+def test_off_installs_raw_function() -> None:
+    Counter = make_counter("off")
+    raw = Counter.__dict__["add"]
+    assert not hasattr(raw, "__wrapped__")
+    assert Counter().add("not checked") == "not checked"
+    assert Counter.zero("not checked") == 0
+
+
+def test_warmup_swaps_in_raw_function() -> None:
+    Counter = make_counter(Warmup(2))
+    counter = Counter()
+    with pytest.raises(TypeHintViolation):
+        counter.add("1")
+    assert counter.add(1) == 1
+    # budget is spent, the next call swaps the raw function in
+    assert counter.add("1") == "1"
+    add = Counter.__dict__["add"]
+    assert not hasattr(add, "__wrapped__")
+    assert counter.add("2") == "2"
+
+    for _ in range(2):
+        with pytest.raises(TypeHintViolation):
+            Counter.zero("1")
+    assert Counter.zero("1") == 0
+    assert isinstance(Counter.__dict__["zero"], staticmethod)
+
+
+def test_sampled(monkeypatch: pytest.MonkeyPatch) -> None:
+    never = make_counter(Sampled(0.0))()
+    assert never.add("1") == "1"
+
+    always = make_counter(Sampled(1.0))()
+    with pytest.raises(TypeHintViolation):
+        always.add("1")
+
+    values = iter([0.1, 0.9])
+    monkeypatch.setattr(policy_module, "random", lambda: next(values))
+    half = make_counter(Sampled(0.5))()
+    with pytest.raises(TypeHintViolation):
+        half.add("1")
+    assert half.add("1") == "1"
+
+
+def test_policy_is_inherited() -> None:
+    Counter = make_counter("off")
+
+    class Child(Counter):  # type: ignore
+        def add(self, amount: int) -> int:
+            return amount
+
+    assert getattr(Child, ENFORCEMENT) == Off()
+    assert Child().add("1") == "1"
+
+
+def test_default_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(policy_module, "_default_policy", [])
+    monkeypatch.setenv(policy_module.ENFORCEMENT_ENV, "warmup(5)")
+    assert get_policy() == Warmup(5)
+
+    set_default_policy("off")
+    assert make_counter(None)().add("1") == "1"
+
+
+def test_conformance_is_still_checked_when_off() -> None:
+    with pytest.raises(TypeError):
+
+        class Bad(ICounter, enforcement="off"):  # type: ignore
+            def add(self, amount: str) -> int:
+                return 1
+
+            @staticmethod
+            def zero(amount: int) -> int:
+                return 0
@@ -0,0 +1,144 @@
+import gc
+import pickle
+
+import pytest
+
+import concordat
+from concordat.checkers import TypeHintViolation
+from concordat.interface import (
+    PREPARE,
+    InterfaceMeta,
+    ValidationBackend,
+    abstract_method,
+)
+from concordat.policy import LazyMethod
+from concordat.prefork import warmup
+
+
+class IStore(metaclass=InterfaceMeta, backend="stdlib"):
+    @abstract_method
+    def put(self, key: str) -> int:
+        pass
+
+    @abstract_method
+    def size(key: str) -> int:
+        pass
+
+
+class LazyStore(IStore, lazy=True):
+    def put(self, key: str) -> int:
+        return len(key)
+
+    @staticmethod
+    def size(key: str) -> int:
+        return len(key)
+
+
+class WarmingStore(IStore, enforcement="warmup(5)"):
+    def put(self, key: str) -> int:
+        return len(key)
+
+    @staticmethod
+    def size(key: str) -> int:
+        return len(key)
+
+
+class IClone(metaclass=InterfaceMeta, backend="stdlib"):
+    def clone(self) -> "Later":
+        return Later()
+
+
+class Later:
+    pass
+
+
+def _shared_put(self, key: str) -> int:  # type: ignore
+    return len(key)
+
+
+class Aliased(IStore):
+    put = _shared_put
+
+    @staticmethod
+    def size(key: str) -> int:
+        return len(key)
+
+
+def test_lazy_methods_are_built() -> None:
+    assert isinstance(vars(LazyStore)["put"], LazyMethod)
+    assert warmup(LazyStore) == [LazyStore]
+    assert not isinstance(vars(LazyStore)["put"], LazyMethod)
+    assert not isinstance(vars(LazyStore)["size"], LazyMethod)
+    assert LazyStore().put("abc") == 3
+
+
+def test_deferred_checks_are_compiled(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert hasattr(vars(IClone)["clone"], PREPARE)
+    warmup([IClone])
+
+    def no_more_building(self, fnc):  # type: ignore
+        raise AssertionError("should have been built by warmup")
+
+    monkeypatch.setattr(ValidationBackend, "build", no_more_building)
+    assert isinstance(IClone().clone(), Later)
+
+
+def test_methods_pickle() -> None:
+    warmup([LazyStore, WarmingStore])
+    for cls in (LazyStore, WarmingStore):
+        assert pickle.loads(pickle.dumps(cls.put)) is cls.put
+        assert pickle.loads(pickle.dumps(cls.size)) is cls.size
+        assert pickle.loads(pickle.dumps(cls().put))("ab") == 2
+
+
+def test_unpicklable_methods_are_reported() -> None:
+    with pytest.raises(pickle.PicklingError, match="Aliased.put"):
+        warmup(__name__)
+
+
+def test_freeze() -> None:
+    try:
+        warmup(LazyStore, freeze=True)
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_package_level_and_bad_targets() -> None:
+    assert concordat.warmup is warmup
+    with pytest.raises(TypeError):
+        warmup([object])
+
+
+class IPure(metaclass=InterfaceMeta, backend="stdlib"):
+    @abstract_method(pure=True)
+    def length(self, key: str) -> int:
+        pass
+
+
+@pytest.mark.parametrize("enforcement", ["sampled(1.0)", "warmup(5)", "full"])
+def test_checks_behind_policies_are_compiled(
+    enforcement: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    build = ValidationBackend.build
+
+    def not_yet(self, fnc):  # type: ignore
+        raise NameError("as if a forward reference couldn't be resolved yet")
+
+    # length is pure, so it's memoized on top of what the policy installs
+    monkeypatch.setattr(ValidationBackend, "build", not_yet)
+
+    class Pure(IPure, enforcement=enforcement):  # type: ignore
+        def length(self, key: str) -> int:
+            return len(key)
+
+    monkeypatch.setattr(ValidationBackend, "build", build)
+    warmup(Pure)
+
+    def no_more_building(self, fnc):  # type: ignore
+        raise AssertionError("should have been built by warmup")
+
+    monkeypatch.setattr(ValidationBackend, "build", no_more_building)
+    assert Pure().length("abc") == 3
+    with pytest.raises(TypeHintViolation):
+        Pure().length(1)  # type: ignore
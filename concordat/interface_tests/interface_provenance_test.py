@@ -0,0 +1,249 @@
+import gc
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pytest
+
+from concordat import provenance
+from concordat.checkers import TypeHintViolation
+from concordat.interface import InterfaceMeta, abstract_method, get_backend
+from concordat.provenance import Provenance, covers
+
+
+class Counting(type):
+    checks = 0
+
+    def __instancecheck__(cls, value: Any) -> bool:
+        Counting.checks += 1
+        return type.__instancecheck__(cls, value)
+
+
+class Record(metaclass=Counting):
+    pass
+
+
+class Row(Record):
+    """isinstance skips __instancecheck__ for exact instances, not for these"""
+
+
+class Records(list):
+    """Unlike list itself, can be weakly referenced"""
+
+
+class IRepo(metaclass=InterfaceMeta):
+    @abstract_method
+    def load(self, count: int) -> List[Record]:
+        pass
+
+
+class ITransformer(metaclass=InterfaceMeta):
+    @abstract_method
+    def apply(self, records: List[Record], factor: int = 1) -> int:
+        pass
+
+    @abstract_method
+    def scan(self, records: Sequence[Record]) -> Sequence[Record]:
+        pass
+
+
+def make_pipeline(
+    backend: Any = "stdlib", remember: bool = True, factory: type = list
+) -> Tuple[IRepo, ITransformer]:
+    class Repo(IRepo, backend=backend, provenance=remember):  # type: ignore
+        def load(self, count: int) -> List[Record]:
+            return factory(Row() for _ in range(count))  # type: ignore
+
+    class Transformer(ITransformer, backend=backend, provenance=remember):  # type: ignore
+        def apply(self, records: List[Record], factor: int = 1) -> int:
+            return len(records) * factor
+
+        def scan(self, records: Sequence[Record]) -> Sequence[Record]:
+            return records
+
+    return Repo(), Transformer()
+
+
+@pytest.fixture(autouse=True)
+def fresh() -> Any:
+    provenance.set_provenance(Provenance())
+    Counting.checks = 0
+    yield
+    provenance.set_provenance(Provenance())
+
+
+def count(action: Any) -> int:
+    before = Counting.checks
+    action()
+    return Counting.checks - before
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        "stdlib",
+        get_backend("pydantic").configure(containers="full"),
+        get_backend("beartype").configure(containers="full"),
+    ],
+)
+def test_downstream_skips_what_upstream_validated(backend: Any) -> None:
+    repo, transformer = make_pipeline(backend)
+    records = repo.load(100)
+    assert count(lambda: transformer.apply(records)) == 0
+    # a wider hint, and the return of a pass through
+    assert count(lambda: transformer.scan(records)) == 0
+    # untracked arguments are still checked
+    with pytest.raises(Exception):
+        transformer.apply(records, factor="x")  # type: ignore
+
+
+def test_off_unless_asked_for() -> None:
+    repo, transformer = make_pipeline(remember=False)
+    records = repo.load(10)
+    assert count(lambda: transformer.apply(records)) == 10
+    assert len(provenance.get_provenance()) == 0
+
+
+def test_arguments_are_remembered_too() -> None:
+    _, transformer = make_pipeline()
+    records = [Row(), Row()]
+    assert count(lambda: transformer.apply(records)) == 2
+    assert count(lambda: transformer.apply(records)) == 0
+    assert count(lambda: transformer.apply(factor=2, records=records)) == 0
+
+
+def test_a_change_of_size_is_noticed() -> None:
+    repo, transformer = make_pipeline()
+    records = repo.load(3)
+    records.append("not a record")  # type: ignore
+    with pytest.raises(TypeHintViolation):
+        transformer.apply(records)
+
+
+def test_in_place_changes_need_forgetting() -> None:
+    repo, transformer = make_pipeline()
+    records = repo.load(3)
+    records[0] = "not a record"  # type: ignore
+    # same size, so it's trusted
+    assert transformer.apply(records) == 3
+    assert provenance.forget(records)
+    assert not provenance.forget(records)
+    with pytest.raises(TypeHintViolation):
+        transformer.apply(records)
+
+
+def test_advance_forgets_everything() -> None:
+    repo, transformer = make_pipeline()
+    records = repo.load(3)
+    assert provenance.advance() == 1
+    assert len(provenance.get_provenance()) == 0
+    assert count(lambda: transformer.apply(records)) == 3
+
+
+def test_sampling_backends_dont_vouch() -> None:
+    repo, transformer = make_pipeline("beartype")
+    records = repo.load(50)
+    assert len(provenance.get_provenance()) == 0
+    assert count(lambda: transformer.apply(records)) > 0
+    repo, transformer = make_pipeline(
+        get_backend("stdlib").configure(containers="shallow")
+    )
+    repo.load(50)
+    assert len(provenance.get_provenance()) == 0
+
+
+def test_coercing_backends_dont_vouch_across_backends() -> None:
+    class INumbers(metaclass=InterfaceMeta):
+        @abstract_method
+        def load(self) -> List[int]:
+            pass
+
+        @abstract_method
+        def total(self, numbers: List[int]) -> int:
+            pass
+
+    class Loose(INumbers, backend="pydantic", provenance=True):  # type: ignore
+        def load(self) -> List[int]:
+            return ["1", "2"]  # type: ignore
+
+        def total(self, numbers: List[int]) -> int:
+            return len(numbers)
+
+    class Strict(INumbers, backend="stdlib", provenance=True):  # type: ignore
+        def load(self) -> List[int]:
+            return []
+
+        def total(self, numbers: List[int]) -> int:
+            return len(numbers)
+
+    numbers = Loose().load()
+    assert len(provenance.get_provenance()) == 0
+    with pytest.raises(TypeHintViolation):
+        Strict().total(numbers)
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        "stdlib",
+        get_backend("pydantic").configure(containers="full"),
+        get_backend("beartype").configure(containers="full"),
+    ],
+)
+def test_variadic_arguments_are_always_checked(backend: Any) -> None:
+    class INumbers(metaclass=InterfaceMeta):
+        @abstract_method
+        def total(self, first: List[int], *rest: List[int], **named: List[int]) -> int:
+            pass
+
+    class Numbers(INumbers, backend=backend, provenance=True):  # type: ignore
+        def total(self, first: List[int], *rest: List[int], **named: List[int]) -> int:
+            return len(first) + len(rest) + len(named)
+
+    first = [1, 2]
+    assert Numbers().total(first, [3]) == 3
+    # first is known by now, what comes with it isn't
+    with pytest.raises(TypeHintViolation):
+        Numbers().total(first, ["x"])  # type: ignore
+    with pytest.raises(TypeHintViolation):
+        Numbers().total(first, other=["x"])  # type: ignore
+
+
+def test_weakly_held_values_are_forgotten() -> None:
+    repo, _ = make_pipeline(factory=Records)
+    records = repo.load(3)
+    assert len(provenance.get_provenance()) == 1
+    del records
+    gc.collect()
+    assert len(provenance.get_provenance()) == 0
+
+
+def test_bounded() -> None:
+    provenance.set_provenance(Provenance(maxsize=2))
+    repo, transformer = make_pipeline()
+    first, *_ = [repo.load(2) for _ in range(3)]
+    assert len(provenance.get_provenance()) == 2
+    assert count(lambda: transformer.apply(first)) == 2
+    with pytest.raises(ValueError):
+        Provenance(maxsize=0)
+
+
+@pytest.mark.parametrize(
+    "validated,wanted,expected",
+    [
+        (List[int], List[int], True),
+        (List[bool], Sequence[int], True),
+        (List[int], Iterable[Any], True),
+        (List[int], Optional[List[int]], True),
+        (List[int], list, True),
+        (Dict[str, List[int]], Dict[str, Sequence[int]], True),
+        (Tuple[int, int], Tuple[int, ...], True),
+        (Tuple[int, ...], Tuple[int, ...], True),
+        (Tuple[int, ...], Tuple[int, int], False),
+        (Sequence[int], List[int], False),
+        (List[int], List[bool], False),
+        (List[Optional[int]], List[int], False),
+        (List[int], Dict[int, int], False),
+        (Optional[List[int]], List[int], False),
+    ],
+)
+def test_covers(validated: Any, wanted: Any, expected: bool) -> None:
+    assert covers(validated, wanted) is expected
@@ -0,0 +1,206 @@
+import gc
+import importlib
+import sys
+import textwrap
+import threading
+from itertools import count
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from concordat.interface import InterfaceMeta, abstract_method
+from concordat.registry import Registry, normalize_path, registry
+
+BASE = """
+from concordat.interface import InterfaceMeta, abstract_method
+
+
+class IStorage(metaclass=InterfaceMeta):
+    @abstract_method
+    def get(self, key: str) -> bytes:
+        pass
+"""
+
+S3 = """
+from {package}.base import IStorage
+
+
+class S3Storage(IStorage):
+    def get(self, key: str) -> bytes:
+        return b"s3"
+"""
+
+NOT_STORAGE = """
+class Imposter:
+    def get(self, key: str) -> bytes:
+        return b""
+"""
+
+SLOW = """
+from {package} import gate
+from {package}.base import IStorage
+
+gate.importing.set()
+gate.proceed.wait(5)
+
+
+class SlowStorage(IStorage):
+    def get(self, key: str) -> bytes:
+        return b"slow"
+"""
+
+GATE = """
+import threading
+
+importing = threading.Event()
+proceed = threading.Event()
+"""
+
+_packages = count()
+
+
+@pytest.fixture
+def plugins(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    package = f"registry_plugins_{next(_packages)}"
+    root = tmp_path / package
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    (root / "base.py").write_text(BASE)
+    (root / "s3.py").write_text(S3.format(package=package))
+    (root / "imposter.py").write_text(NOT_STORAGE)
+    (root / "slow.py").write_text(SLOW.format(package=package))
+    (root / "gate.py").write_text(GATE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield package
+    for name in list(sys.modules):
+        if name.startswith(package):
+            del sys.modules[name]
+
+
+def declared(package: str) -> Tuple[Registry, str]:
+    plugins = Registry()
+    interface = f"{package}.base:IStorage"
+    plugins.declare(interface, "s3", f"{package}.s3:S3Storage")
+    plugins.declare(interface, "fake", f"{package}.imposter.Imposter")
+    return plugins, interface
+
+
+def test_listing_imports_nothing(plugins: str) -> None:
+    registry_, interface = declared(plugins)
+    assert registry_.names(interface) == ["fake", "s3"]
+    assert not any(name.startswith(plugins) for name in sys.modules)
+
+
+def test_get_imports_on_first_request(plugins: str) -> None:
+    registry_, interface = declared(plugins)
+    storage = registry_.get(interface, "s3")
+    assert f"{plugins}.s3" in sys.modules
+    assert storage().get("k") == b"s3"
+    assert registry_.get(interface, "s3") is storage
+    # the interface class works as well as its path
+    base = sys.modules[f"{plugins}.base"]
+    assert registry_.get(base.IStorage, "s3") is storage  # type: ignore
+
+
+def test_get_failures(plugins: str) -> None:
+    registry_, interface = declared(plugins)
+    with pytest.raises(LookupError, match="pick one of"):
+        registry_.get(interface, "gcs")
+    with pytest.raises(TypeError, match="isn't an implementation"):
+        registry_.get(interface, "fake")
+    registry_.declare(interface, "gone", f"{plugins}.s3:Missing")
+    with pytest.raises(ImportError):
+        registry_.get(interface, "gone")
+
+
+def test_imports_happen_outside_the_lock(plugins: str) -> None:
+    registry_, interface = declared(plugins)
+    registry_.declare(interface, "slow", f"{plugins}.slow:SlowStorage")
+    gate = importlib.import_module(f"{plugins}.gate")
+    found = {}
+
+    def get(name: str) -> None:
+        found[name] = registry_.get(interface, name)
+
+    slow = threading.Thread(target=get, args=("slow",))
+    slow.start()
+    assert gate.importing.wait(5)  # type: ignore
+    # the slow import is still running, lookups and records don't wait for it
+    fast = threading.Thread(target=get, args=("s3",))
+    fast.start()
+    fast.join(5)
+    registry_.record(sys.modules[f"{plugins}.base"].IStorage, found["s3"])  # type: ignore
+    assert not fast.is_alive() and slow.is_alive()
+    gate.proceed.set()  # type: ignore
+    slow.join(5)
+    assert found["slow"]().get("k") == b"slow"
+    assert registry_.get(interface, "slow") is found["slow"]
+
+
+def test_conflicting_declarations(plugins: str) -> None:
+    registry_, interface = declared(plugins)
+    registry_.declare(interface, "s3", f"{plugins}.s3.S3Storage")
+    with pytest.raises(ValueError, match="already declared"):
+        registry_.declare(interface, "s3", f"{plugins}.other:S3Storage")
+
+
+class IQueue(metaclass=InterfaceMeta):
+    @abstract_method
+    def push(self, item: str) -> None:
+        pass
+
+
+class MemoryQueue(IQueue):
+    def push(self, item: str) -> None:
+        pass
+
+
+def test_created_implementations_are_recorded() -> None:
+    path = f"{__name__}:MemoryQueue"
+    assert path in registry.names(IQueue)
+    assert registry.get(IQueue, path) is MemoryQueue
+    assert registry.get(f"{__name__}.IQueue", path) is MemoryQueue
+
+
+def test_recording_is_weak() -> None:
+    def build() -> List[str]:
+        class Temporary(IQueue):
+            def push(self, item: str) -> None:
+                pass
+
+        return [name for name in registry.names(IQueue) if "Temporary" in name]
+
+    assert build()
+    gc.collect()
+    assert not [name for name in registry.names(IQueue) if "Temporary" in name]
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [("a.b:C", "a.b:C"), ("a.b.C", "a.b:C"), ("a:B.C", "a:B.C")],
+)
+def test_normalize_path(path: str, expected: str) -> None:
+    assert normalize_path(path) == expected
+
+
+@pytest.mark.parametrize("path", ["C", ":C", "a:"])
+def test_bad_paths(path: str) -> None:
+    with pytest.raises(ValueError):
+        normalize_path(path)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="EntryPoints.select")
+def test_entry_points(monkeypatch: pytest.MonkeyPatch) -> None:
+    from importlib import metadata  # pylint: disable=import-outside-toplevel
+
+    points = metadata.EntryPoints(  # type: ignore
+        [metadata.EntryPoint("s3", "plugins.s3:S3Storage", "concordat.test")]
+    )
+    monkeypatch.setattr(metadata, "entry_points", lambda: points)
+    registry_ = Registry()
+    assert registry_.declare_entry_points(
+        "plugins.base:IStorage", "concordat.test"
+    ) == ["s3"]
+    assert registry_.names("plugins.base:IStorage") == ["s3"]
+    assert registry_.declare_entry_points("plugins.base:IStorage", "other") == []
@@ -0,0 +1,96 @@
+from typing import Dict, List
+
+import pydantic
+import pytest
+from pydantic import ValidationError
+
+from concordat.interface import (
+    RETURN_VALIDATOR,
+    InterfaceMeta,
+    abstract_method,
+    return_type_wrapper,
+)
+
+
+class IRepo(metaclass=InterfaceMeta, backend="pydantic"):
+    @abstract_method
+    def load(self, key: str) -> List[int]:
+        pass
+
+    @abstract_method
+    def index(self) -> Dict[str, int]:
+        pass
+
+
+class Repo(IRepo):
+    def load(self, key: str) -> List[int]:
+        return [1, 2, 3]
+
+    def index(self) -> Dict[str, int]:
+        return {"a": 1}
+
+
+def test_validator_is_built_when_wrapped() -> None:
+    def load(key: str) -> List[int]:
+        return [1]
+
+    validator = getattr(return_type_wrapper(load), RETURN_VALIDATOR)
+    assert validator.resolved
+    assert validator.model is not None
+
+
+def test_no_models_are_built_per_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    def explode(*args, **kwargs):  # type: ignore
+        raise AssertionError("create_model called on the hot path")
+
+    monkeypatch.setattr(pydantic, "create_model", explode)
+    repo = Repo()
+    for _ in range(100):
+        assert repo.load("key") == [1, 2, 3]
+        assert repo.index() == {"a": 1}
+
+
+def test_result_is_returned_untouched() -> None:
+    result = [1, 2, 3]
+
+    class Same(IRepo):
+        def load(self, key: str) -> List[int]:
+            return result
+
+        def index(self) -> Dict[str, int]:
+            return {}
+
+    assert Same().load("key") is result
+
+
+def test_forward_reference_is_resolved_on_first_call() -> None:
+    def build() -> "LateType":  # type: ignore # noqa: F821
+        return LateType()
+
+    wrapped = return_type_wrapper(build)
+    validator = getattr(wrapped, RETURN_VALIDATOR)
+    assert not validator.resolved
+
+    globals()["LateType"] = type("LateType", (), {})
+    try:
+        assert isinstance(wrapped(), globals()["LateType"])
+        assert validator.resolved
+    finally:
+        del globals()["LateType"]
+
+
+def test_wrapper_still_rejects_bad_values() -> None:
+    def bad() -> int:
+        return "not an int"  # type: ignore
+
+    with pytest.raises(ValidationError):
+        return_type_wrapper(bad)()
+
+
+def test_missing_return_annotation() -> None:
+    def unannotated():  # type: ignore
+        return 1
+
+    wrapped = return_type_wrapper(unannotated)
+    with pytest.raises(TypeError):
+        wrapped()
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from typing import Any, List
+
+import pytest
+
+import concordat
+from concordat.checkers import TypeHintViolation
+from concordat.interface import InterfaceMeta, abstract_method
+from concordat.scoped import override
+
+
+class IStore(metaclass=InterfaceMeta):
+    @abstract_method
+    def put(self, key: str, count: int) -> int:
+        pass
+
+    @abstract_method
+    def keys(self, keys: List[str]) -> List[str]:
+        pass
+
+    @abstract_method
+    async def fetch(self, key: str) -> int:
+        pass
+
+
+def build(backend: str, **kwargs: Any) -> Any:
+    class Store(IStore, backend=backend, **kwargs):  # type: ignore
+        def put(self, key: str, count: int) -> int:
+            return count
+
+        def keys(self, keys: List[str]) -> List[str]:
+            return keys
+
+        async def fetch(self, key: str) -> int:
+            return 1
+
+    return Store()
+
+
+STORES = [
+    build("stdlib"),
+    build("stdlib", instrument=True),
+    build("stdlib", enforcement="sampled(1.0)"),
+    build("stdlib", enforcement="warmup(100)"),
+    build("pydantic"),
+    build("beartype"),
+]
+
+
+@pytest.mark.parametrize("store", STORES)
+def test_off_skips_every_check(store: Any) -> None:
+    with concordat.enforcement("off"):
+        assert store.put("a", "x") == "x"
+        assert store.keys([1]) == [1]
+        assert asyncio.run(store.fetch([])) == 1
+    with pytest.raises(Exception):
+        store.put("a", "x")
+    with pytest.raises(Exception):
+        asyncio.run(store.fetch([]))
+
+
+def test_nesting_and_full() -> None:
+    store = build("stdlib")
+    assert override() is None
+    with concordat.enforcement("off"):
+        with concordat.enforcement("full"):
+            assert override() is None
+            with pytest.raises(TypeHintViolation):
+                store.put(1, 2)
+        with concordat.enforcement("sampled(0.01)"):
+            assert override() == 0.01
+        assert override() == 0.0
+        store.put(1, 2)
+    assert override() is None
+
+
+def test_sampled_checks_a_fraction() -> None:
+    store = build("stdlib")
+    with concordat.enforcement("sampled(0.0)"):
+        store.put(1, 2)
+    with concordat.enforcement("sampled(1.0)"):
+        with pytest.raises(TypeHintViolation):
+            store.put(1, 2)
+
+
+def test_class_policy_still_applies() -> None:
+    # overrides only turn checking down, off has nothing to turn back on
+    store = build("stdlib", enforcement="off")
+    with concordat.enforcement("full"):
+        store.put(1, 2)
+
+
+@pytest.mark.parametrize("policy", ["observe", "warmup(3)", "sometimes"])
+def test_bad_policy(policy: str) -> None:
+    with pytest.raises(ValueError):
+        with concordat.enforcement(policy):
+            pass
+
+
+def test_follows_tasks_and_threads() -> None:
+    store = build("stdlib")
+    seen: List[Any] = []
+
+    async def outside() -> None:
+        await asyncio.sleep(0)
+        seen.append(("outside", override()))
+        with pytest.raises(TypeHintViolation):
+            store.put(1, 2)
+
+    async def inside() -> None:
+        await asyncio.sleep(0)
+        seen.append(("inside", override()))
+        store.put(1, 2)
+
+    async def main() -> None:
+        task = asyncio.ensure_future(outside())
+        with concordat.enforcement("off"):
+            # started in the block, inherits the override
+            started = asyncio.ensure_future(inside())
+        await asyncio.gather(task, started)
+
+    asyncio.run(main())
+    assert sorted(seen) == [("inside", 0.0), ("outside", None)]
+
+    def in_thread() -> None:
+        seen.append(("thread", override()))
+
+    with concordat.enforcement("off"):
+        thread = threading.Thread(target=in_thread)
+        thread.start()
+        thread.join()
+    assert seen[-1] == ("thread", None)
+
+
+def test_typed_attributes() -> None:
+    class IRecord(metaclass=InterfaceMeta, slots=True):
+        key: int
+
+    class Record(IRecord):
+        pass
+
+    record = Record()
+    with concordat.enforcement("off"):
+        record.key = "x"  # type: ignore
+    assert record.key == "x"
+    with pytest.raises(TypeHintViolation):
+        record.key = "y"  # type: ignore
@@ -0,0 +1,114 @@
+import pickle
+from typing import ClassVar, Dict, List, Optional
+
+import pytest
+
+from concordat.interface import InterfaceMeta, abstract_method
+from concordat.slots import AttributeViolation
+
+
+class IRecord(metaclass=InterfaceMeta, slots=True):
+    key: int
+    name: str
+    kind: ClassVar[str] = "record"
+    limit: int = 10
+
+    @abstract_method
+    def describe(self) -> str:
+        pass
+
+
+class Record(IRecord):
+    tags: List[str]
+    parent: Optional["Record"]
+
+    def __init__(self, key: int, name: str) -> None:
+        self.key = key
+        self.name = name
+        self.tags = []
+
+    def describe(self) -> str:
+        return f"{self.key}:{self.name}"
+
+
+class Tagged(Record):
+    # narrows an inherited annotation, its slot stays where it is
+    key: bool  # type: ignore
+    labels: Dict[str, str]
+
+
+def test_slots_from_annotations() -> None:
+    assert IRecord.__slots__ == ("key", "name")  # type: ignore
+    assert Record.__slots__ == ("tags", "parent")  # type: ignore
+    assert Tagged.__slots__ == ("labels",)  # type: ignore
+    record = Record(1, "a")
+    assert not hasattr(record, "__dict__")
+    assert record.describe() == "1:a"
+    assert Record.kind == "record" and record.limit == 10
+    with pytest.raises(AttributeError):
+        record.other = 1  # type: ignore
+
+
+def test_typed_setters() -> None:
+    record = Record(1, "a")
+    with pytest.raises(AttributeViolation, match=r"Record.key = 'x' violates"):
+        record.key = "x"  # type: ignore
+    with pytest.raises(AttributeViolation):
+        record.tags = [1]  # type: ignore
+    assert record.key == 1
+    # the forward reference is resolved on the first assignment
+    record.parent = record
+    record.parent = None
+    with pytest.raises(AttributeViolation):
+        record.parent = "a"  # type: ignore
+
+
+def test_inherited_slots_are_checked_with_the_latest_hint() -> None:
+    tagged = Tagged(True, "a")
+    tagged.labels = {"a": "b"}
+    with pytest.raises(AttributeViolation):
+        tagged.key = 2
+    with pytest.raises(AttributeViolation):
+        tagged.name = 1  # type: ignore
+    assert not hasattr(tagged, "__dict__")
+
+
+def test_enforcement_off_keeps_slots_but_not_checks() -> None:
+    class Unchecked(Record, enforcement="off"):
+        pass
+
+    unchecked = Unchecked(1, "a")
+    unchecked.key = "x"  # type: ignore
+    assert unchecked.key == "x"
+    assert not hasattr(unchecked, "__dict__")
+
+
+def test_own_setattr_wins() -> None:
+    seen: List[str] = []
+
+    class Watched(Record):
+        def __setattr__(self, name: str, value: object) -> None:
+            seen.append(name)
+            super().__setattr__(name, value)
+
+    watched = Watched(1, "a")
+    assert seen == ["key", "name", "tags"]
+    with pytest.raises(AttributeViolation):
+        watched.key = "x"  # type: ignore
+
+
+def test_off_by_default() -> None:
+    class IPlain(metaclass=InterfaceMeta):
+        key: int
+
+    class Plain(IPlain):
+        pass
+
+    plain = Plain()
+    plain.key = "x"  # type: ignore
+    assert plain.__dict__ == {"key": "x"}
+
+
+def test_pickle() -> None:
+    record = pickle.loads(pickle.dumps(Record(1, "a")))
+    assert (record.key, record.name, record.tags) == (1, "a", [])
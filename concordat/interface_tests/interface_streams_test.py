@@ -0,0 +1,139 @@
+from typing import Any, Generator, Iterable, Iterator, List
+
+import pytest
+from beartype.roar import BeartypeCallHintPepReturnException
+from pydantic import ValidationError
+
+from concordat.checkers import TypeHintViolation
+from concordat.interface import InterfaceMeta, abstract_method, return_type_wrapper
+from concordat.streams import (
+    CheckedGenerator,
+    CheckedIterator,
+    check_stream,
+    stream_item,
+)
+
+ERRORS = {
+    "beartype": BeartypeCallHintPepReturnException,
+    "pydantic": ValidationError,
+    "stdlib": TypeHintViolation,
+}
+
+
+class IStage(metaclass=InterfaceMeta):
+    @abstract_method
+    def records(self, items: List[Any]) -> Iterator[int]:
+        pass
+
+    @abstract_method
+    def generate(self, items: List[Any]) -> Generator[int, str, None]:
+        pass
+
+    @abstract_method
+    def listed(self, items: List[Any]) -> Iterable[int]:
+        pass
+
+
+def make_stage(backend: str, every: int = 1) -> IStage:
+    class Stage(IStage, backend=backend):  # type: ignore
+        @check_stream(every=every)
+        def records(self, items: List[Any]) -> Iterator[int]:
+            return iter(items)
+
+        def generate(self, items: List[Any]) -> Generator[int, str, None]:
+            for item in items:
+                reply = yield item
+                if reply is not None:
+                    yield len(reply)
+
+        def listed(self, items: List[Any]) -> Iterable[int]:
+            return items
+
+    return Stage()
+
+
+def test_stream_item() -> None:
+    def gen() -> Iterable[str]:
+        yield "a"
+
+    def plain() -> Iterable[str]:
+        return []
+
+    assert stream_item(gen, {"return": Iterable[str]}) is str
+    assert stream_item(plain, {"return": Iterable[str]}) is None
+    assert stream_item(plain, {"return": Iterator[int]}) is int
+    assert stream_item(plain, {"return": Generator[bytes, None, None]}) is bytes
+    assert stream_item(plain, {"return": List[int]}) is None
+    assert stream_item(gen, {}) is None
+
+
+@pytest.mark.parametrize("backend", list(ERRORS))
+def test_items_are_checked_as_they_stream(backend: str) -> None:
+    stage = make_stage(backend)
+    stream = stage.records([1, 2, "three", 4])
+    assert isinstance(stream, CheckedIterator)
+    assert next(stream) == 1
+    assert next(stream) == 2
+    with pytest.raises(ERRORS[backend]):
+        next(stream)
+    # nothing is materialised, the rest is still there
+    assert next(stream) == 4
+    assert list(stage.records([5, 6])) == [5, 6]
+
+
+@pytest.mark.parametrize("backend", list(ERRORS))
+def test_generators_keep_working(backend: str) -> None:
+    stage = make_stage(backend)
+    generator = stage.generate([1, 2])
+    assert isinstance(generator, CheckedGenerator)
+    assert next(generator) == 1
+    assert generator.send("abc") == 3
+    assert generator.send(None) == 2
+    with pytest.raises(ERRORS[backend]):
+        stage.generate(["bad"]).send(None)
+    generator.close()
+    with pytest.raises(StopIteration):
+        next(generator)
+
+
+@pytest.mark.parametrize("backend", list(ERRORS))
+def test_every_nth_item(backend: str) -> None:
+    stage = make_stage(backend, every=3)
+    assert list(stage.records([1, "x", "y", 4, "z"])) == [1, "x", "y", 4, "z"]
+    with pytest.raises(ERRORS[backend]):
+        list(stage.records([1, 2, 3, "four"]))
+
+
+def test_not_an_iterator() -> None:
+    class Lying(IStage, backend="stdlib"):  # type: ignore
+        def records(self, items: List[Any]) -> Iterator[int]:
+            return items  # type: ignore
+
+        def generate(self, items: List[Any]) -> Generator[int, str, None]:
+            yield from items
+
+        def listed(self, items: List[Any]) -> Iterable[int]:
+            return items
+
+    with pytest.raises(TypeHintViolation):
+        Lying().records([1])
+
+
+def test_iterables_are_not_proxied() -> None:
+    items = [1, 2]
+    assert make_stage("stdlib").listed(items) is items
+
+
+def test_bad_step() -> None:
+    with pytest.raises(ValueError):
+        check_stream(every=0)
+
+
+def test_return_type_wrapper_streams() -> None:
+    @return_type_wrapper
+    def numbers(items: List[Any]) -> Iterator[int]:
+        return iter(items)
+
+    assert list(numbers([1, 2])) == [1, 2]
+    with pytest.raises(ValidationError):
+        list(numbers([1, "two"]))
@@ -0,0 +1,105 @@
+from typing import Any, List
+
+import pytest
+
+from concordat import interface
+from concordat.interface import (
+    ABSTRACT_HINTS,
+    METHOD_TABLE,
+    InterfaceMeta,
+    abstract_method,
+)
+
+
+class IShape(metaclass=InterfaceMeta):
+    @abstract_method
+    def area(self, scale: int) -> float:
+        pass
+
+    @abstract_method
+    def clone(self) -> "IShape":
+        pass
+
+
+class Square(IShape):
+    def area(self, scale: int) -> float:
+        return 1.0 * scale
+
+    def clone(self) -> "IShape":
+        return Square()
+
+    def extra(self) -> None:
+        pass
+
+
+def test_interface_hints_are_resolved_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    hints = IShape.__dict__[ABSTRACT_HINTS]
+    assert hints["clone"] == {"return": IShape}
+
+    calls: List[Any] = []
+    original = interface.get_type_hints
+
+    def counting(obj: Any) -> Any:
+        calls.append(obj)
+        return original(obj)
+
+    monkeypatch.setattr(interface, "get_type_hints", counting)
+
+    class Circle(IShape):
+        def area(self, scale: int) -> float:
+            return 3.14 * scale
+
+        def clone(self) -> "IShape":
+            return Circle()
+
+    # only the two methods Circle defines itself, never the interface's
+    assert len(calls) == 2
+    assert IShape.__dict__[ABSTRACT_HINTS] is hints
+
+
+def test_inherited_methods_are_not_resolved_again(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: List[Any] = []
+    original = interface.get_type_hints
+
+    def counting(obj: Any) -> Any:
+        calls.append(obj)
+        return original(obj)
+
+    monkeypatch.setattr(interface, "get_type_hints", counting)
+
+    class Deep(Square):
+        pass
+
+    class Deeper(Deep):
+        def helper(self) -> None:
+            pass
+
+    # helper is new and gets wrapped, nothing inherited is looked at again
+    assert [fnc.__name__ for fnc in calls] == ["helper"]
+    table = Deeper.__dict__[METHOD_TABLE]
+    assert set(table) == {"area", "clone", "extra", "helper"}
+    assert table["area"] == {"scale": int, "return": float}
+
+
+def test_override_is_checked_against_the_table() -> None:
+    with pytest.raises(TypeError):
+
+        class Bad(Square):
+            def area(self, scale: str) -> float:
+                return 1.0
+
+    class Good(Square):
+        def area(self, scale: int) -> float:
+            return 2.0 * scale
+
+    assert Good().area(2) == 4.0
+
+
+def test_interface_methods_do_not_count_as_implemented() -> None:
+    with pytest.raises(NotImplementedError):
+
+        class Lazy(IShape):
+            def area(self, scale: int) -> float:
+                return 0.0
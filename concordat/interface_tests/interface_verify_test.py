@@ -0,0 +1,202 @@
+import json
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from concordat.verify import (
+    CONFORMANCE,
+    FORWARD_REFERENCE,
+    IMPORT,
+    VERIFICATION,
+    discover,
+    main,
+)
+
+INTERFACE = """
+from concordat.interface import InterfaceMeta, abstract_method
+
+
+class IStore(metaclass=InterfaceMeta):
+    @abstract_method
+    def put(self, key: str) -> None:
+        pass
+
+    @abstract_method
+    def get(self, key: str) -> int:
+        pass
+"""
+
+IMPLEMENTATIONS = """
+from {package}.iface import IStore
+
+
+class Wrong(IStore):
+    def put(self, key: int) -> None:
+        pass
+
+    def get(self, key: int) -> int:
+        pass
+
+
+class Missing(IStore):
+    def put(self, key: str) -> None:
+        pass
+
+
+class Store(IStore):
+    def put(self, key: str) -> None:
+        pass
+
+    def get(self, key: str) -> int:
+        return 1
+
+    def later(self, other: "Nowhere") -> None:  # noqa: F821
+        pass
+"""
+
+DANGLING = """
+from {package}.iface import IStore
+
+
+class Dangling(IStore):
+    def put(self, key: "Nowhere") -> None:  # noqa: F821
+        pass
+
+    def get(self, key: str) -> int:
+        return 1
+
+
+class Store(IStore):
+    def put(self, key: str) -> None:
+        pass
+
+    def get(self, key: str) -> int:
+        return 1
+"""
+
+
+@pytest.fixture
+def package(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest
+) -> str:
+    name = f"verified_{request.node.name}"
+    root = tmp_path / name
+    (root / "stores").mkdir(parents=True)
+    (root / "__init__.py").write_text("")
+    (root / "__main__.py").write_text("raise SystemExit('never imported')")
+    (root / "iface.py").write_text(INTERFACE)
+    (root / "stores" / "__init__.py").write_text("")
+    (root / "stores" / "memory.py").write_text(
+        textwrap.dedent(IMPLEMENTATIONS.format(package=name))
+    )
+    (root / "broken.py").write_text(f"import {name}.stores.memory\n1 / 0\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return name
+
+
+def test_discover(package: str) -> None:
+    assert discover([package]) == [
+        package,
+        f"{package}.broken",
+        f"{package}.iface",
+        f"{package}.stores",
+        f"{package}.stores.memory",
+    ]
+    with pytest.raises(ModuleNotFoundError):
+        discover([f"{package}_missing"])
+
+
+def test_every_violation_in_one_run(
+    package: str, tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    report_path = tmp_path / "report.json"
+    assert main([package, "--jobs", "2", "--report", str(report_path)]) == 1
+    report = json.loads(report_path.read_text())
+    assert not report["ok"] and report["violations"] == 5
+    modules = {result["module"]: result for result in report["modules"]}
+    found = sorted(
+        (violation["kind"], violation["class"], violation["error"])
+        for violation in modules[f"{package}.stores.memory"]["violations"]
+    )
+    assert found == [
+        (CONFORMANCE, f"{package}.stores.memory.Missing", "NotImplementedError"),
+        (CONFORMANCE, f"{package}.stores.memory.Wrong", "TypeError"),
+        (CONFORMANCE, f"{package}.stores.memory.Wrong", "TypeError"),
+        (FORWARD_REFERENCE, f"{package}.stores.memory.Store", "NameError"),
+    ]
+    broken = modules[f"{package}.broken"]
+    assert [violation["kind"] for violation in broken["violations"]] == [IMPORT]
+    assert broken["verify_seconds"] is None
+    iface = modules[f"{package}.iface"]
+    assert iface["classes"] == ["IStore"] and not iface["violations"]
+    assert len(iface["sha256"]) == 64 and iface["import_seconds"] >= 0
+    printed = capsys.readouterr().out
+    assert f"{package}.stores.memory: import" in printed
+    assert "5 modules, 5 violations" in printed
+
+
+def test_conforming_classes_go_to_the_cache(package: str, tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    assert main([f"{package}.iface", "--cache-dir", str(cache)]) == 0
+    assert main([f"{package}.stores", "--cache-dir", str(cache)]) == 1
+    # Store conformed, Wrong and Missing didn't
+    assert len(list(cache.iterdir())) == 1
+
+
+def test_dangling_forward_reference_is_a_violation(
+    package: str, tmp_path: Path
+) -> None:
+    (tmp_path / package / "dangling.py").write_text(DANGLING.format(package=package))
+    report_path = tmp_path / "report.json"
+    assert main([f"{package}.dangling", "--report", str(report_path)]) == 1
+    report = json.loads(report_path.read_text())
+    (result,) = report["modules"]
+    # the import went on past the class, instead of crashing the module
+    assert result["classes"] == ["Dangling", "Store"]
+    assert [
+        (violation["kind"], violation["class"], violation["error"])
+        for violation in result["violations"]
+    ] == [(CONFORMANCE, f"{package}.dangling.Dangling", "NameError")]
+    assert "Dangling.put" in result["violations"][0]["message"]
+
+
+FAILING = """
+from {package}.iface import IStore
+
+
+class Store(IStore, lazy=True):
+    def put(self, key: str) -> None:
+        pass
+
+    def get(self, key: str) -> int:
+        return 1
+
+    def odd(self, value: 1) -> None:
+        pass
+"""
+
+
+def test_errors_are_reported_per_module(package: str, tmp_path: Path) -> None:
+    (tmp_path / package / "odd.py").write_text(FAILING.format(package=package))
+    (tmp_path / package / "syntax.py").write_text("def broken(:\n")
+    (tmp_path / package / "missing.py").write_text("import no_such_module_here\n")
+    (tmp_path / package / "exits.py").write_text("raise SystemExit(3)\n")
+    report_path = tmp_path / "report.json"
+    names = [f"{package}.{module}" for module in ("odd", "syntax", "missing", "exits")]
+    assert main([*names, "--report", str(report_path)]) == 1
+    report = json.loads(report_path.read_text())
+    found = {
+        result["module"].rsplit(".", 1)[1]: [
+            (violation["kind"], violation["error"])
+            for violation in result["violations"]
+        ]
+        for result in report["modules"]
+    }
+    # only built by the verifier, the class is lazy, and the error is the backend's
+    assert [kind for kind, _ in found.pop("odd")] == [VERIFICATION]
+    assert found == {
+        "syntax": [(IMPORT, "SyntaxError")],
+        "missing": [(IMPORT, "ModuleNotFoundError")],
+        "exits": [(IMPORT, "SystemExit")],
+    }
@@ -0,0 +1,262 @@
+"""
+Memoization of methods the interface declares pure. The cache sits in front
+of the checked method, so a hit hands back the result without validating the
+arguments again: they were checked the first time around, and a pure method
+gives the same answer for the same arguments. Keys are typed like
+functools.lru_cache(typed=True), so 1 and True never share an entry.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from inspect import (
+    isasyncgenfunction,
+    iscoroutinefunction,
+    isfunction,
+    isgeneratorfunction,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from concordat.policy import CHECKED, RAW_FUNCTION, EnforcementPolicy
+
+if TYPE_CHECKING:
+    from concordat.interface import ValidationBackend
+
+PURE = "__concordat_pure__"
+MEMO = "cache"
+DEFAULT_MAXSIZE = 128
+
+
+class Purity(NamedTuple):
+    """How the implementations of a pure method are cached
+
+    Args:
+        maxsize (int): How many results to keep, least recently used go first
+        ttl (Optional[float]): Seconds a result stays fresh, None for forever
+    """
+
+    maxsize: int = DEFAULT_MAXSIZE
+    ttl: Optional[float] = None
+
+
+def get_purity(
+    pure: Any, maxsize: int = DEFAULT_MAXSIZE, ttl: Optional[float] = None
+) -> Optional[Purity]:
+    """Turns the arguments of abstract_method into a Purity
+
+    Args:
+        pure (Any): Falsy for impure methods, True or a Purity otherwise
+        maxsize (int, optional): See Purity. Defaults to DEFAULT_MAXSIZE.
+        ttl (Optional[float], optional): See Purity. Defaults to None.
+
+    Raises:
+        ValueError: The size or ttl make no sense
+
+    Returns:
+        Optional[Purity]: The purity, None for impure methods
+    """
+    if not pure:
+        return None
+    purity = pure if isinstance(pure, Purity) else Purity(maxsize, ttl)
+    if purity.maxsize < 1:
+        raise ValueError(f"A pure method needs room for a result, got {purity}")
+    if purity.ttl is not None and purity.ttl <= 0:
+        raise ValueError(f"Results of a pure method need a positive ttl, got {purity}")
+    return purity
+
+
+def _key(args: Tuple, kwargs: Dict) -> Hashable:
+    types = tuple(type(value) for value in args)
+    if not kwargs:
+        return args, types
+    items = tuple(sorted(kwargs.items()))
+    return args, types, items, tuple(type(value) for _, value in items)
+
+
+class MemoCache:
+    """The results of one pure method
+
+    Args:
+        purity (Purity): Size and ttl
+    """
+
+    def __init__(self, purity: Purity) -> None:
+        self.purity = purity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.results: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Finds a fresh result
+
+        Args:
+            key (Hashable): The key of the call
+
+        Returns:
+            Tuple[bool, Any]: Whether it was found and the result
+        """
+        with self.lock:
+            entry = self.results.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires and expires < time.monotonic():
+                    del self.results[key]
+                    self.expirations += 1
+                else:
+                    self.results.move_to_end(key)
+                    self.hits += 1
+                    return True, result
+            self.misses += 1
+        return False, None
+
+    def store(self, key: Hashable, result: Any) -> None:
+        """Keeps a result, pushing out the least recently used ones when full
+
+        Args:
+            key (Hashable): The key of the call
+            result (Any): What the method returned
+        """
+        ttl = self.purity.ttl
+        expires = time.monotonic() + ttl if ttl is not None else 0.0
+        with self.lock:
+            self.results[key] = (result, expires)
+            self.results.move_to_end(key)
+            while len(self.results) > self.purity.maxsize:
+                self.results.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> bool:
+        """Drops the result of one call. Instance methods take the
+            instance as the first argument, like calling them on the class.
+
+        Returns:
+            bool: Whether there was a result to drop
+        """
+        try:
+            key = _key(args, kwargs)
+            with self.lock:
+                return self.results.pop(key, None) is not None
+        except TypeError:
+            # unhashable, so it was never cached
+            return False
+
+    def clear(self) -> None:
+        """Drops every result, the statistics are kept"""
+        with self.lock:
+            self.results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """A snapshot of the statistics
+
+        Returns:
+            Dict[str, Any]: hits, misses, evictions, expirations, size, maxsize and ttl
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self.results),
+                "maxsize": self.purity.maxsize,
+                "ttl": self.purity.ttl,
+            }
+
+    def __repr__(self) -> str:
+        stats = self.stats()
+        return (
+            f"<MemoCache {stats['size']}/{stats['maxsize']} "
+            f"hits={stats['hits']} misses={stats['misses']}>"
+        )
+
+
+def memoize(checked: Callable, fnc: Callable, purity: Purity) -> Callable:
+    """Puts a cache in front of a checked method
+
+    Args:
+        checked (Callable): The method as the enforcement policy installed it
+        fnc (Callable): The function as written by the author
+        purity (Purity): Size and ttl of the cache
+
+    Returns:
+        Callable: The memoized method, its cache is the `cache` attribute
+    """
+    cache = MemoCache(purity)
+    lookup, store = cache.lookup, cache.store
+
+    @wraps(fnc)
+    def memoized(*args, **kwargs) -> Any:  # type: ignore
+        try:
+            key = _key(args, kwargs)
+            found, result = lookup(key)
+        except TypeError:
+            # unhashable arguments can't be cached, but still get checked
+            return checked(*args, **kwargs)
+        if found:
+            return result
+        result = checked(*args, **kwargs)
+        store(key, result)
+        return result
+
+    setattr(memoized, MEMO, cache)
+    setattr(memoized, RAW_FUNCTION, fnc)
+    setattr(memoized, CHECKED, checked)
+    return memoized
+
+
+def can_memoize(fnc: Callable) -> bool:
+    """Whether the results of a function can be handed out more than once,
+        coroutines and generators can only be consumed once
+
+    Args:
+        fnc (Callable): The function
+
+    Returns:
+        bool: True when it returns plain values
+    """
+    return not (
+        iscoroutinefunction(fnc) or isgeneratorfunction(fnc) or isasyncgenfunction(fnc)
+    )
+
+
+class Memoized(EnforcementPolicy):
+    """Wraps the policy of a class for the methods its interface declares
+        pure, whatever that policy installs ends up behind the cache
+
+    Args:
+        policy (EnforcementPolicy): The policy of the class
+        purity (Purity): Size and ttl of the cache
+    """
+
+    def __init__(self, policy: EnforcementPolicy, purity: Purity) -> None:
+        self.policy = policy
+        self.purity = purity
+        self.name = policy.name
+
+    def __repr__(self) -> str:
+        return f"{self.policy!r}+pure"
+
+    def install(
+        self, fnc: Callable, backend: "ValidationBackend", static: bool = False
+    ) -> Any:
+        if not can_memoize(fnc):
+            return self.policy.install(fnc, backend, static)
+        attribute = self.policy.install(fnc, backend)
+        if not isfunction(attribute):
+            # descriptors like warmup's hand out the function they wrap, held
+            # here rather than on the class they never swap themselves out
+            attribute = getattr(attribute, "__get__")(None, None)
+        memoized = memoize(attribute, fnc, self.purity)
+        return staticmethod(memoized) if static else memoized
@@ -0,0 +1,273 @@
+"""
+Opt in instrumentation of the checked methods. Classes created with
+`instrument=True` (or CONCORDAT_INSTRUMENT=1) count calls and violations
+and time the validation work, apart from the method's own time. Classes
+without it get the very same wrappers as before, so it costs them nothing.
+"""
+import os
+from collections import deque
+from functools import wraps
+from inspect import iscoroutinefunction
+from random import random
+from time import perf_counter
+
+try:
+    from time import perf_counter_ns
+except ImportError:  # pragma: no cover
+    # python 3.6
+
+    def perf_counter_ns() -> int:  # type: ignore
+        """time.perf_counter_ns for pythons that don't have it"""
+        return int(perf_counter() * 1e9)
+
+
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from concordat.scoped import override
+
+INSTRUMENT = "__concordat_instrument__"
+INSTRUMENT_ENV = "CONCORDAT_INSTRUMENT"
+SAMPLES = 1024
+PERCENTILES = (50, 90, 99)
+
+Snapshot = Dict[str, Dict[str, float]]
+Collector = Callable[[Snapshot], None]
+
+
+class MethodStats:
+    """What we know about a single method. Percentiles are taken over
+        the most recent `size` calls so memory stays bounded.
+
+    Args:
+        name (str): The qualified name of the method
+        size (int, optional): How many timings to keep. Defaults to SAMPLES.
+    """
+
+    __slots__ = ("name", "calls", "violations", "validation_ns", "samples")
+
+    def __init__(self, name: str, size: int = SAMPLES) -> None:
+        self.name = name
+        self.calls = 0
+        self.violations = 0
+        self.validation_ns = 0
+        self.samples: Deque[int] = deque(maxlen=size)
+
+    def clear(self) -> None:
+        """Forgets everything recorded so far"""
+        self.calls = 0
+        self.violations = 0
+        self.validation_ns = 0
+        self.samples.clear()
+
+    def record(self, elapsed: int) -> None:
+        """Adds the validation time of a single call
+
+        Args:
+            elapsed (int): Nanoseconds spent validating
+        """
+        self.validation_ns += elapsed
+        self.samples.append(elapsed)
+
+    def snapshot(self) -> Dict[str, float]:
+        """The numbers as plain values
+
+        Returns:
+            Dict[str, float]: calls, violations, validation_ns, mean_ns and the percentiles
+        """
+        samples = sorted(self.samples)
+        stats: Dict[str, float] = {
+            "calls": self.calls,
+            "violations": self.violations,
+            "validation_ns": self.validation_ns,
+            "mean_ns": self.validation_ns / self.calls if self.calls else 0.0,
+        }
+        for percentile in PERCENTILES:
+            index = min(len(samples) - 1, len(samples) * percentile // 100)
+            stats[f"p{percentile}_ns"] = samples[index] if samples else 0.0
+        return stats
+
+    def __repr__(self) -> str:
+        return f"<MethodStats {self.name} calls={self.calls}>"
+
+
+_registry: Dict[str, MethodStats] = {}
+_collectors: List[Collector] = []
+
+
+def register(fnc: Callable) -> MethodStats:
+    """The stats of a method, created on first use. Methods with the same
+        qualified name, eg classes built by the same factory, share them.
+
+    Args:
+        fnc (Callable): The function as written by the author
+
+    Returns:
+        MethodStats: The stats
+    """
+    name = f"{fnc.__module__}.{fnc.__qualname__}"
+    stats = _registry.get(name)
+    if stats is None:
+        stats = _registry[name] = MethodStats(name)
+    return stats
+
+
+def snapshot() -> Snapshot:
+    """The stats of every instrumented method
+
+    Returns:
+        Snapshot: qualified method name -> its numbers
+    """
+    return {name: stats.snapshot() for name, stats in _registry.items()}
+
+
+def reset() -> None:
+    """Forgets everything recorded so far, the methods stay instrumented"""
+    # the wrappers hold on to their stats, so they're cleared in place
+    for stats in _registry.values():
+        stats.clear()
+
+
+def add_collector(collector: Collector) -> None:
+    """Registers a function that publish() pushes snapshots into,
+        eg to forward them to statsd or prometheus
+
+    Args:
+        collector (Collector): Takes a snapshot
+    """
+    _collectors.append(collector)
+
+
+def remove_collector(collector: Collector) -> None:
+    """Unregisters a collector
+
+    Args:
+        collector (Collector): A collector passed to add_collector
+    """
+    _collectors.remove(collector)
+
+
+def publish() -> Snapshot:
+    """Takes a snapshot and hands it to every collector. Call it
+        from whatever schedule suits you, nothing is pushed on its own.
+
+    Returns:
+        Snapshot: The snapshot that was published
+    """
+    current = snapshot()
+    for collector in list(_collectors):
+        collector(current)
+    return current
+
+
+def instrument_by_default() -> bool:
+    """Whether classes that don't say otherwise are instrumented,
+        taken from the CONCORDAT_INSTRUMENT environment variable
+
+    Returns:
+        bool: True when CONCORDAT_INSTRUMENT is set to 1, true, yes or on
+    """
+    return os.environ.get(INSTRUMENT_ENV, "").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+
+
+def _timed(check: Callable, stats: MethodStats, spent: List[int], *args: Any) -> Any:
+    # adds to `spent` whether the check passes or not, the caller records it
+    start = perf_counter_ns()
+    try:
+        return check(*args)
+    except Exception:
+        stats.violations += 1
+        raise
+    finally:
+        spent[0] += perf_counter_ns() - start
+
+
+def timed(check: Optional[Callable], stats: MethodStats) -> Optional[Callable]:
+    """Times a check that runs outside of the call itself, like the item
+        check of a stream, and adds it to the method's validation time
+
+    Args:
+        check (Optional[Callable]): The check
+        stats (MethodStats): The stats of the method
+
+    Returns:
+        Optional[Callable]: The timed check, None when there's no check
+    """
+    if check is None:
+        return None
+
+    def timing(*args: Any) -> None:
+        spent = [0]
+        try:
+            _timed(check, stats, spent, *args)
+        finally:
+            stats.record(spent[0])
+
+    return timing
+
+
+def instrumented(
+    fnc: Callable,
+    checks: Tuple[Optional[Callable], Optional[Callable], Optional[Callable]],
+    stats: MethodStats,
+) -> Callable:
+    """Builds the per call wrapper of an instrumented method
+
+    Args:
+        fnc (Callable): The function as written by the author
+        checks (Tuple[Optional[Callable], ...]): The argument check, the return
+            check and the stream, see ValidationBackend.build
+        stats (MethodStats): Where the numbers go
+
+    Returns:
+        Callable: The wrapper
+    """
+    check_args, check_return, stream = checks
+
+    def before(args: Tuple, kwargs: Dict, spent: List[int]) -> None:
+        if check_args is not None:
+            _timed(check_args, stats, spent, args, kwargs)
+
+    def after(result: Any, spent: List[int]) -> Any:
+        if check_return is not None:
+            _timed(check_return, stats, spent, result)
+        if stream is not None:
+            result = _timed(stream, stats, spent, result)
+        return result
+
+    if iscoroutinefunction(fnc):
+
+        @wraps(fnc)
+        async def awaiting(*args, **kwargs) -> Any:  # type: ignore
+            # skipped calls count too, they just don't spend anything
+            stats.calls += 1
+            rate = override()
+            if rate is not None and random() >= rate:
+                return await fnc(*args, **kwargs)
+            spent = [0]
+            try:
+                before(args, kwargs, spent)
+                return after(await fnc(*args, **kwargs), spent)
+            finally:
+                stats.record(spent[0])
+
+        return awaiting
+
+    @wraps(fnc)
+    def checked(*args, **kwargs) -> Any:  # type: ignore
+        stats.calls += 1
+        rate = override()
+        if rate is not None and random() >= rate:
+            return fnc(*args, **kwargs)
+        spent = [0]
+        try:
+            before(args, kwargs, spent)
+            return after(fnc(*args, **kwargs), spent)
+        finally:
+            stats.record(spent[0])
+
+    return checked
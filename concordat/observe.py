@@ -0,0 +1,312 @@
+"""
+Observe mode. Methods of a class with `enforcement="observe"` are checked as
+usual, but a violation is written down instead of raised, so a new interface
+can run against live traffic before it's enforced. Violations go into a
+bounded ring buffer: appending never takes a lock, the oldest entries fall
+off once it's full and every violation site only gets a few entries per
+interval, so a bad deploy can't turn this into the bottleneck. Something
+else, eg a background thread, drains the buffer and ships the entries off.
+
+    from concordat import observe
+
+    stop = observe.drain_in_background(lambda found: log.warning("%s", found))
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from concordat.checkers import short_repr
+
+ARGUMENTS = "arguments"
+RETURN = "return"
+ITEM = "item"
+DEFAULT_CAPACITY = 1024
+DEFAULT_PER_SITE = 10
+DEFAULT_INTERVAL = 60.0
+
+
+class Violation(NamedTuple):
+    """A check that failed while observing
+
+    Args:
+        method (str): Qualified name of the method
+        where (str): "arguments", "return" or "item" for streamed items
+        types (str): The type names of the arguments, or of the value
+        value (str): A truncated repr of the arguments or the value
+        error (str): A truncated message of what the check raised
+        suppressed (int): Violations of the same site dropped by the rate
+                          limit since the previous entry
+        timestamp (float): time.time() of the violation
+    """
+
+    method: str
+    where: str
+    types: str
+    value: str
+    error: str
+    suppressed: int
+    timestamp: float
+
+
+class ViolationBuffer:
+    """A bounded ring buffer of violations, rate limited per site. A site is
+        a method, the part that failed and the types involved.
+
+    Args:
+        capacity (int, optional): How many violations to hold, the oldest are
+                                  dropped first. Defaults to DEFAULT_CAPACITY.
+        per_site (int, optional): How many violations a site gets per interval.
+                                  Defaults to DEFAULT_PER_SITE.
+        interval (float, optional): Seconds of a rate limit window.
+                                    Defaults to DEFAULT_INTERVAL.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        per_site: int = DEFAULT_PER_SITE,
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        if capacity < 1 or per_site < 1 or interval <= 0:
+            raise ValueError("Capacity, per_site and interval have to be positive")
+        self.entries: Deque[Violation] = deque(maxlen=capacity)
+        self.per_site = per_site
+        self.interval = interval
+        # site -> [window start, recorded in window, suppressed since last entry]
+        self.sites: Dict[Tuple[str, str, Any], List[Any]] = {}
+
+    def record(
+        self, method: str, where: str, types: str, value: str, error: BaseException
+    ) -> bool:
+        """Writes a violation down, unless its site is over the rate limit.
+            Never blocks: deque appends are atomic, and a race on the
+            counters of a site at worst lets an extra entry through.
+
+        Args:
+            method (str): Qualified name of the method
+            where (str): "arguments", "return" or "item"
+            types (str): The type names involved
+            value (str): A truncated repr of the values involved
+            error (BaseException): What the check raised
+
+        Returns:
+            bool: Whether it was written down
+        """
+        suppressed = self.admit(method, where, types)
+        if suppressed is None:
+            return False
+        self.append(method, where, types, value, error=error, suppressed=suppressed)
+        return True
+
+    def admit(self, method: str, where: str, types: Any) -> Optional[int]:
+        """Counts a violation against the rate limit of its site, before
+            anything is spent on describing it
+
+        Args:
+            method (str): Qualified name of the method
+            where (str): "arguments", "return" or "item"
+            types (Any): Anything hashable telling the types involved apart
+
+        Returns:
+            Optional[int]: None when the site is over its limit, otherwise how
+                           many violations of the site were dropped since its last entry
+        """
+        now = time.monotonic()
+        site = (method, where, types)
+        window = self.sites.get(site)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window is not None else 0
+            window = self.sites[site] = [now, 0, suppressed]
+        if window[1] >= self.per_site:
+            window[2] += 1
+            return None
+        window[1] += 1
+        suppressed, window[2] = window[2], 0
+        return int(suppressed)
+
+    def append(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        where: str,
+        types: str,
+        value: str,
+        *,
+        error: BaseException,
+        suppressed: int,
+    ) -> None:
+        """Writes down a violation admit let through
+
+        Args:
+            method (str): Qualified name of the method
+            where (str): "arguments", "return" or "item"
+            types (str): The type names involved
+            value (str): A truncated repr of the values involved
+            error (BaseException): What the check raised
+            suppressed (int): What admit handed back
+        """
+        self.entries.append(
+            Violation(
+                method,
+                where,
+                types,
+                value,
+                short_repr(f"{type(error).__name__}: {error}"),
+                suppressed,
+                time.time(),
+            )
+        )
+
+    def drain(self, limit: Optional[int] = None) -> List[Violation]:
+        """Takes violations out of the buffer, oldest first. Safe to call
+            from another thread while methods keep recording.
+
+        Args:
+            limit (Optional[int], optional): Most violations to take, None for
+                                             all of them. Defaults to None.
+
+        Returns:
+            List[Violation]: The violations
+        """
+        drained: List[Violation] = []
+        while limit is None or len(drained) < limit:
+            try:
+                drained.append(self.entries.popleft())
+            except IndexError:
+                break
+        return drained
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return f"<ViolationBuffer {len(self)}/{self.entries.maxlen}>"
+
+
+_buffer: List[ViolationBuffer] = [ViolationBuffer()]
+
+
+def get_buffer() -> ViolationBuffer:
+    """The buffer observed methods write to
+
+    Returns:
+        ViolationBuffer: The buffer
+    """
+    return _buffer[0]
+
+
+def set_buffer(buffer: ViolationBuffer) -> None:
+    """Swaps the buffer observed methods write to, eg for a bigger one
+
+    Args:
+        buffer (ViolationBuffer): The new buffer
+    """
+    _buffer[0] = buffer
+
+
+def drain(limit: Optional[int] = None) -> List[Violation]:
+    """Takes violations out of the current buffer, see ViolationBuffer.drain
+
+    Args:
+        limit (Optional[int], optional): Most violations to take. Defaults to None.
+
+    Returns:
+        List[Violation]: The violations
+    """
+    return get_buffer().drain(limit)
+
+
+def drain_in_background(
+    sink: Callable[[List[Violation]], None], interval: float = 1.0
+) -> threading.Event:
+    """Starts a daemon thread handing whatever is in the buffer to `sink`
+        every `interval` seconds. A sink that raises doesn't stop the thread.
+
+    Args:
+        sink (Callable[[List[Violation]], None]): Gets every non empty batch
+        interval (float, optional): Seconds between drains. Defaults to 1.0.
+
+    Returns:
+        threading.Event: Set it to stop the thread, it drains one last time
+    """
+    stop = threading.Event()
+
+    def run() -> None:
+        while True:
+            stopping = stop.wait(interval)
+            found = drain()
+            if found:
+                try:
+                    sink(found)
+                except Exception:  # pylint: disable=broad-except
+                    pass
+            if stopping:
+                return
+
+    threading.Thread(target=run, name="concordat-observe", daemon=True).start()
+    return stop
+
+
+def _types(args: Tuple, kwargs: Dict) -> Tuple:
+    # tells sites apart as well as the names do, without building them
+    return tuple(map(type, args)) + tuple(
+        (key, type(value)) for key, value in kwargs.items()
+    )
+
+
+def _type_names(args: Tuple, kwargs: Dict) -> str:
+    names = [type(value).__name__ for value in args]
+    names.extend(f"{key}={type(value).__name__}" for key, value in kwargs.items())
+    return f"({', '.join(names)})"
+
+
+def observing(check: Callable, fnc: Callable, where: str) -> Callable:
+    """Turns a check that raises into one that records. The rate limit is
+        asked first, a violation is only described when it's written down.
+
+    Args:
+        check (Callable): An argument, return or item check
+        fnc (Callable): The function it belongs to
+        where (str): ARGUMENTS, RETURN or ITEM
+
+    Returns:
+        Callable: The check, recording into the current buffer instead of raising
+    """
+    method = fnc.__qualname__
+    if where == ARGUMENTS:
+
+        def observed_arguments(args: Tuple, kwargs: Dict) -> None:
+            try:
+                check(args, kwargs)
+            except Exception as error:  # pylint: disable=broad-except
+                buffer = get_buffer()
+                suppressed = buffer.admit(method, where, _types(args, kwargs))
+                if suppressed is not None:
+                    buffer.append(
+                        method,
+                        where,
+                        _type_names(args, kwargs),
+                        short_repr((args, kwargs)),
+                        error=error,
+                        suppressed=suppressed,
+                    )
+
+        return observed_arguments
+
+    def observed(value: Any) -> None:
+        try:
+            check(value)
+        except Exception as error:  # pylint: disable=broad-except
+            buffer = get_buffer()
+            suppressed = buffer.admit(method, where, type(value))
+            if suppressed is not None:
+                buffer.append(
+                    method,
+                    where,
+                    type(value).__name__,
+                    short_repr(value),
+                    error=error,
+                    suppressed=suppressed,
+                )
+
+    return observed
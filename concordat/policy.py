@@ -0,0 +1,373 @@
+"""
+Enforcement policies decide how much of the runtime checking a method pays for.
+InterfaceMeta consults the policy of a class when it wraps its methods.
+"""
+import os
+import re
+from functools import wraps
+from inspect import iscoroutinefunction
+from random import random
+from types import MethodType
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concordat.interface import ValidationBackend
+
+ENFORCEMENT = "__concordat_enforcement__"
+ENFORCEMENT_ENV = "CONCORDAT_ENFORCEMENT"
+DEFAULT_ENFORCEMENT = "full"
+RAW_FUNCTION = "__concordat_raw__"
+CHECKED = "__concordat_checked__"
+LAZY = "__concordat_lazy__"
+LAZY_ENV = "CONCORDAT_LAZY"
+
+_POLICY_PATTERN = re.compile(r"^\s*(\w+)\s*(?:[(:]\s*([^)\s]*)\s*\)?)?\s*$")
+
+
+class EnforcementPolicy:
+    """How often the checks built by a validation backend actually run.
+    Subclasses implement `install`.
+    """
+
+    name = ""
+
+    def install(
+        self, fnc: Callable, backend: "ValidationBackend", static: bool = False
+    ) -> Any:
+        """Builds the attribute that ends up on the class in place of `fnc`
+
+        Args:
+            fnc (Callable): The function as written by the author
+            backend (ValidationBackend): The backend that builds the checked function
+            static (bool, optional): Whether fnc came out of a staticmethod. Defaults to False.
+
+        Returns:
+            Any: The attribute to store on the class
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return self.name
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and repr(self) == repr(other)
+
+    def __hash__(self) -> int:
+        return hash(repr(self))
+
+
+def _static(fnc: Callable, static: bool) -> Any:
+    return staticmethod(fnc) if static else fnc
+
+
+def _mark_raw(wrapper: Callable, fnc: Callable, checked: Callable) -> Callable:
+    # the checked function it hands calls to, where concordat.prefork.warmup
+    # finds the deferred checks to build
+    setattr(wrapper, RAW_FUNCTION, fnc)
+    setattr(wrapper, CHECKED, checked)
+    return wrapper
+
+
+class Full(EnforcementPolicy):  # pylint: disable=too-few-public-methods
+    """Check every call. This is what concordat has always done"""
+
+    name = "full"
+
+    def install(
+        self, fnc: Callable, backend: "ValidationBackend", static: bool = False
+    ) -> Any:
+        return _static(backend.wrap(fnc), static)
+
+
+class Off(EnforcementPolicy):  # pylint: disable=too-few-public-methods
+    """Install the function untouched so there is no overhead at all.
+    Signature conformance is still checked when the class is created.
+    """
+
+    name = "off"
+
+    def install(
+        self, fnc: Callable, backend: "ValidationBackend", static: bool = False
+    ) -> Any:
+        return _static(fnc, static)
+
+
+class Observe(EnforcementPolicy):  # pylint: disable=too-few-public-methods
+    """Check every call, but record violations instead of raising them,
+    so new checks can run against live traffic. See concordat.observe.
+    """
+
+    name = "observe"
+
+    def install(
+        self, fnc: Callable, backend: "ValidationBackend", static: bool = False
+    ) -> Any:
+        return _static(backend.configure(observe=True).wrap(fnc), static)
+
+
+class Sampled(EnforcementPolicy):
+    """Check a random fraction of the calls
+
+    Args:
+        rate (float): The fraction of calls to check, between 0 and 1
+    """
+
+    name = "sampled"
+
+    def __init__(self, rate: float) -> None:
+        rate = float(rate)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {rate}")
+        self.rate = rate
+
+    def __repr__(self) -> str:
+        return f"{self.name}({self.rate})"
+
+    def install(
+        self, fnc: Callable, backend: "ValidationBackend", static: bool = False
+    ) -> Any:
+        checked = backend.wrap(fnc)
+        if checked is fnc:
+            return _static(fnc, static)
+        rate = self.rate
+        if iscoroutinefunction(fnc):
+
+            @wraps(fnc)
+            async def awaiting(*args, **kwargs) -> Any:  # type: ignore
+                if random() < rate:
+                    return await checked(*args, **kwargs)
+                return await fnc(*args, **kwargs)
+
+            return _static(_mark_raw(awaiting, fnc, checked), static)
+
+        @wraps(fnc)
+        def sampling(*args, **kwargs) -> Any:  # type: ignore
+            if random() < rate:
+                return checked(*args, **kwargs)
+            return fnc(*args, **kwargs)
+
+        return _static(_mark_raw(sampling, fnc, checked), static)
+
+
+class Warmup(EnforcementPolicy):
+    """Check the first `calls` calls of every method, then put the
+        raw function on the class so later calls don't pay anything.
+
+    Args:
+        calls (int): How many calls to check per method
+    """
+
+    name = "warmup"
+
+    def __init__(self, calls: int) -> None:
+        calls = int(calls)
+        if calls < 0:
+            raise ValueError(f"Warmup needs a positive number of calls, got {calls}")
+        self.calls = calls
+
+    def __repr__(self) -> str:
+        return f"{self.name}({self.calls})"
+
+    def install(
+        self, fnc: Callable, backend: "ValidationBackend", static: bool = False
+    ) -> Any:
+        checked = backend.wrap(fnc)
+        if checked is fnc:
+            return _static(fnc, static)
+        return _WarmingMethod(fnc, checked, self.calls, static)
+
+
+class _WarmingMethod:
+    """Descriptor that checks calls until its budget runs out and
+    then replaces itself on the owning class with the raw function
+    """
+
+    __slots__ = ("function", "raw", "static", "owner", "name")
+
+    def __init__(
+        self, fnc: Callable, checked: Callable, calls: int, static: bool
+    ) -> None:
+        self.raw = fnc
+        self.static = static
+        self.owner: Optional[type] = None
+        self.name: Optional[str] = None
+        remaining = [calls]
+
+        @wraps(fnc)
+        def warming(*args, **kwargs) -> Any:  # type: ignore
+            if remaining[0] > 0:
+                remaining[0] -= 1
+                return checked(*args, **kwargs)
+            self.swap()
+            return fnc(*args, **kwargs)
+
+        if iscoroutinefunction(fnc):
+
+            @wraps(fnc)
+            async def awaiting(*args, **kwargs) -> Any:  # type: ignore
+                return await warming(*args, **kwargs)
+
+            self.function = _mark_raw(awaiting, fnc, checked)
+        else:
+            self.function = _mark_raw(warming, fnc, checked)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None or self.static:
+            return self.function
+        return MethodType(self.function, instance)
+
+    def swap(self) -> None:
+        """Puts the raw function on the class, unless someone
+        replaced us in the meantime
+        """
+        owner, name = self.owner, self.name
+        if owner is not None and name is not None and owner.__dict__.get(name) is self:
+            setattr(owner, name, _static(self.raw, self.static))
+
+
+class LazyMethod:
+    """Descriptor that holds off on building the checked method until the
+        first time it's looked up, then replaces itself on the owning class
+        with whatever the enforcement policy installs. Keeps import time
+        proportional to the methods a process actually uses.
+
+    Args:
+        fnc (Callable): The function as written by the author
+        policy (EnforcementPolicy): The policy that installs the checked method
+        backend (ValidationBackend): The backend that builds the checks
+        static (bool, optional): Whether fnc came out of a staticmethod. Defaults to False.
+    """
+
+    __slots__ = ("raw", "policy", "backend", "static", "owner", "name")
+
+    def __init__(
+        self,
+        fnc: Callable,
+        policy: EnforcementPolicy,
+        backend: "ValidationBackend",
+        static: bool = False,
+    ) -> None:
+        self.raw = fnc
+        self.policy = policy
+        self.backend = backend
+        self.static = static
+        self.owner: Optional[type] = None
+        self.name: Optional[str] = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+
+    def build(self) -> Any:
+        """Installs the checked method on the owning class
+
+        Returns:
+            Any: The attribute that replaced us
+        """
+        attribute = self.policy.install(self.raw, self.backend, self.static)
+        owner, name = self.owner, self.name
+        if owner is not None and name is not None:
+            current = owner.__dict__.get(name)
+            if current is not self:
+                # somebody beat us to it, another thread most likely
+                return current
+            if hasattr(attribute, "__set_name__"):
+                attribute.__set_name__(owner, name)
+            setattr(owner, name, attribute)
+        return attribute
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        return self.build().__get__(instance, owner)
+
+
+def raw_function(attribute: Any) -> Any:
+    """Digs the function the author wrote out of whatever concordat
+        installed on the class, without building anything lazy
+
+    Args:
+        attribute (Any): A class attribute, eg from inspect.getattr_static
+
+    Returns:
+        Any: The raw function, or the attribute itself when it isn't one of ours
+    """
+    if isinstance(attribute, (staticmethod, classmethod)):
+        attribute = attribute.__func__
+    if isinstance(attribute, (LazyMethod, _WarmingMethod)):
+        return attribute.raw
+    return getattr(attribute, RAW_FUNCTION, attribute)
+
+
+POLICIES = {
+    "full": Full,
+    "off": Off,
+    "observe": Observe,
+    "sampled": Sampled,
+    "warmup": Warmup,
+}
+_default_policy: List[EnforcementPolicy] = []
+
+
+def get_policy(policy: Union[str, EnforcementPolicy, None] = None) -> EnforcementPolicy:
+    """Builds an enforcement policy from its name, eg `full`, `off`,
+        `warmup(1000)` or `sampled(0.01)`. Without a name we hand back the
+        global default, which comes from the CONCORDAT_ENFORCEMENT environment
+        variable unless set_default_policy was called.
+
+    Args:
+        policy (Union[str, EnforcementPolicy, None], optional): A policy or its name.
+                                                                Defaults to None.
+
+    Raises:
+        ValueError: We can't make sense of the policy
+
+    Returns:
+        EnforcementPolicy: The policy
+    """
+    if isinstance(policy, EnforcementPolicy):
+        return policy
+    if policy is None:
+        if not _default_policy:
+            _default_policy.append(
+                get_policy(os.environ.get(ENFORCEMENT_ENV, DEFAULT_ENFORCEMENT))
+            )
+        return _default_policy[0]
+    match = _POLICY_PATTERN.match(policy)
+    if not match or match.group(1).lower() not in POLICIES:
+        raise ValueError(
+            f"Unknown enforcement policy `{policy}`, pick one of "
+            + "full, off, observe, warmup(n) or sampled(rate)"
+        )
+    policy_class = POLICIES[match.group(1).lower()]
+    argument = match.group(2)
+    try:
+        if policy_class in (Full, Off, Observe):
+            if argument:
+                raise TypeError(f"{policy_class.name} doesn't take an argument")
+            return policy_class()
+        return policy_class(argument)  # type: ignore
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Bad enforcement policy `{policy}`: {error}") from None
+
+
+def set_default_policy(policy: Union[str, EnforcementPolicy]) -> None:
+    """Sets the policy used by every class that doesn't pick its own.
+        Only affects classes created after the call.
+
+    Args:
+        policy (Union[str, EnforcementPolicy]): A policy or its name
+    """
+    _default_policy[:] = [get_policy(policy)]
+
+
+def lazy_by_default() -> bool:
+    """Whether classes that don't say otherwise wrap their methods lazily,
+        taken from the CONCORDAT_LAZY environment variable
+
+    Returns:
+        bool: True when CONCORDAT_LAZY is set to 1, true, yes or on
+    """
+    return os.environ.get(LAZY_ENV, "").strip().lower() in ("1", "true", "yes", "on")
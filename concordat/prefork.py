@@ -0,0 +1,156 @@
+"""
+Warming up before fork. Prefork servers and process pools get the most out
+of concordat when every wrapper and validator is built in the parent, the
+children then share those pages copy-on-write instead of each building
+their own on first call.
+"""
+import gc
+import importlib
+import pickle
+from inspect import getattr_static
+from types import ModuleType
+from typing import Any, Iterable, Iterator, List, Union
+
+from concordat.interface import (
+    ALL_METHODS,
+    METHOD_TABLE,
+    MRO_JUMP,
+    PREPARE,
+    RETURN_VALIDATOR,
+    InterfaceMeta,
+    resolve_hints,
+)
+from concordat.generics import lineage
+from concordat.policy import CHECKED, LazyMethod, raw_function
+
+Target = Union[str, ModuleType, type]
+
+
+def warmup(
+    targets: Union[Target, Iterable[Target]], freeze: bool = False
+) -> List[type]:
+    """Builds every wrapper and validator of the given classes right now.
+        Lazy methods are built, deferred checks compiled, forward references
+        resolved where they can be and the interface type hints cached.
+        Then every method is pickled to make sure it can still be sent to a
+        process pool.
+
+    Usage:
+
+        import concordat
+        import myapp.storage
+
+        concordat.warmup([myapp.storage, "myapp.handlers"], freeze=True)
+        # now fork
+
+    Args:
+        targets (Union[Target, Iterable[Target]]): Modules, module names or classes.
+            Every class built by InterfaceMeta that a module defines is warmed up.
+        freeze (bool, optional): Run gc.freeze() afterwards, so the garbage
+            collector of the children doesn't write to the shared pages. Only
+            collects on python 3.6, which has no gc.freeze. Defaults to False.
+
+    Raises:
+        pickle.PicklingError: A method can't be pickled by reference, which
+                              process pools need. Classes defined inside
+                              functions are skipped, they never could.
+
+    Returns:
+        List[type]: The classes that were warmed up
+    """
+    classes = _collect(targets)
+    for cls in classes:
+        _prepare(cls)
+    unpicklable = [
+        f"{cls.__module__}.{cls.__qualname__}.{name}"
+        for cls in classes
+        if "<locals>" not in cls.__qualname__
+        for name in _methods(cls)
+        if not _pickles(getattr(cls, name))
+    ]
+    if unpicklable:
+        raise pickle.PicklingError(
+            "These methods can't be pickled by reference: " + ", ".join(unpicklable)
+        )
+    if freeze:
+        gc.collect()
+        if hasattr(gc, "freeze"):
+            # python 3.7+, before that collecting is all we can do
+            gc.freeze()
+    return classes
+
+
+def _collect(targets: Union[Target, Iterable[Target]]) -> List[type]:
+    if isinstance(targets, (str, ModuleType, type)):
+        targets = [targets]
+    classes: List[type] = []
+    for target in targets:  # type: ignore
+        if isinstance(target, str):
+            target = importlib.import_module(target)
+        if isinstance(target, ModuleType):
+            found = [
+                value
+                for value in vars(target).values()
+                if isinstance(value, InterfaceMeta)
+                and value.__module__ == target.__name__
+            ]
+        elif isinstance(target, InterfaceMeta):
+            found = [target]
+        else:
+            raise TypeError(
+                f"Can only warm up modules and classes built by InterfaceMeta, got {target!r}"
+            )
+        classes.extend(cls for cls in found if cls not in classes)
+    return classes
+
+
+def _methods(cls: type) -> List[str]:
+    # the methods InterfaceMeta wrapped when it created the class
+    return list(cls.__dict__.get(ALL_METHODS, []))
+
+
+def _prepare(cls: type) -> None:
+    for name in _methods(cls):
+        attribute = getattr_static(cls, name)
+        if isinstance(attribute, LazyMethod):
+            attribute.build()
+        for fnc in _wrappers(getattr(cls, name)):
+            prepare = getattr(fnc, PREPARE, None)
+            validator = getattr(fnc, RETURN_VALIDATOR, None)
+            try:
+                if prepare is not None:
+                    prepare()
+                if validator is not None and not validator.resolved:
+                    validator.resolve()
+            except NameError:
+                # still can't be resolved, it'll have to happen on first call
+                pass
+    mro = lineage(cls)
+    if len(mro) <= MRO_JUMP:
+        return
+    try:
+        InterfaceMeta._get_interface_hints(  # pylint: disable=protected-access
+            mro[-MRO_JUMP]
+        )
+    except NameError:
+        pass
+    for name in cls.__dict__.get(METHOD_TABLE, {}):
+        try:
+            resolve_hints(raw_function(getattr_static(cls, name)))
+        except (NameError, TypeError):
+            pass
+
+
+def _wrappers(fnc: Any) -> Iterator[Any]:
+    # sampling, warming and memoizing wrappers hand calls on to the checked
+    # function, which is the one holding the deferred checks
+    while fnc is not None:
+        yield fnc
+        fnc = getattr(fnc, CHECKED, None)
+
+
+def _pickles(fnc: Any) -> bool:
+    try:
+        return pickle.loads(pickle.dumps(fnc)) is fnc
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
@@ -0,0 +1,406 @@
+"""
+Provenance of validated values. In a pipeline the return value of one
+checked method is often handed straight to the next one, eg
+
+    records = repo.load()         # -> List[Record], checked
+    transformer.apply(records)    # records: List[Record], checked again
+
+and a big container gets looked at in full on every hop. Classes created
+with `provenance=True` remember the containers they validated, by identity,
+and skip checking them again against the same hint or a wider one.
+
+What makes skipping safe, and what doesn't:
+
+- Only container hints are remembered, everything else is cheap to check.
+- A value is remembered by identity. Values that can be weakly referenced
+  are held weakly and forgotten when they're collected. Lists, dicts and the
+  like can't be, so they're held strongly, which also keeps their id from
+  being reused, until they fall out of the bounded cache or the generation
+  moves on.
+- The length of a container is written down with it. A container that grew
+  or shrank since is checked again.
+- Everything else about a mutable container is trusted: replacing an item
+  in place, or changing the objects inside it, goes unnoticed. Code that
+  mutates values between hops has to call `forget(value)`, or `advance()`
+  to move on to a new generation, which forgets everything, eg once per
+  request or batch.
+- A value counts as validated only when the check looked at all of it. The
+  beartype backend looks at one random element unless the container
+  strategy is `full`, the pydantic backend coerces containers rather than
+  checking them unless a strategy is set, and `sample(k)` or `shallow` never
+  look at all of it, so those still skip known values but never vouch for
+  new ones.
+- Observe mode doesn't vouch for anything either, its checks don't raise.
+
+    from concordat import provenance
+
+    class Repo(IRepo, provenance=True):
+        ...
+
+    provenance.advance()  # eg at the end of every request
+"""
+import os
+import threading
+from collections import OrderedDict
+from inspect import Parameter, Signature
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from weakref import ref
+
+from concordat.checkers import _is_union
+
+PROVENANCE = "__concordat_provenance__"
+PROVENANCE_ENV = "CONCORDAT_PROVENANCE"
+DEFAULT_MAXSIZE = 256
+
+_MISSING = object()
+_covering: Dict[Tuple[Any, Any], bool] = {}
+
+
+def provenance_by_default() -> bool:
+    """Whether classes that don't say otherwise remember what they validated,
+        taken from the CONCORDAT_PROVENANCE environment variable
+
+    Returns:
+        bool: True when CONCORDAT_PROVENANCE is set to 1, true, yes or on
+    """
+    return os.environ.get(PROVENANCE_ENV, "").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+
+
+def _arguments(hint: Any) -> Tuple:
+    return getattr(hint, "__args__", None) or ()
+
+
+def _covers(validated: Any, wanted: Any) -> bool:
+    validated_origin = getattr(validated, "__origin__", None)
+    wanted_origin = getattr(wanted, "__origin__", None)
+    if _is_union(wanted, wanted_origin):
+        return any(covers(validated, arg) for arg in _arguments(wanted))
+    if _is_union(validated, validated_origin):
+        return all(covers(arg, wanted) for arg in _arguments(validated))
+    origin = validated if validated_origin is None else validated_origin
+    if wanted_origin is None:
+        # a plain class only asks for the outer type
+        return (
+            isinstance(origin, type)
+            and isinstance(wanted, type)
+            and issubclass(origin, wanted)
+        )
+    if not (
+        isinstance(origin, type)
+        and isinstance(wanted_origin, type)
+        and issubclass(origin, wanted_origin)
+    ):
+        return False
+    validated_args, wanted_args = _arguments(validated), _arguments(wanted)
+    if not wanted_args:
+        return True
+    if wanted_origin is tuple and wanted_args[-1] is Ellipsis:
+        if validated_args[-1:] == (Ellipsis,):
+            return covers(validated_args[0], wanted_args[0])
+        return all(covers(arg, wanted_args[0]) for arg in validated_args)
+    if len(validated_args) != len(wanted_args) or Ellipsis in validated_args:
+        return False
+    return all(covers(arg, want) for arg, want in zip(validated_args, wanted_args))
+
+
+def covers(validated: Any, wanted: Any) -> bool:
+    """Whether a value that passed a check against one hint is sure to
+        pass a check against another, the same hint or a wider one:
+        List[bool] covers Sequence[int], Optional[List[int]] and List[Any].
+        Anything this can't work out is answered with False.
+
+    Args:
+        validated (Any): The hint the value was checked against
+        wanted (Any): The hint it's about to be checked against
+
+    Returns:
+        bool: True when the second check can be skipped
+    """
+    if validated == wanted or wanted is Any or wanted is object:
+        return True
+    key = (validated, wanted)
+    try:
+        return _covering[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable hints, nothing to remember it by
+        return _covers(validated, wanted)
+    answer = _covering[key] = _covers(validated, wanted)
+    return answer
+
+
+def _size(value: Any) -> int:
+    try:
+        return len(value)
+    except TypeError:
+        return -1
+
+
+class Provenance:
+    """The values validated lately, the hints they were validated against
+        and the generation that vouches for them
+
+    Args:
+        maxsize (int, optional): How many values to remember, the ones
+                                 remembered first are forgotten first.
+                                 Defaults to DEFAULT_MAXSIZE.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise ValueError(
+                f"A provenance cache needs room for a value, got {maxsize}"
+            )
+        self.maxsize = maxsize
+        self.generation = 0
+        self.hits = 0
+        # id -> [weak reference or the value itself, weak, generation, size, hints]
+        self.entries: "OrderedDict[int, List[Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def validated(self, value: Any, hint: Any) -> bool:
+        """Whether a value was validated against the hint, or a narrower one,
+            and hasn't changed size since. Never takes a lock.
+
+        Args:
+            value (Any): The value about to be checked
+            hint (Any): The hint it's about to be checked against
+
+        Returns:
+            bool: True when the check can be skipped
+        """
+        entry = self.entries.get(id(value))
+        if entry is None:
+            return False
+        holder, weak, generation, size, hints = entry
+        if (
+            (holder() if weak else holder) is not value
+            or generation != self.generation
+            or size != _size(value)
+        ):
+            return False
+        if hint in hints or any(covers(known, hint) for known in hints):
+            self.hits += 1
+            return True
+        return False
+
+    def record(self, value: Any, hint: Any) -> None:
+        """Remembers that a value passed a full check against a hint
+
+        Args:
+            value (Any): The value
+            hint (Any): The hint it passed
+        """
+        if value is None:
+            return
+        key = id(value)
+        with self.lock:
+            entry = self.entries.get(key)
+            if (
+                entry is not None
+                and (entry[0]() if entry[1] else entry[0]) is value
+                and entry[2] == self.generation
+                and entry[3] == _size(value)
+            ):
+                entry[4].add(hint)
+                return
+            hints: Set[Any] = {hint}
+            try:
+                holder = ref(value, self._forgetter(key))
+                self.entries[key] = [holder, True, self.generation, _size(value), hints]
+            except TypeError:
+                self.entries[key] = [value, False, self.generation, _size(value), hints]
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def _forgetter(self, key: int) -> Callable[[Any], None]:
+        entries = self.entries
+
+        def forget(reference: Any) -> None:
+            # no lock, this can run in the middle of `record` when
+            # allocating triggers the garbage collector
+            entry = entries.get(key)
+            if entry is not None and entry[0] is reference:
+                entries.pop(key, None)
+
+        return forget
+
+    def forget(self, value: Any) -> bool:
+        """Forgets a value, eg after mutating it in place
+
+        Args:
+            value (Any): The value
+
+        Returns:
+            bool: Whether it was remembered
+        """
+        with self.lock:
+            entry = self.entries.get(id(value))
+            if entry is None or (entry[0]() if entry[1] else entry[0]) is not value:
+                return False
+            del self.entries[id(value)]
+            return True
+
+    def advance(self) -> int:
+        """Moves on to a new generation, nothing validated so far is trusted
+            anymore and the values held strongly are let go
+
+        Returns:
+            int: The new generation
+        """
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            return self.generation
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"<Provenance {len(self)}/{self.maxsize} "
+            f"generation={self.generation} hits={self.hits}>"
+        )
+
+
+_provenance: List[Provenance] = [Provenance()]
+
+
+def get_provenance() -> Provenance:
+    """The cache classes with provenance=True remember values in
+
+    Returns:
+        Provenance: The cache
+    """
+    return _provenance[0]
+
+
+def set_provenance(provenance: Provenance) -> None:
+    """Swaps the cache classes with provenance=True remember values in
+
+    Args:
+        provenance (Provenance): The new cache
+    """
+    _provenance[0] = provenance
+
+
+def forget(value: Any) -> bool:
+    """Forgets a value in the current cache, see Provenance.forget
+
+    Args:
+        value (Any): The value
+
+    Returns:
+        bool: Whether it was remembered
+    """
+    return get_provenance().forget(value)
+
+
+def advance() -> int:
+    """Moves the current cache on to a new generation, see Provenance.advance
+
+    Returns:
+        int: The new generation
+    """
+    return get_provenance().advance()
+
+
+def _locate(
+    sig: Signature, tracked: Dict[str, Any]
+) -> List[Tuple[Optional[int], Optional[str], Any]]:
+    located: List[Tuple[Optional[int], Optional[str], Any]] = []
+    for index, parameter in enumerate(sig.parameters.values()):
+        if parameter.name not in tracked:
+            continue
+        if parameter.kind is Parameter.POSITIONAL_ONLY:
+            located.append((index, None, tracked[parameter.name]))
+        elif parameter.kind is Parameter.POSITIONAL_OR_KEYWORD:
+            located.append((index, parameter.name, tracked[parameter.name]))
+        elif parameter.kind is Parameter.KEYWORD_ONLY:
+            located.append((None, parameter.name, tracked[parameter.name]))
+        else:
+            # *args and **kwargs aren't a value of their own, never known
+            located.append((None, None, tracked[parameter.name]))
+    return located
+
+
+def remembering(  # pylint: disable=too-many-arguments
+    sig: Signature,
+    tracked: Dict[str, Any],
+    check_args: Callable,
+    check_rest: Optional[Callable],
+    vouch: bool,
+) -> Callable:
+    """Turns an argument check into one that skips it when every tracked
+        argument is known to be valid, and only checks the rest then. A
+        tracked argument that wasn't passed, or is gathered by *args or
+        **kwargs, is never known and has every argument checked.
+
+    Args:
+        sig (Signature): The signature of the function
+        tracked (Dict[str, Any]): The container hints of the parameters
+        check_args (Callable): The check of every argument
+        check_rest (Optional[Callable]): The check of the untracked arguments
+        vouch (bool): Whether check_args looks at all of a container, so the
+                      values it passed can be remembered
+
+    Returns:
+        Callable: The argument check
+    """
+    located = _locate(sig, tracked)
+
+    def check(args: Tuple, kwargs: Dict) -> None:
+        provenance = get_provenance()
+        values = []
+        known = True
+        for index, name, hint in located:
+            if index is not None and index < len(args):
+                value = args[index]
+            else:
+                value = kwargs.get(name, _MISSING) if name is not None else _MISSING
+            values.append((value, hint))
+            known = (
+                known and value is not _MISSING and provenance.validated(value, hint)
+            )
+        if known:
+            if check_rest is not None:
+                check_rest(args, kwargs)
+            return
+        check_args(args, kwargs)
+        if vouch:
+            for value, hint in values:
+                if value is not _MISSING:
+                    provenance.record(value, hint)
+
+    return check
+
+
+def remembering_return(check_return: Callable, hint: Any, vouch: bool) -> Callable:
+    """Turns a return check into one that skips values known to be valid
+        and remembers the ones it passed
+
+    Args:
+        check_return (Callable): The return check
+        hint (Any): The return hint
+        vouch (bool): Whether check_return looks at all of a container
+
+    Returns:
+        Callable: The return check
+    """
+
+    def check(value: Any) -> None:
+        provenance = get_provenance()
+        if provenance.validated(value, hint):
+            return
+        check_return(value)
+        if vouch:
+            provenance.record(value, hint)
+
+    return check
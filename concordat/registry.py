@@ -0,0 +1,228 @@
+"""
+A registry of interface implementations. InterfaceMeta records every
+implementation it creates, and implementations that live in modules nobody
+imported yet can be declared by dotted path, by hand or through entry points.
+Listing what's there never imports anything, `get` imports the one module
+it needs the first time an implementation is asked for, without holding the
+registry lock while it does.
+
+    from concordat.registry import registry
+
+    registry.declare(IStorage, "s3", "myapp.storage.s3:S3Storage")
+    registry.names(IStorage)  # ["s3"], nothing imported
+    registry.get(IStorage, "s3")  # imports myapp.storage.s3
+"""
+import importlib
+import threading
+from typing import Any, Dict, List, Union
+from weakref import WeakValueDictionary
+
+from concordat.generics import lineage
+
+Interface = Union[type, str]
+
+
+def type_path(cls: type) -> str:
+    """The dotted path of a class, the way it's declared: module:QualifiedName
+
+    Args:
+        cls (type): The class
+
+    Returns:
+        str: The path
+    """
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def normalize_path(path: str) -> str:
+    """Accepts both module:QualifiedName and module.Name
+
+    Args:
+        path (str): A dotted path
+
+    Raises:
+        ValueError: The path has no module part
+
+    Returns:
+        str: The path as module:QualifiedName
+    """
+    if ":" not in path:
+        module, _, name = path.rpartition(".")
+        path = f"{module}:{name}"
+    module, _, name = path.partition(":")
+    if not module or not name:
+        raise ValueError(f"Expected a path like `package.module:Class`, got {path!r}")
+    return path
+
+
+def _key(interface: Interface) -> str:
+    if isinstance(interface, str):
+        return normalize_path(interface)
+    return type_path(interface)
+
+
+def _import(path: str) -> Any:
+    module, _, name = path.partition(":")
+    found: Any = importlib.import_module(module)
+    for attribute in name.split("."):
+        try:
+            found = getattr(found, attribute)
+        except AttributeError:
+            raise ImportError(f"{module} has no {name}, declared as {path}") from None
+    return found
+
+
+def _implements(cls: Any, interface: str) -> bool:
+    # the interface is the root of the hierarchy, right before object
+    if not isinstance(cls, type):
+        return False
+    mro = lineage(cls)
+    return len(mro) > 2 and type_path(mro[-2]) == interface
+
+
+class Registry:
+    """Implementations by interface, both the ones created so far and the ones
+    declared by path. Interfaces can be given as classes or dotted paths, so
+    declaring doesn't need the interface imported either.
+    """
+
+    def __init__(self) -> None:
+        self.declared: Dict[str, Dict[str, str]] = {}
+        self.created: Dict[str, "WeakValueDictionary[str, type]"] = {}
+        self.loaded: Dict[str, Dict[str, type]] = {}
+        self.lock = threading.RLock()
+
+    def record(self, interface: type, cls: type) -> None:
+        """Remembers an implementation, InterfaceMeta calls this for every
+            class that conformed. Only a weak reference is kept, so classes
+            built on the fly can still be collected.
+
+        Args:
+            interface (type): The interface
+            cls (type): The implementation
+        """
+        with self.lock:
+            created = self.created.setdefault(_key(interface), WeakValueDictionary())
+            created[type_path(cls)] = cls
+
+    def declare(self, interface: Interface, name: str, path: str) -> None:
+        """Declares an implementation without importing it
+
+        Args:
+            interface (Interface): The interface, or its dotted path
+            name (str): What the implementation is asked for by, eg "s3"
+            path (str): Where it lives, eg "myapp.storage.s3:S3Storage"
+
+        Raises:
+            ValueError: The name is already declared with another path
+        """
+        path = normalize_path(path)
+        with self.lock:
+            declared = self.declared.setdefault(_key(interface), {})
+            if declared.get(name, path) != path:
+                raise ValueError(
+                    f"{name!r} is already declared as {declared[name]}, not {path}"
+                )
+            declared[name] = path
+
+    def declare_entry_points(self, interface: Interface, group: str) -> List[str]:
+        """Declares the implementations packages advertise as entry points,
+            reading the package metadata only, eg in pyproject.toml
+
+                [project.entry-points."myapp.storage"]
+                s3 = "myapp_s3.storage:S3Storage"
+
+        Args:
+            interface (Interface): The interface, or its dotted path
+            group (str): The entry point group
+
+        Returns:
+            List[str]: The names that were declared
+        """
+        try:
+            from importlib.metadata import (  # pylint: disable=import-outside-toplevel
+                entry_points,
+            )
+        except ImportError:  # pragma: no cover
+            # python < 3.8
+            from importlib_metadata import (  # type: ignore # pylint: disable=import-outside-toplevel
+                entry_points,
+            )
+        found: Any = entry_points()
+        if hasattr(found, "select"):
+            selected = found.select(group=group)
+        else:  # pragma: no cover
+            selected = found.get(group, [])
+        names = []
+        for entry_point in selected:
+            self.declare(interface, entry_point.name, entry_point.value)
+            names.append(entry_point.name)
+        return names
+
+    def names(self, interface: Interface) -> List[str]:
+        """Every implementation that can be asked for, without importing any.
+            Declared ones by name, the others by path.
+
+        Args:
+            interface (Interface): The interface, or its dotted path
+
+        Returns:
+            List[str]: The names, sorted
+        """
+        key = _key(interface)
+        with self.lock:
+            declared = self.declared.get(key, {})
+            paths = set(declared.values())
+            created = [path for path in self.created.get(key, {}) if path not in paths]
+            return sorted(list(declared) + created)
+
+    def get(self, interface: Interface, name: str) -> type:
+        """An implementation, imported the first time it's asked for
+
+        Args:
+            interface (Interface): The interface, or its dotted path
+            name (str): A declared name, or the module:QualifiedName path
+                        of an implementation that was created
+
+        Raises:
+            LookupError: Nothing by that name
+            ImportError: The declared path can't be imported
+            TypeError: The declared path isn't an implementation of the interface
+
+        Returns:
+            type: The implementation
+        """
+        key = _key(interface)
+        loaded = self.loaded.get(key)
+        if loaded is not None and name in loaded:
+            return loaded[name]
+        with self.lock:
+            created = self.created.get(key, WeakValueDictionary())
+            path = self.declared.get(key, {}).get(name)
+            if path is None:
+                if ":" not in name or name not in created:
+                    raise LookupError(
+                        f"No implementation {name!r} of {key}, "
+                        f"pick one of {self.names(interface)}"
+                    )
+                path = name
+            cls = created.get(path)
+        if cls is None:
+            # outside the lock: the module may record or look up other
+            # implementations, from this thread or one it waits for
+            cls = _import(path)
+            if not _implements(cls, key):
+                raise TypeError(f"{path} isn't an implementation of {key}")
+        with self.lock:
+            # another thread may have got there first, keep what it loaded
+            return self.loaded.setdefault(key, {}).setdefault(name, cls)
+
+    def __repr__(self) -> str:
+        with self.lock:
+            counts = {
+                key: len(self.names(key)) for key in {*self.declared, *self.created}
+            }
+        return f"<Registry {counts}>"
+
+
+registry = Registry()
@@ -0,0 +1,103 @@
+"""
+Scoped enforcement. The policy of a class applies everywhere its methods are
+called. A few proven hot inner loops can turn checking down for as long as
+they run, without touching the rest of the process:
+
+    import concordat
+
+    with concordat.enforcement("off"):
+        for row in rows:
+            transformer.apply(row)  # not checked
+
+    with concordat.enforcement("sampled(0.01)"):
+        ...  # one call in a hundred is checked
+
+The override lives in a context variable, so it follows asyncio tasks and
+threads: a task started inside the block inherits it, other tasks and
+threads never see it. Overrides only ever turn checking down, `full` hands
+the decision back to the class, eg inside an outer `off` block. Methods of
+classes with enforcement="off" have no checks to turn back on.
+
+Every checked wrapper pays for a single context variable lookup per call
+to find out whether it's in such a block. `make bench` tracks what that
+costs in its `scoped` suite.
+"""
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Union
+
+from concordat.policy import EnforcementPolicy, Full, Off, Sampled, get_policy
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover
+    # python 3.6 without the backport, scoped per thread only
+    import threading
+
+    class ContextVar:  # type: ignore # pylint: disable=too-few-public-methods
+        """Just enough of contextvars.ContextVar on top of a thread local"""
+
+        def __init__(self, name: str, default: Any = None) -> None:
+            self.name = name
+            self.default = default
+            self.local = threading.local()
+
+        def get(self) -> Any:
+            """The value in the current thread"""
+            return getattr(self.local, "value", self.default)
+
+        def set(self, value: Any) -> Any:
+            """Sets the value in the current thread, hands back what reset needs"""
+            previous = self.get()
+            self.local.value = value
+            return previous
+
+        def reset(self, token: Any) -> None:
+            """Goes back to the value before set"""
+            self.local.value = token
+
+
+# the fraction of calls to check, None when nothing is overridden
+_override: "ContextVar[Optional[float]]" = ContextVar(
+    "concordat_enforcement", default=None
+)
+override: Callable[[], Optional[float]] = _override.get
+"""The fraction of calls checked in the current context, None without an
+override. This is the lookup every checked wrapper does, bound once so it's
+a single call.
+"""
+
+
+def _rate(policy: EnforcementPolicy) -> Optional[float]:
+    if isinstance(policy, Off):
+        return 0.0
+    if isinstance(policy, Sampled):
+        return policy.rate
+    if isinstance(policy, Full):
+        return None
+    raise ValueError(
+        f"Enforcement can only be scoped to off, sampled(rate) or full, got `{policy}`"
+    )
+
+
+@contextmanager
+def enforcement(policy: Union[str, EnforcementPolicy]) -> Iterator[None]:
+    """Turns checking down for the calls made in the block, and in the tasks
+        it starts. Blocks nest, the innermost one wins.
+
+    Usage:
+
+        with concordat.enforcement("off"):
+            hot_loop()
+
+    Args:
+        policy (Union[str, EnforcementPolicy]): `off`, `sampled(rate)`, `sampled`
+            for the default rate, or `full` to leave it to the classes again
+
+    Raises:
+        ValueError: Any other policy, observe and warmup can't be scoped
+    """
+    token = _override.set(_rate(get_policy(policy)))
+    try:
+        yield
+    finally:
+        _override.reset(token)
@@ -0,0 +1,209 @@
+"""
+Slot backed, typed attributes. Classes created with `slots=True` get a
+`__slots__` entry for every attribute annotated in their body, so their
+instances carry no `__dict__`, and a `__setattr__` that checks the values
+assigned to them against their annotations.
+
+    class IRecord(metaclass=InterfaceMeta, slots=True):
+        id: int
+        name: str
+
+    class Record(IRecord):
+        tags: List[str]  # added to the slots IRecord already has
+
+Reading an attribute is a plain slot read, only writes are checked. The
+checks are compiled when the class is created, or on the first write when
+an annotation is a forward reference that can't be resolved yet.
+"""
+from random import random
+from typing import Any, Callable, Dict, Optional, Tuple, get_type_hints
+
+from concordat.checkers import (
+    FULL,
+    ContainerStrategy,
+    Predicate,
+    TypeHintViolation,
+    compile_hint,
+    short_repr,
+)
+from concordat.scoped import override
+
+SLOTS = "__concordat_slots__"
+SLOTTED = "__concordat_slotted__"
+PARENT_SETATTR = "__concordat_parent_setattr__"
+CLASS_VAR = "ClassVar"
+
+
+class AttributeViolation(TypeHintViolation):
+    """Raised when a value assigned to a typed slot doesn't match its annotation
+
+    Args:
+        qualname (str): The qualified name of the class
+        attribute (str): The attribute assigned to
+        value (Any): The value that failed the check
+        hint (Any): The type hint it was checked against
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, qualname: str, attribute: str, value: Any, hint: Any
+    ) -> None:
+        self.qualname = qualname
+        self.parameter = attribute
+        self.value = value
+        self.hint = hint
+        TypeError.__init__(  # pylint: disable=non-parent-init-called
+            self,
+            f"{qualname}.{attribute} = {short_repr(value)} violates type hint {hint!r}",
+        )
+
+
+def _is_class_var(hint: Any) -> bool:
+    text = hint if isinstance(hint, str) else repr(hint)
+    return text.split("[", 1)[0].rpartition(".")[2] == CLASS_VAR
+
+
+def _existing_slots(bases: Tuple) -> Dict[str, None]:
+    existing: Dict[str, None] = {}
+    for base in bases:
+        for klass in base.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            existing.update(
+                dict.fromkeys((slots,) if isinstance(slots, str) else slots)
+            )
+            existing.update(dict.fromkeys(klass.__dict__.get(SLOTTED, ())))
+    return existing
+
+
+def add_slots(bases: Tuple, namespace: Dict) -> Tuple[str, ...]:
+    """Adds `__slots__` to a class namespace for the attributes annotated in
+        it, leaving out the ones a base class has a slot for already.
+        Annotations with a value in the class body, and ClassVars, are class
+        attributes and don't get a slot. A `__slots__` written by hand is
+        left alone.
+
+    Args:
+        bases (Tuple): All inherited classes
+        namespace (Dict): All objects associated with this class
+
+    Returns:
+        Tuple[str, ...]: Every typed slot of the class, its own and inherited
+    """
+    existing = _existing_slots(bases)
+    own = [
+        name
+        for name, hint in namespace.get("__annotations__", {}).items()
+        if name not in namespace and not _is_class_var(hint)
+    ]
+    if "__slots__" not in namespace:
+        namespace["__slots__"] = tuple(name for name in own if name not in existing)
+    inherited = [
+        name for base in bases for name in getattr(base, SLOTTED, ()) if name not in own
+    ]
+    slotted = namespace[SLOTTED] = tuple(dict.fromkeys(inherited + own))
+    return slotted
+
+
+class SlotChecks:  # pylint: disable=too-few-public-methods
+    """The compiled checks of the typed slots of a class
+
+    Args:
+        owner (type): The class
+        names (Tuple[str, ...]): Its typed slots
+        strategy (Optional[ContainerStrategy]): How much of containers to check
+    """
+
+    __slots__ = ("owner", "names", "strategy", "checks")
+
+    def __init__(
+        self,
+        owner: type,
+        names: Tuple[str, ...],
+        strategy: Optional[ContainerStrategy],
+    ) -> None:
+        self.owner = owner
+        self.names = names
+        self.strategy = strategy or FULL
+        self.checks: Optional[Dict[str, Tuple[Predicate, Any]]] = None
+
+    def resolve(self) -> Dict[str, Tuple[Predicate, Any]]:
+        """Resolves the annotations and compiles them
+
+        Raises:
+            NameError: A forward reference can't be resolved yet
+
+        Returns:
+            Dict[str, Tuple[Predicate, Any]]: slot -> predicate and hint
+        """
+        hints = get_type_hints(self.owner)
+        checks = {}
+        for name in self.names:
+            predicate = compile_hint(hints[name], self.strategy)
+            if predicate is not None:
+                checks[name] = (predicate, hints[name])
+        self.checks = checks
+        return checks
+
+
+def typed_setattr(cls: type, strategy: Optional[ContainerStrategy]) -> Callable:
+    """Builds the `__setattr__` checking the typed slots of a class, the
+        checks are compiled right away unless a forward reference is in the way
+
+    Args:
+        cls (type): The class, created with add_slots
+        strategy (Optional[ContainerStrategy]): How much of containers to check
+
+    Returns:
+        Callable: The `__setattr__`
+    """
+    slot_checks = SlotChecks(cls, getattr(cls, SLOTTED), strategy)
+    try:
+        slot_checks.resolve()
+    except NameError:
+        pass
+    parent = next(
+        klass.__dict__["__setattr__"]
+        for klass in cls.__mro__[1:]
+        if "__setattr__" in klass.__dict__
+    )
+    # the checks of the parents are part of ours, no need to run them twice
+    parent = getattr(parent, PARENT_SETATTR, parent)
+    qualname = cls.__qualname__
+
+    def __setattr__(self: Any, name: str, value: Any) -> None:
+        rate = override()
+        if rate is not None and random() >= rate:
+            parent(self, name, value)
+            return
+        checks = slot_checks.checks
+        if checks is None:
+            checks = slot_checks.resolve()
+        found = checks.get(name)
+        if found is not None and not found[0](value):
+            raise AttributeViolation(qualname, name, value, found[1])
+        parent(self, name, value)
+
+    setattr(__setattr__, PARENT_SETATTR, parent)
+    __setattr__.__qualname__ = f"{qualname}.__setattr__"
+    return __setattr__
+
+
+def install_setattr(
+    cls: type, strategy: Optional[ContainerStrategy], check: bool
+) -> None:
+    """Gives a class created with add_slots its `__setattr__`, unless it
+        wrote its own. Without checks a `__setattr__` generated for a base
+        class is taken out of the way as well.
+
+    Args:
+        cls (type): The class
+        strategy (Optional[ContainerStrategy]): How much of containers to check
+        check (bool): Whether assignments are checked, False when enforcement is off
+    """
+    if "__setattr__" in cls.__dict__:
+        return
+    if check:
+        setattr(cls, "__setattr__", typed_setattr(cls, strategy))
+        return
+    inherited = getattr(cls, "__setattr__")
+    if hasattr(inherited, PARENT_SETATTR):
+        setattr(cls, "__setattr__", getattr(inherited, PARENT_SETATTR))
@@ -0,0 +1,250 @@
+"""
+Streaming return values. Methods that hand back an iterator or a generator,
+sync or async, get a thin proxy in its place that checks every item as it
+streams by, so nothing has to be materialised and memory stays constant.
+"""
+import collections.abc
+from inspect import isasyncgenfunction, isgeneratorfunction
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from concordat.checkers import TypeHintViolation
+
+STREAM = "__concordat_stream__"
+RETURN = "return"
+
+Stream = Callable[[Any], Any]
+
+# hints whose values are consumed once, so the items can only be checked on the way out
+ITERATORS = (collections.abc.Iterator, collections.abc.Generator)
+ASYNC_ITERATORS = (collections.abc.AsyncIterator, collections.abc.AsyncGenerator)
+ASYNC_ITERABLES = (collections.abc.AsyncIterable,) + ASYNC_ITERATORS
+
+
+def stream_item(fnc: Callable, hints: Dict[str, Any]) -> Optional[Any]:
+    """Works out whether a function streams its result, and the type of the items.
+        Generator functions always stream, other functions do when they're
+        annotated to return an Iterator or a Generator. An Iterable return
+        might just as well be a list, so that's left to the regular return check.
+        The same goes for async generators and their Async counterparts.
+        Coroutine functions stream the result they're awaited for.
+
+    Args:
+        fnc (Callable): The function as written by the author
+        hints (Dict[str, Any]): Its resolved type hints
+
+    Returns:
+        Optional[Any]: The item type hint, None when the function doesn't stream
+    """
+    if RETURN not in hints:
+        return None
+    hint = hints[RETURN]
+    origin = getattr(hint, "__origin__", None)
+    args = getattr(hint, "__args__", None) or ()
+    if isasyncgenfunction(fnc):
+        iterables: Tuple[type, ...] = ASYNC_ITERABLES
+    elif isgeneratorfunction(fnc):
+        iterables = (collections.abc.Iterable,)
+    else:
+        iterables = ()
+    iterators = ITERATORS + ASYNC_ITERATORS
+    if origin in iterators or (
+        isinstance(origin, type) and iterables and issubclass(origin, iterables)
+    ):
+        return args[0] if args else Any
+    if hint in iterators or (iterables and (hint is Any or hint in iterables)):
+        return Any
+    return None
+
+
+def _is_async(fnc: Callable, hint: Any) -> bool:
+    origin = getattr(hint, "__origin__", None) or hint
+    return isasyncgenfunction(fnc) or origin in ASYNC_ITERABLES
+
+
+class CheckedIterator:
+    """Hands out the items of an iterator, checking every `every`th one,
+        starting with the first
+
+    Args:
+        iterator (Iterator): The iterator the function returned
+        check (Callable[[Any], Any]): Raises when an item doesn't match its hint
+        every (int, optional): Check one item out of this many. Defaults to 1.
+    """
+
+    __slots__ = ("iterator", "check", "every", "count")
+
+    def __init__(
+        self, iterator: Any, check: Callable[[Any], Any], every: int = 1
+    ) -> None:
+        self.iterator = iterator
+        self.check = check
+        self.every = every
+        self.count = 0
+
+    def __iter__(self) -> "CheckedIterator":
+        return self
+
+    def __next__(self) -> Any:
+        item = next(self.iterator)
+        count = self.count
+        self.count = count + 1
+        if count % self.every == 0:
+            self.check(item)
+        return item
+
+    def __repr__(self) -> str:
+        return f"<checked {self.iterator!r}>"
+
+
+class CheckedAsyncIterator:
+    """The async flavour of CheckedIterator, the checks are plain
+    function calls so nothing ever blocks the event loop
+
+    Args:
+        iterator (AsyncIterator): The async iterator the function returned
+        check (Callable[[Any], Any]): Raises when an item doesn't match its hint
+        every (int, optional): Check one item out of this many. Defaults to 1.
+    """
+
+    __slots__ = ("iterator", "check", "every", "count")
+
+    def __init__(
+        self, iterator: Any, check: Callable[[Any], Any], every: int = 1
+    ) -> None:
+        self.iterator = iterator
+        self.check = check
+        self.every = every
+        self.count = 0
+
+    def __aiter__(self) -> "CheckedAsyncIterator":
+        return self
+
+    async def __anext__(self) -> Any:
+        item = await self.iterator.__anext__()
+        count = self.count
+        self.count = count + 1
+        if count % self.every == 0:
+            self.check(item)
+        return item
+
+    def __repr__(self) -> str:
+        return f"<checked {self.iterator!r}>"
+
+
+class CheckedAsyncGenerator(CheckedAsyncIterator):
+    """A CheckedAsyncIterator that also passes on asend, athrow and aclose"""
+
+    __slots__ = ()
+
+    async def asend(self, value: Any) -> Any:
+        """Sends a value into the generator and checks what it yields back"""
+        item = await self.iterator.asend(value)
+        count = self.count
+        self.count = count + 1
+        if count % self.every == 0:
+            self.check(item)
+        return item
+
+    async def athrow(self, *args: Any) -> Any:
+        """Raises an exception inside the generator"""
+        return await self.iterator.athrow(*args)
+
+    async def aclose(self) -> None:
+        """Stops the generator"""
+        await self.iterator.aclose()
+
+
+class CheckedGenerator(CheckedIterator):
+    """A CheckedIterator that also passes on send, throw and close,
+    so coroutine style generators keep working
+    """
+
+    __slots__ = ()
+
+    def send(self, value: Any) -> Any:
+        """Sends a value into the generator and checks what it yields back"""
+        item = self.iterator.send(value)
+        count = self.count
+        self.count = count + 1
+        if count % self.every == 0:
+            self.check(item)
+        return item
+
+    def throw(self, *args: Any) -> Any:
+        """Raises an exception inside the generator"""
+        return self.iterator.throw(*args)
+
+    def close(self) -> None:
+        """Stops the generator"""
+        self.iterator.close()
+
+
+def streaming(
+    fnc: Callable, hint: Any, check: Optional[Callable[[Any], Any]], every: int = 1
+) -> Stream:
+    """Builds the function that swaps a returned iterator for its checked proxy
+
+    Args:
+        fnc (Callable): The function as written by the author
+        hint (Any): The return type hint
+        check (Optional[Callable[[Any], Any]]): The item check, None to only
+                                                make sure it is an iterator
+        every (int, optional): Check one item out of this many. Defaults to 1.
+
+    Returns:
+        Stream: Takes the returned value and hands back what the caller gets
+    """
+
+    qualname = fnc.__qualname__
+    if _is_async(fnc, hint):
+        expected: type = collections.abc.AsyncIterator
+        generator: type = collections.abc.AsyncGenerator
+        proxies: Tuple[type, type] = (CheckedAsyncGenerator, CheckedAsyncIterator)
+    else:
+        expected = collections.abc.Iterator
+        generator = collections.abc.Generator
+        proxies = (CheckedGenerator, CheckedIterator)
+
+    def stream(result: Any) -> Any:
+        if not isinstance(result, expected):
+            raise TypeHintViolation(qualname, RETURN, result, hint)
+        if check is None:
+            return result
+        if isinstance(result, generator):
+            return proxies[0](result, check, every)
+        return proxies[1](result, check, every)
+
+    return stream
+
+
+def check_stream(every: int = 1) -> Callable:
+    """A decorator that samples the items a streaming method hands out,
+        only one out of `every` items is checked, starting with the first
+
+    Usage:
+
+        class Reader(IReader):
+
+            @check_stream(every=100)
+            def records(self) -> Iterator[Record]:
+                ...
+
+    Args:
+        every (int, optional): Check one item out of this many. Defaults to 1.
+
+    Raises:
+        ValueError: every isn't positive
+
+    Returns:
+        Callable: The decorator, it hands back the very same function
+    """
+    every = int(every)
+    if every < 1:
+        raise ValueError(f"Stream sampling needs a positive step, got {every}")
+
+    def decorator(func: Callable) -> Callable:
+        target = func.__func__ if isinstance(func, staticmethod) else func
+        setattr(target, STREAM, every)
+        return func
+
+    return decorator
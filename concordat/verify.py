@@ -0,0 +1,292 @@
+"""
+Offline conformance verification. Conformance is checked as a side effect of
+importing a module, one class at a time, and the first violation aborts the
+import. This imports every module of the given packages across a process
+pool instead, with violations collected rather than raised, so a single run
+reports all of them.
+
+    python -m concordat.verify myapp myplugins --jobs 8 --report verify.json
+
+Every module is imported by a worker of the pool, then its classes are
+verified: deferred checks are built and every forward reference
+is resolved, which otherwise only happens on the first call in production.
+The timings of both steps are printed per module.
+
+The json report lists every module with the hash of its source, so whoever
+reads it can tell whether it still describes the code at hand. Pass
+`--cache-dir` to write every class that conformed into the conformance
+cache as well, production processes pointed at the same directory with
+CONCORDAT_CACHE_DIR then skip the check for them. See concordat.cache.
+"""
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import platform
+import pkgutil
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from inspect import getattr_static
+from typing import Any, Dict, Iterable, List, Optional
+
+from concordat.cache import set_cache_dir
+from concordat.interface import (
+    ALL_METHODS,
+    InterfaceMeta,
+    resolve_hints,
+    set_violation_collector,
+)
+from concordat.policy import raw_function
+from concordat.prefork import _prepare
+
+REPORT_VERSION = 1
+CONFORMANCE = "conformance"
+FORWARD_REFERENCE = "forward-reference"
+IMPORT = "import"
+VERIFICATION = "verification"
+
+
+def discover(names: Iterable[str]) -> List[str]:
+    """Every module of the given packages, found on disk. Only the parents
+        of dotted names are imported, eg `myapp` for `myapp.storage`.
+
+    Args:
+        names (Iterable[str]): Packages or modules, eg ["myapp", "myplugins.s3"]
+
+    Raises:
+        ModuleNotFoundError: A name can't be found
+
+    Returns:
+        List[str]: The module names, packages first, in the order they were found
+    """
+    modules: List[str] = []
+    for name in names:
+        spec = importlib.util.find_spec(name)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+        modules.append(name)
+        if spec.submodule_search_locations is not None:
+            modules.extend(_walk(list(spec.submodule_search_locations), name))
+    return list(dict.fromkeys(modules))
+
+
+def _walk(path: List[str], package: str) -> List[str]:
+    # pkgutil.walk_packages imports every subpackage to get at its __path__,
+    # asking the finder for the spec doesn't
+    modules: List[str] = []
+    for info in pkgutil.iter_modules(path, f"{package}."):
+        if info.name.endswith(".__main__"):
+            # importing it would run it
+            continue
+        modules.append(info.name)
+        if not info.ispkg:
+            continue
+        spec = info.module_finder.find_spec(info.name)  # type: ignore
+        if spec is not None and spec.submodule_search_locations is not None:
+            modules.extend(_walk(list(spec.submodule_search_locations), info.name))
+    return modules
+
+
+def _violation(cls: Optional[type], kind: str, error: BaseException) -> Dict[str, Any]:
+    return {
+        "module": cls.__module__ if cls is not None else None,
+        "class": f"{cls.__module__}.{cls.__qualname__}" if cls is not None else None,
+        "kind": kind,
+        "error": type(error).__name__,
+        "message": str(error),
+    }
+
+
+def _source(module: Any) -> Dict[str, Optional[str]]:
+    path = getattr(module, "__file__", None)
+    if not path:
+        return {"path": None, "sha256": None}
+    try:
+        with open(path, "rb") as source:
+            digest: Optional[str] = hashlib.sha256(source.read()).hexdigest()
+    except OSError:
+        digest = None
+    return {"path": os.path.abspath(path), "sha256": digest}
+
+
+def _check(cls: type) -> List[Dict[str, Any]]:
+    # whatever goes wrong is reported against the class, one bad hint
+    # mustn't take the rest of the run down with it
+    violations = []
+    try:
+        _prepare(cls)
+    except Exception as error:  # pylint: disable=broad-except
+        violations.append(_violation(cls, VERIFICATION, error))
+    for name in cls.__dict__.get(ALL_METHODS, ()):
+        fnc = raw_function(getattr_static(cls, name))
+        if not hasattr(fnc, "__annotations__"):
+            # builtins and the like have no hints to resolve
+            continue
+        try:
+            resolve_hints(fnc)
+        except NameError as error:
+            violations.append(_violation(cls, FORWARD_REFERENCE, error))
+        except Exception as error:  # pylint: disable=broad-except
+            violations.append(_violation(cls, VERIFICATION, error))
+    return violations
+
+
+_collected: List[Dict[str, Any]] = []
+
+
+def _collect(cls: type, error: Exception) -> None:
+    _collected.append(_violation(cls, CONFORMANCE, error))
+
+
+def verify_module(name: str, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Imports a module with conformance violations collected, then verifies
+        the classes it defines. Violations of classes created along the way
+        are reported too, whichever module they belong to, since a module
+        imported by another is only imported once per process.
+
+    Args:
+        name (str): The module
+        cache_dir (Optional[str], optional): Conformance cache to write the
+            classes that conformed to. Defaults to None, the environment decides.
+
+    Returns:
+        Dict[str, Any]: The module's part of the report, with the conformance
+                        violations of every class created under `created`
+    """
+    if cache_dir is not None:
+        set_cache_dir(cache_dir)
+    set_violation_collector(_collect)
+    del _collected[:]
+    result: Dict[str, Any] = {
+        "module": name,
+        "preloaded": name in sys.modules,
+        "path": None,
+        "sha256": None,
+        "verify_seconds": None,
+        "classes": [],
+        "violations": [],
+    }
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(name)
+    except (Exception, SystemExit) as error:  # pylint: disable=broad-except
+        result["violations"].append(_violation(None, IMPORT, error))
+        result["traceback"] = traceback.format_exc()
+        return result
+    finally:
+        result["import_seconds"] = time.perf_counter() - start
+        result["created"] = list(_collected)
+        set_violation_collector(None)
+    result.update(_source(module))
+    start = time.perf_counter()
+    classes = [
+        value
+        for value in vars(module).values()
+        if isinstance(value, InterfaceMeta) and value.__module__ == name
+    ]
+    # a class that didn't conform has been reported already, its hints included
+    failed = {violation["class"] for violation in result["created"]}
+    for cls in classes:
+        if f"{cls.__module__}.{cls.__qualname__}" not in failed:
+            result["violations"].extend(_check(cls))
+    result["verify_seconds"] = time.perf_counter() - start
+    result["classes"] = [cls.__qualname__ for cls in classes]
+    return result
+
+
+def _merge(results: List[Dict[str, Any]]) -> None:
+    # conformance violations go to the module that defines the class, once,
+    # however many workers happened to import it
+    by_module = {result["module"]: result for result in results}
+    seen = set()
+    for result in results:
+        for violation in result.pop("created"):
+            key = (violation["class"], violation["message"])
+            if key in seen:
+                continue
+            seen.add(key)
+            owner = by_module.get(violation["module"], result)
+            owner["violations"].append(violation)
+
+
+def verify(
+    names: Iterable[str], jobs: Optional[int] = None, cache_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """Verifies every module of the given packages across a process pool
+
+    Args:
+        names (Iterable[str]): Packages or modules
+        jobs (Optional[int], optional): Worker processes. Defaults to None, one per CPU.
+        cache_dir (Optional[str], optional): See verify_module. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: The report, `ok` is True when nothing was found
+    """
+    start = time.perf_counter()
+    modules = discover(names)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(verify_module, modules, [cache_dir] * len(modules)))
+    _merge(results)
+    violations = sum(len(result["violations"]) for result in results)
+    return {
+        "version": REPORT_VERSION,
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "seconds": time.perf_counter() - start,
+        "ok": violations == 0,
+        "violations": violations,
+        "modules": results,
+    }
+
+
+def _print(report: Dict[str, Any]) -> None:
+    for result in report["modules"]:
+        verify_seconds = result["verify_seconds"]
+        verified = "-" if verify_seconds is None else f"{verify_seconds * 1000:.1f}ms"
+        preloaded = " (imported earlier)" if result["preloaded"] else ""
+        print(
+            f"{result['module']}: import {result['import_seconds'] * 1000:.1f}ms"
+            f"{preloaded} verify {verified} {len(result['classes'])} classes"
+        )
+        for violation in result["violations"]:
+            where = violation["class"] or result["module"]
+            print(f"  {violation['kind']} {where}: {violation['error']}")
+            print("    " + violation["message"].strip().replace("\n", "\n    "))
+    print(
+        f"{len(report['modules'])} modules, {report['violations']} violations"
+        f" in {report['seconds']:.2f}s"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point
+
+    Returns:
+        int: exit code, 1 when a violation was found
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m concordat.verify",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("packages", nargs="+", help="packages or modules to verify")
+    parser.add_argument("--jobs", type=int, help="worker processes, one per CPU")
+    parser.add_argument("--report", help="where to write the json report")
+    parser.add_argument("--cache-dir", help="conformance cache to fill")
+    args = parser.parse_args(argv)
+
+    report = verify(args.packages, args.jobs, args.cache_dir)
+    _print(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print(f"wrote the report to {args.report}", file=sys.stderr)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())